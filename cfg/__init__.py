@@ -37,6 +37,11 @@ EXPORT_SUPPORT = (
     # 'Model Summary (*.png)',
 )
 
+# Loading configure for compression of new project file,
+# could be None, 'gzip' or 'lzma'.
+# Existed project keeps its own compression.
+PROJECT_COMPRESS = None
+
 # Loading configure for stylesheet
 SS_ROOT = 'lib/skin/{}.css'
 SS_COMMON = SS_ROOT.format('common')
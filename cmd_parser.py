@@ -1,11 +1,19 @@
 """ Command line version of the parser. """
 import os
+import sys
+import glob
+import json
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 
-from lib.parser import PyParser, PyHandler
+from lib.parser import PyParser, PyHandler, ExportCache, COMPRESS_SUPPORT, convert
+from lib.parser.binary import XML_SUFFIX, BINARY_SUFFIX
 
 
 SUPPORT_TYPE = ('.py', )
+PROJECT_TYPE = (XML_SUFFIX, BINARY_SUFFIX)
+DEFAULT_DST = 'model.py'
+DEFAULT_BATCH_DST = '.'
 
 
 def parse_args():
@@ -15,12 +23,34 @@ def parse_args():
 
     parser.add_argument('--src', '-s',
                         help='set the src file path.')
+    parser.add_argument('--batch', '-b',
+                        help='set a directory or glob of src files, '
+                             'and export them all into dst directory.')
     parser.add_argument('--dst', '-d',
-                        default='model.py',
-                        help='set the dst file path.')
+                        help=f'set the dst file path, {DEFAULT_DST} by default, '
+                             'or the current directory in batch mode.')
     parser.add_argument('--type', '-t',
                         default='.py',
                         help='parse the file into certain type.')
+    parser.add_argument('--author', '-a',
+                        help='set the author of exported file.')
+    parser.add_argument('--workers', '-w',
+                        type=int,
+                        default=os.cpu_count(),
+                        help='set the number of processes in batch mode.')
+    parser.add_argument('--report', '-r',
+                        help='write the batch results into a JSON file, '
+                             'print them if not set.')
+    parser.add_argument('--convert', '-c',
+                        help='convert the src project into this path, '
+                             f'binary if it ends with {BINARY_SUFFIX}, '
+                             'otherwise XML.')
+    parser.add_argument('--compress',
+                        choices=COMPRESS_SUPPORT,
+                        help='compress the converted project.')
+    parser.add_argument('--no-cache',
+                        action='store_true',
+                        help='do not reuse or update the export cache.')
     return parser.parse_args()
 
 
@@ -33,15 +63,102 @@ def check_valid(s, t):
         f'{s} does not exist, please check.'
 
 
+def collect_batch(pattern: str) -> list:
+    # A directory means all the projects in it.
+    if os.path.isdir(pattern):
+        return sorted(src for suffix in PROJECT_TYPE
+                      for src in glob.glob(os.path.join(pattern, '*' + suffix)))
+    return sorted(glob.glob(pattern, recursive=True))
+
+
+def model_name(src: str) -> str:
+    # Same as the editor, name the model after its project.
+    return os.path.splitext(os.path.basename(src))[0].capitalize()
+
+
+def export(src, dst, typ, author=None, no_cache=False, name='Model'):
+    if typ == '.py':
+        cache = None if no_cache else ExportCache.for_project(src)
+        if cache is not None:
+            # Unchanged project, no need to parse again.
+            output = PyHandler.output_path(dst, name)
+            cache.source = ExportCache.digest(src, typ, os.path.abspath(output), author)
+            if cache.is_fresh(cache.source, output):
+                return cache.last_warnings
+        py_p = PyParser(src, cache)
+        py_h = PyHandler(py_p, name, author)
+        py_h.export(dst)
+        return [str(w) for w in py_h.warnings]
+
+
+def export_one(src, dst, typ, author, no_cache) -> dict:
+    # Run in worker process, and never raise,
+    # so one broken project won't stop the others.
+    result = {'src': src, 'status': 'ok', 'warnings': [], 'error': None}
+    try:
+        warnings = export(src, dst, typ, author, no_cache, model_name(src))
+    except Exception as err:
+        result['status'] = 'error'
+        result['error'] = f'{type(err).__name__}: {err}'
+    else:
+        if warnings:
+            result['status'] = 'warning'
+            result['warnings'] = warnings
+    return result
+
+
+def run_batch(args) -> int:
+    srcs = collect_batch(args.batch)
+    if not srcs:
+        print(f'{args.batch} matches no project.', file=sys.stderr)
+        return 1
+    dst = args.dst or DEFAULT_BATCH_DST
+    os.makedirs(dst, exist_ok=True)
+    results = {}
+    # Projects with the same name would cover each other.
+    names = {}
+    jobs = []
+    for src in srcs:
+        name = PyHandler.check_title(model_name(src)).lower()
+        if name in names:
+            results[src] = {'src': src, 'status': 'error', 'warnings': [],
+                            'error': f'{name}.py is also exported by {names[name]}'}
+        else:
+            names[name] = src
+            jobs.append(src)
+
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = [pool.submit(export_one, src, dst, args.type,
+                               args.author, args.no_cache)
+                   for src in jobs]
+        for future in futures:
+            result = future.result()
+            results[result['src']] = result
+
+    report = [results[src] for src in srcs]
+    content = json.dumps(report, indent=2)
+    if args.report:
+        with open(args.report, 'w') as f:
+            f.write(content)
+    else:
+        print(content)
+    return 1 if any(r['status'] == 'error' for r in report) else 0
+
+
 if __name__ == '__main__':
     args = parse_args()
 
+    assert args.type in SUPPORT_TYPE, \
+        f'type should be in {SUPPORT_TYPE}.'
+
+    if args.batch:
+        sys.exit(run_batch(args))
+
     src = args.src
-    dst = args.dst
+    dst = args.dst or DEFAULT_DST
     typ = args.type
     check_valid(src, typ)
-
-    if typ == '.py':
-        py_p = PyParser(src)
-        py_h = PyHandler(py_p)
-        py_h.export(dst)
+    if args.convert:
+        convert(src, args.convert, args.compress)
+        sys.exit(0)
+    export(src, dst, typ, args.author, args.no_cache)
@@ -0,0 +1,111 @@
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer, QElapsedTimer
+
+
+class NodesAnimator(QObject):
+    """ Move a lot of nodes together by a single timer.
+
+    All the nodes share one clock, so their positions are
+    interpolated as arrays with the easing curve in each frame,
+    then set in one pass, and their edges are updated once after.
+    The ends of edges between moving nodes are taken from the
+    same arrays, the rest are left to the edge scheduler.
+
+    """
+
+    FRAME = 16       # ms, about 60 fps.
+    DURATION = 600   # ms
+
+    def __init__(self, scene, parent=None):
+        super().__init__(parent)
+        self.scene = scene  # the wrapper of gr-scene
+        self.nodes = []
+        self.items = []      # the graphic items of nodes.
+        self.edges = []      # edges with only one moving end.
+        self.gr_edges = []   # edges between moving nodes.
+        self.ends: np.ndarray = None  # (start idx, end idx) of gr_edges.
+        self.patch: np.ndarray = None
+        self.src: np.ndarray = None
+        self.dst: np.ndarray = None
+        self.clock = QElapsedTimer()
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.FRAME)
+        self.timer.timeout.connect(self.step)
+
+    def move(self, nodes: list, dst):
+        """
+        Move the nodes to dst.
+
+        :param nodes: the wrappers of nodes, or notes.
+        :param dst: the pos of each node in scene, shape (N, 2).
+        """
+        if not nodes:
+            return
+        self.nodes = nodes
+        self.items = [self.item_of(node) for node in nodes]
+        self.src = self.positions(nodes)
+        self.dst = np.asarray(dst, dtype=float).reshape(-1, 2)
+        # the edges of all the moving nodes, each only once.
+        index = {node.id: i for i, node in enumerate(nodes)}
+        edges = {}
+        for node in nodes:
+            for edge in self.scene.history.edges_of(node):
+                edges[edge.id] = edge
+        self.edges, self.gr_edges, ends, patch = [], [], [], []
+        for edge in edges.values():
+            start = index.get(edge.start_item.id)
+            end = index.get(edge.end_item.id)
+            if start is None or end is None:
+                self.edges.append(edge)
+                continue
+            self.gr_edges.append(edge.gr_edge)
+            ends.append((start, end))
+            patch.append(edge.start_item.gr_node.width / 2)
+        self.ends = np.array(ends, dtype=int).reshape(-1, 2)
+        self.patch = np.array(patch, dtype=float).reshape(-1, 1)
+        self.clock.start()
+        self.timer.start()
+        self.items[0].is_modified()
+
+    def is_running(self) -> bool:
+        return self.timer.isActive()
+
+    def step(self):
+        t = min(self.clock.elapsed() / self.DURATION, 1.0)
+        pos = self.src + (self.dst - self.src) * self.ease(t)
+        for item, (x, y) in zip(self.items, pos.tolist()):
+            item.setPos(x, y)
+        # the edges follow in one pass.
+        src = (pos[self.ends[:, 0]] + self.patch).tolist()
+        dst = (pos[self.ends[:, 1]] + self.patch).tolist()
+        for gr_edge, (sx, sy), (dx, dy) in zip(self.gr_edges, src, dst):
+            gr_edge.set_src(sx, sy)
+            gr_edge.set_dst(dx, dy)
+            gr_edge.refresh()
+        scheduler = self.scene.edge_scheduler
+        scheduler.mark(self.edges)
+        scheduler.flush()
+        if t >= 1.0:
+            self.timer.stop()
+            self.nodes = []
+            self.items = []
+            self.edges = []
+            self.gr_edges = []
+
+    # ----------UTILS----------
+
+    @classmethod
+    def ease(cls, t):
+        # OutQuart, works for array too.
+        return 1 - (1 - t) ** 4
+
+    @classmethod
+    def item_of(cls, node):
+        # the note is a graphic item itself.
+        return getattr(node, 'gr_node', node)
+
+    @classmethod
+    def positions(cls, nodes: list) -> np.ndarray:
+        items = [cls.item_of(node) for node in nodes]
+        return np.array([(item.x(), item.y()) for item in items],
+                        dtype=float).reshape(-1, 2)
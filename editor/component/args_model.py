@@ -1,122 +1,62 @@
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 
 from PyQt5.QtGui import QStandardItemModel
 
-from editor.component.args_model_item import ArgNameItem, ArgTypeItem, ArgEditItem
+from editor.component.args_model_item import ArgNameItem, ArgTypeItem, ArgEditItem, ArgValue
 from editor.component.semaphores import ReferenceBySemaphore, ModelIOSemaphore
-from lib import pin_args_dict, type_tag_map
+from lib import pin_args_dict, type_tag_map, type_color_map
 
 
-class ArgsSuperModel(QStandardItemModel):
+class ArgRow(namedtuple('ArgRow', ('mode', 'arg_name', 'info', 'init', 'dtype',
+                                   'tag', 'store_bg', 'box'))):
+    """ The template of one row in args store,
+    which also stands for its arg name item. """
 
-    AUTO_COUNT_NAME = (
-        'Input', 'Model', 'PlaceHolder'
-    )  # nodes that its var_name is auto increasing.
+    __slots__ = ()
+
+    def text(self):
+        return self.arg_name
+
+
+# The rows of one kind of node, with the shared default values,
+# the rows that need checkbox or io order panel, the Reference rows,
+# and the index of arg name to its rows (in order, names may repeat).
+ArgsPrototype = namedtuple('ArgsPrototype', ('rows', 'defaults',
+                                             'check_args', 'io_order_args',
+                                             'ref_args', 'names'))
+
+
+class ArgsPreviewModel(QStandardItemModel):
+    """ The args of one kind of node, only shows their types
+    and names, before any node of it is made. """
 
     def __init__(self,
                  db_link,
                  node_name: str,
-                 node_id_string: str,
+                 node_id: str,
                  inherit: str):
         super().__init__()
 
         self.db = db_link
         self.node_name = node_name
-        self.id_string = node_id_string
+        self.id_string = node_id
         self.inherit = inherit
         self.n = 0
-        self.io_separator = 0  # where inherit and original args separated.
-        self.var_name_idx = 0  # record idx where is arg: var_name
-
-    @property
-    def var_name(self):
-        return self.item(self.var_name_idx, 1).text()
-
-    @property
-    def var_name_item(self):
-        return self.item(self.var_name_idx, 1)
-
-    def set_var_name(self, var_name: str):
-        self.var_name_item.value = var_name
-
-    def set_header_labels(self, header1: str, header2: str):
-        # only two headers available
-        self.setHorizontalHeaderLabels((header1, header2))
-
-    def _get_inherit_args(self, count):
-        for i, arg in self.db.get_inh_args(self.inherit):
-            self.feed_inherit_item(i, arg, count)
-            # add counter
-            self.n += 1
-        self.io_separator = self.n  # record here
-
-    def _get_original_args(self):
-        for i, arg in self.db.get_org_args(self.id_string):
-            self.feed_original_item(i + self.n, arg)
-
-    def _get_custom_args(self, count):
-        name = ArgNameItem('var', 'The variable name of this node.',
-                           'var_name')
-        var_name = self.node_name.lower()
-        if self.node_name in self.AUTO_COUNT_NAME:
-            var_name += (f'_{count}' if count > 1 else '')
-        else:
-            pass
-        value = ArgEditItem(var_name, 'String', 'var_name')
-        self.set_col_items(self.n, name, value)
-        self.var_name_idx = self.n  # record here
-        self.n += 1
+        # set header labels for this model
+        self.setHorizontalHeaderLabels(("Type", "Argument Name"))
 
-    def get_args(self, add_custom_args=False, count=1):
+    def get_args(self):
         # call this method to get all the args
         if self.inherit:
-            self._get_inherit_args(count)
-        if add_custom_args:
-            self._get_custom_args(count)
+            for i, arg in self.db.get_inh_args(self.inherit):
+                self.feed_inherit_item(i, arg)
+                # add counter
+                self.n += 1
         if self.id_string:
-            self._get_original_args()
-
-    def feed_inherit_item(self, idx, unpack_item, count):
-        raise NotImplementedError
-
-    def feed_original_item(self, idx, unpack_item):
-        raise NotImplementedError
+            for i, arg in self.db.get_org_args(self.id_string):
+                self.feed_original_item(i + self.n, arg)
 
-    def set_col_items(self, col_idx, *items):
-        for i, item in enumerate(items):
-            self.setItem(col_idx, i, item)
-
-    def items(self):
-        """ Generator: yield items in model. """
-        idx = 0
-        while True:
-            arg_name_item = self.item(idx, 0)
-            if arg_name_item is None:
-                break
-            arg_value_item = self.item(idx, 1)
-            yield idx, arg_name_item, arg_value_item
-            idx += 1
-
-    def get_item_by_name(self, name: str):
-        # get the first item by name.
-        for idx, name_item, value_item in self.items():
-            if name_item.text() == name:
-                return idx, value_item
-        return None
-
-
-class ArgsPreviewModel(ArgsSuperModel):
-
-    def __init__(self,
-                 db_link,
-                 node_name: str,
-                 node_id: str,
-                 inherit: str):
-        super().__init__(db_link, node_name, node_id, inherit)
-        # set header labels for this model
-        self.set_header_labels("Type", "Argument Name")
-
-    def feed_inherit_item(self, idx, unpack_item, _):
+    def feed_inherit_item(self, idx, unpack_item):
         # id, name, init, type, info
         _, arg_name, arg_init, arg_type, arg_info = unpack_item
         arg_name_item = ArgNameItem('inh', arg_info, arg_name)
@@ -130,8 +70,36 @@ class ArgsPreviewModel(ArgsSuperModel):
         arg_type_item = ArgTypeItem(arg_type)
         self.set_col_items(idx, arg_type_item, arg_name_item)
 
+    def set_col_items(self, col_idx, *items):
+        for i, item in enumerate(items):
+            self.setItem(col_idx, i, item)
+
 
-class ArgsEditableModel(ArgsSuperModel):
+class ArgsStore:
+    """ The compact args of one node.
+
+    The rows and default values are shared by the same kind of nodes,
+    the store only keeps the values that are not default, which are
+    made when they are patched (var name, name counter and pins) or
+    fetched by item() to change. The Qt model is only made from it by
+    materialize() while the node is being edited.
+
+    Once tracked, any change of its values or io marks the node
+    dirty, so it's serialized again only after it changed.
+
+    """
+
+    AUTO_COUNT_NAME = (
+        'Input', 'Model', 'PlaceHolder'
+    )  # nodes that its var_name is auto increasing.
+
+    # (node_name, id_string, inherit, add_custom_args) -> prototype
+    PROTOTYPES = {}
+
+    __slots__ = ('db', 'node_name', 'node_type', 'id_string', 'inherit',
+                 'pin_args', 'proto', 'values', 'n', 'io_separator',
+                 'var_name_idx', 'rb_semaphore', 'io_semaphore',
+                 'gr_node_id', 'dirty')
 
     def __init__(self,
                  db_link,
@@ -140,26 +108,118 @@ class ArgsEditableModel(ArgsSuperModel):
                  node_id: str,
                  inherit: str,
                  pin_args: str):
-        super().__init__(db_link, node_name, node_id, inherit)
-        # args: combobox style cell
-        self.combo_args = []
-        # args: check button style cell
-        self.check_args = []
-        # args: io order style cell
-        self.io_order_args = []
+        self.db = db_link
+        self.node_name = node_name
+        self.node_type = node_type
+        self.id_string = node_id
+        self.inherit = inherit
         # args: for pin args
         if pin_args != 'None':
             self.pin_args = pin_args_dict(pin_args)
         else:
             self.pin_args = None
-
-        self.node_type = node_type
+        self.proto: ArgsPrototype = None
+        self.values = []  # the value of each row, None means default.
+        self.n = 0
+        self.io_separator = 0  # where inherit and original args separated.
+        self.var_name_idx = 0  # record idx where is arg: var_name
         # setup semaphore here
         self.rb_semaphore = ReferenceBySemaphore()
         self.io_semaphore = ModelIOSemaphore(self)
+        # the node id in scene, and dirty semaphore of args menu.
+        self.gr_node_id = None
+        self.dirty = None
 
-        # set header labels for this model
-        self.set_header_labels("Name", "Argument Value")
+    def track(self, gr_node_id: str, dirty):
+        self.gr_node_id = gr_node_id
+        self.dirty = dirty
+        self.touch()
+
+    def touch(self):
+        # mark this node dirty.
+        if self.dirty is not None:
+            self.dirty.add(self.gr_node_id)
+
+    @property
+    def rows(self):
+        return self.proto.rows
+
+    @property
+    def var_name(self):
+        return self.var_name_item.value
+
+    @property
+    def var_name_item(self):
+        return self.values[self.var_name_idx]
+
+    def set_var_name(self, var_name: str):
+        self.var_name_item.value = var_name
+
+    # args: combobox style cell
+    @property
+    def combo_args(self):
+        return [[idx, (self.values[idx] or self.proto.defaults[idx])._init_value, row.box]
+                for idx, row in enumerate(self.rows) if row.tag == 2]
+
+    # args: check button style cell
+    @property
+    def check_args(self):
+        return self.proto.check_args
+
+    # args: io order style cell
+    @property
+    def io_order_args(self):
+        return self.proto.io_order_args
+
+    def item(self, row: int, column: int):
+        # the arg name (row template) or its value,
+        # the default value becomes its own from now on.
+        if column == 0:
+            return self.rows[row]
+        value = self.values[row]
+        if value is None:
+            default = self.proto.defaults[row]
+            value = ArgValue(default.row, default.value,
+                             is_required=default.is_required, store=self)
+            self.values[row] = value
+        return value
+
+    def peek(self, row: int):
+        # the value of row only for reading, maybe the shared default.
+        value = self.values[row]
+        return value if value is not None else self.proto.defaults[row]
+
+    def items(self):
+        """ Generator: yield items in store, only for reading. """
+        for idx, row in enumerate(self.rows):
+            yield idx, row, self.peek(idx)
+
+    def get_item_by_name(self, name: str):
+        # get the first item by name.
+        idxs = self.proto.names.get(name)
+        if idxs is None:
+            return None
+        return idxs[0], self.item(idxs[0], 1)
+
+    def rows_by_name(self, name: str, mode: str = None) -> tuple:
+        # all the rows idx of this name, maybe only in one mode.
+        idxs = self.proto.names.get(name, ())
+        if mode is None:
+            return idxs
+        return tuple(idx for idx in idxs if self.rows[idx].mode == mode)
+
+    @property
+    def ref_args(self):
+        return self.proto.ref_args
+
+    def materialize(self):
+        return ArgsEditableModel(self)
+
+    def compact(self):
+        # drop the values that are back to default.
+        for idx, value in enumerate(self.values):
+            if value is not None and value.is_default(self.proto.defaults[idx]):
+                self.values[idx] = None
 
     # ------MAINTAIN SEMAPHORE------
     # Maintain the rb_semaphore by property ref_by.
@@ -212,99 +272,94 @@ class ArgsEditableModel(ArgsSuperModel):
         arg_item.value = state
         arg_item.is_changed = ~arg_item.is_changed
 
-    def feed_inherit_item(self, idx, unpack_item, count):
+    # ------PROTOTYPE------
+    # The rows of one kind of node are made into templates only once,
+    # then every new store is stamped out from them, with only the
+    # var name, name counter and pin values patched in.
+
+    def get_args(self, add_custom_args=False, count=1):
+        key = (self.node_name, self.id_string, self.inherit, add_custom_args)
+        if key not in self.PROTOTYPES:
+            self.PROTOTYPES[key] = self._make_prototype(add_custom_args)
+        self._stamp(self.PROTOTYPES[key], count)
+
+    def _make_prototype(self, add_custom_args) -> ArgsPrototype:
+        rows = []
+        if self.inherit:
+            for _, arg in self.db.get_inh_args(self.inherit):
+                rows.append(self.inherit_row(arg))
+        if add_custom_args:
+            rows.append(ArgRow('var', 'var_name', 'The variable name of this node.',
+                               None, 'String', 0, False, None))
+        if self.id_string:
+            for _, arg in self.db.get_org_args(self.id_string):
+                rows.append(self.original_row(arg))
+        # inherit item doesn't have any required args.
+        defaults = tuple(ArgValue(row, row.init,
+                                  is_required=row.mode == 'org' and row.init is None)
+                         for row in rows)
+        names = {}
+        for idx, row in enumerate(rows):
+            names.setdefault(row.arg_name, []).append(idx)
+        return ArgsPrototype(tuple(rows), defaults,
+                             [idx for idx, row in enumerate(rows) if row.tag == 1],
+                             [idx for idx, row in enumerate(rows) if row.tag == 3],
+                             tuple(idx for idx, row in enumerate(rows) if row.dtype == 'Reference'),
+                             {name: tuple(idxs) for name, idxs in names.items()})
+
+    def inherit_row(self, unpack_item) -> ArgRow:
         # id, name, init, type, info
         _, arg_name, arg_init, arg_type, arg_info = unpack_item
-        # inherit item doesn't have any required args.
-        pin_marker = False
-        arg_type_item = ArgTypeItem(arg_type)  # provide dtype for each arg item.
-        arg_name_item = ArgNameItem('inh', arg_info, arg_name)
-        # auto increase the arg 'name' value.
-        if arg_name == 'name':
-            arg_init = f'{self.node_name.lower()}_{count}'
-        # replace org value with pin value if it has.
-        pin_value = self.feed_with_pins(arg_name)
-        if pin_value is not None:
-            arg_init = pin_value
-            pin_marker = True
+        _, dtype = type_color_map(arg_type)  # provide dtype for each arg item.
         # set arg value with different types.
         if arg_type == "bool":
-            arg_mark_item = ArgEditItem(arg_init,
-                                        dtype=arg_type_item.raw_type_name,
-                                        belong_to=arg_name,
-                                        tag=1,
-                                        store_bg=True,
-                                        is_pined=pin_marker)
-            self.check_args.append(idx)
-            self.set_col_items(idx, arg_name_item, arg_mark_item)
-        else:
-            arg_init_item = ArgEditItem(arg_init,
-                                        dtype=arg_type_item.raw_type_name,
-                                        belong_to=arg_name,
-                                        is_pined=pin_marker)
-            self.set_col_items(idx, arg_name_item, arg_init_item)
+            return ArgRow('inh', arg_name, arg_info, arg_init, dtype, 1, True, None)
+        return ArgRow('inh', arg_name, arg_info, arg_init, dtype, 0, False, None)
 
-    def feed_original_item(self, idx, unpack_item):
+    def original_row(self, unpack_item) -> ArgRow:
         # id, note, name, init, type, info, box
         _, _, arg_name, arg_init, arg_type, arg_info, arg_box = unpack_item
-        pin_marker = False
-        is_required = False
-        arg_type_item = ArgTypeItem(arg_type)
-        arg_name_item = ArgNameItem('org', arg_info, arg_name)
-        pin_value = self.feed_with_pins(arg_name)
-        if pin_value is not None:
-            arg_init = pin_value
-            pin_marker = True
-        if arg_init is None:
-            is_required = True
+        _, dtype = type_color_map(arg_type)
         if arg_box:
-            # setup the combo box for box args
-            arg_box_list = self.db.get_box_args(int(arg_box)).split(';')
-            self.combo_args.append([idx, arg_init, arg_box_list])
-            # placeholder is where to store the current value
-            arg_mark_item = ArgEditItem(arg_init,
-                                        dtype=arg_type_item.raw_type_name,
-                                        belong_to=arg_name,
-                                        tag=2,
-                                        store_bg=True,
-                                        is_pined=pin_marker,
-                                        is_required=is_required)
-            self.set_col_items(idx, arg_name_item, arg_mark_item)
+            # setup the combo box for box args,
+            # the list is shared by all nodes, never changes it.
+            arg_box_list = list(self.db.get_box_args(int(arg_box)))
+            return ArgRow('org', arg_name, arg_info, arg_init, dtype, 2, True, arg_box_list)
         elif arg_type == "bool":
             # setup the check button for bool type
-            arg_mark_item = ArgEditItem(arg_init,
-                                        dtype=arg_type_item.raw_type_name,
-                                        belong_to=arg_name,
-                                        tag=1,
-                                        store_bg=True,
-                                        is_pined=pin_marker,
-                                        is_required=is_required)
-            self.check_args.append(idx)
-            self.set_col_items(idx, arg_name_item, arg_mark_item)
+            return ArgRow('org', arg_name, arg_info, arg_init, dtype, 1, True, None)
         elif self.node_name == 'Model' and arg_name in ('inputs', 'outputs'):
             # setup for model io order panel
-            arg_order_item = ArgEditItem(arg_init,
-                                         dtype=arg_type_item.raw_type_name,
-                                         belong_to=arg_name,
-                                         tag=3,
-                                         store_bg=True,
-                                         is_required=is_required)
-            self.io_order_args.append(idx)
-            self.set_col_items(idx, arg_name_item, arg_order_item)
-        else:
-            arg_init_item = ArgEditItem(arg_init,
-                                        dtype=arg_type_item.raw_type_name,
-                                        belong_to=arg_name,
-                                        is_pined=pin_marker,
-                                        is_required=is_required)
-            self.set_col_items(idx, arg_name_item, arg_init_item)
-
-    def feed_with_pins(self, org_name):
-        # return the pin value of this org arg name.
-        if self.pin_args is None:
-            return None
-        # return result may be None or value.
-        return self.pin_args.get(org_name)
+            return ArgRow('org', arg_name, arg_info, arg_init, dtype, 3, True, None)
+        return ArgRow('org', arg_name, arg_info, arg_init, dtype, 0, False, None)
+
+    def _stamp(self, proto: ArgsPrototype, count: int):
+        self.proto = proto
+        self.values = [None] * len(proto.rows)
+        rows = proto.rows
+        for idx in self.rows_by_name('var_name', 'var'):
+            var_name = self.node_name.lower()
+            if self.node_name in self.AUTO_COUNT_NAME:
+                var_name += (f'_{count}' if count > 1 else '')
+            self.values[idx] = ArgValue(rows[idx], var_name, store=self)
+            self.var_name_idx = idx  # record here
+        # auto increase the arg 'name' value.
+        for idx in self.rows_by_name('name', 'inh'):
+            self.values[idx] = ArgValue(rows[idx], f'{self.node_name.lower()}_{count}',
+                                        store=self)
+        # replace org value with pin value if it has,
+        # only the pined rows are visited through names.
+        for arg_name, pin_value in (self.pin_args or {}).items():
+            if pin_value is None:
+                continue
+            for idx in proto.names.get(arg_name, ()):
+                row = rows[idx]
+                if row.mode == 'var':
+                    continue
+                self.values[idx] = ArgValue(row, pin_value, is_pined=row.tag != 3,
+                                            store=self)
+        self.io_separator = sum(row.mode == 'inh' for row in rows)  # record here
+        self.n = len(rows)
 
     def extract_args(self,
                      get_changed=False,
@@ -318,26 +373,27 @@ class ArgsEditableModel(ArgsSuperModel):
         # wrap all of them in OrderDict then return.
         arg_dict = OrderedDict()
         # get all the args by conditions.
-        for idx, arg_name, arg_value in self.items():
+        for idx, row, arg_value in self.items():
+            name = row.arg_name
             # whether pass the var_name arg item.
-            if arg_name.text() == 'var_name' and not get_var_name:
+            if row.mode == 'var' and not get_var_name:
                 continue
             dtype = type_tag_map(arg_value)
             # get changed.
             if arg_value.is_changed and get_changed:
-                arg_dict[arg_name.text()] = (arg_value.value, dtype)\
+                arg_dict[name] = (arg_value.value, dtype)\
                     if get_datatype else arg_value.value
             # get referenced.
             elif arg_value.is_referenced and get_referenced:
-                arg_dict[arg_name.text()] = (arg_value.ref_to, dtype)\
+                arg_dict[name] = (arg_value.ref_to, dtype)\
                     if get_datatype else arg_value.ref_to
             # get required.
             elif arg_value.is_required and get_required:
-                arg_dict[arg_name.text()] = (arg_value.value, dtype)\
+                arg_dict[name] = (arg_value.value, dtype)\
                     if get_datatype else arg_value.value
             # get pined.
             elif arg_value.is_pined and get_pined:
-                arg_dict[arg_name.text()] = (arg_value.value, dtype)\
+                arg_dict[name] = (arg_value.value, dtype)\
                     if get_datatype else arg_value.value
             # else ...
         if self.node_name == 'Model' and get_io:
@@ -355,3 +411,23 @@ class ArgsEditableModel(ArgsSuperModel):
                              self.extract_args(get_changed=True,
                                                get_pined=True).items()])
         return pin_args, self.node_name
+
+
+class ArgsEditableModel(QStandardItemModel):
+    """ The Qt model of one args store, which only lives
+    while its node is being edited in args menu. """
+
+    def __init__(self, store: ArgsStore):
+        super().__init__()
+        self.store = store
+        # set header labels for this model
+        self.setHorizontalHeaderLabels(("Name", "Argument Value"))
+        for idx, row in enumerate(store.rows):
+            self.setItem(idx, 0, ArgNameItem(row.mode, row.info, row.arg_name))
+            self.setItem(idx, 1, ArgEditItem(store.item(idx, 1)))
+
+    def release(self):
+        # unbind the items, then the store can be compacted.
+        for idx in range(self.rowCount()):
+            self.item(idx, 1).state.item = None
+        self.store.compact()
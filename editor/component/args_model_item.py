@@ -10,17 +10,22 @@ from editor.component.mini_button import MiniSquareButton
 
 class ArgNameItem(QStandardItem):
 
+    # colors are shared by all items.
+    inh_color = QColor(color['INH_ARG'])
+    org_color = QColor(color['ORG_ARG'])
+    cus_color = QColor(color['CUS_ARG'])
+
     def __init__(self, mode, tooltip, *args):
         # assign mode and tooltips first
         super().__init__(*args)
 
         self.mode = mode
         if self.mode == 'inh':
-            self.setBackground(QColor(color['INH_ARG']))
+            self.setBackground(self.inh_color)
         elif self.mode == 'org':
-            self.setBackground(QColor(color['ORG_ARG']))
+            self.setBackground(self.org_color)
         else:  # 'var'
-            self.setBackground(QColor(color['CUS_ARG']))
+            self.setBackground(self.cus_color)
 
         self.setEditable(False)
         self.setToolTip(tooltip)
@@ -39,47 +44,69 @@ class ArgTypeItem(QStandardItem):
         self.setEditable(False)
 
 
-class ArgEditItem(QStandardItem):
+class ArgValue:
+    """ The value of one arg and its state, which is kept in args store.
+
+    It acts like the old edit item, and once an ArgEditItem shows it,
+    every change on it also goes to that item. The store it belongs
+    to is touched by every change, so it knows it's dirty.
+
+    """
+
+    # color for plain, changed & referenced,
+    # which are shared by all values.
+    pln_color = QColor(color['ARG_NORMAL'])
+    chg_color = QColor(color['ARG_CHANGED'])
+    ref_color = QColor(color['ARG_REFED'])
+
+    # _ref_to and _ref_to_node_id only exist after referenced.
+    __slots__ = ('row', '_init_value', '_value', 'is_changed', 'is_referenced',
+                 'is_pined', 'is_required', 'background', 'editable', 'item',
+                 'store', '_ref_to', '_ref_to_node_id')
 
     def __init__(self,
+                 row,
                  value,
-                 dtype,
-                 belong_to: str,
-                 tag: int = 0,
-                 store_bg: bool = False,
                  is_pined: bool = False,
-                 is_required: bool = False):
+                 is_required: bool = False,
+                 store=None):
+        # the row template of this arg.
+        self.row = row
         # save the initial value of one arg
         self._init_value = value if value else ''
         self._value = value
-        self._store_bg = store_bg
-        self.dtype = dtype
-        # this arg value item belongs to ...
-        self.belong_to = belong_to
-        # behind the widgets is self
-        if self._store_bg:
-            super().__init__()
-        else:
-            super().__init__(self._value)
-        # default tag is 0.
-        # when self is token by other widget,
-        # 1 is checkbox, 2 is combobox, 3 is io-order.
-        self.tag = tag
-
         self.is_changed = False
         self.is_referenced = False
         self.is_pined = is_pined
         self.is_required = is_required
-        # color for plain, changed & referenced.
-        self.pln_color = QColor(color['ARG_NORMAL'])
-        self.chg_color = QColor(color['ARG_CHANGED'])
-        self.ref_color = QColor(color['ARG_REFED'])
-
-        self.setEditable(True)
-        self.setToolTip(self.dtype)
+        self.background = None
+        self.editable = True
+        self.item = None  # the ArgEditItem showing it.
+        self.store = store  # None for the shared defaults.
 
     def __repr__(self):
-        return f"<ArgEditItem ARG:{self.belong_to} at {str(id(self))[-4:]}>"
+        return f"<ArgValue ARG:{self.belong_to} at {str(id(self))[-4:]}>"
+
+    @property
+    def belong_to(self) -> str:
+        # this arg value item belongs to ...
+        return self.row.arg_name
+
+    @property
+    def dtype(self):
+        return self.row.dtype
+
+    @property
+    def tag(self) -> int:
+        # default tag is 0.
+        # when self is token by other widget,
+        # 1 is checkbox, 2 is combobox, 3 is io-order.
+        return self.row.tag
+
+    @property
+    def store_bg(self) -> bool:
+        # behind the widgets is self
+        return self.row.store_bg
 
     @property
     def var_name(self):
@@ -90,6 +117,30 @@ class ArgEditItem(QStandardItem):
     def id_str(self):
         return str(id(self))
 
+    def text(self):
+        # the text in front, like the item does.
+        if self.store_bg or self._value is None:
+            return ''
+        return self._value
+
+    def is_default(self, default) -> bool:
+        # whether it's the same as default value.
+        return (self._value == default.value and
+                self.is_required == default.is_required and
+                not (self.is_changed or self.is_referenced or self.is_pined) and
+                not hasattr(self, '_ref_to_node_id') and
+                self.background is None and self.editable)
+
+    def set_background(self, background: QColor):
+        self.background = background
+        if self.item is not None:
+            self.item.setBackground(background)
+
+    def set_editable(self, editable: bool):
+        self.editable = editable
+        if self.item is not None:
+            self.item.setEditable(editable)
+
     # ------REF TO------
     # This semaphore is maintained by self.
 
@@ -103,9 +154,9 @@ class ArgEditItem(QStandardItem):
         self.is_changed = False
         self.is_referenced = True
         if self.tag == 0:
-            self.setBackground(self.ref_color)
+            self.set_background(self.ref_color)
         # ref value cannot be changed unless remove it.
-        self.setEditable(False)
+        self.set_editable(False)
 
     def get_ref_to(self):
         return self._ref_to_node_id
@@ -118,16 +169,21 @@ class ArgEditItem(QStandardItem):
         self.is_changed = False
         self.is_referenced = False
         self.value = self._init_value
-        self.setBackground(self.pln_color)
-        self.setEditable(True)
+        self.set_background(self.pln_color)
+        self.set_editable(True)
 
     ref_to = property(get_ref_to, set_ref_to, del_ref_to)
 
+    def touch(self):
+        if self.store is not None:
+            self.store.touch()
+
     def set_value(self, value: str):
         """ A proxy of setText() with value check. """
         self._value = value
-        if not self._store_bg:
-            self.setText(self._value)
+        self.touch()
+        if not self.store_bg and self.item is not None:
+            self.item.setText(self._value)
 
     def get_value(self):
         # whether store in bg or not, will get the value anyway.
@@ -144,13 +200,34 @@ class ArgEditItem(QStandardItem):
 
     def has_changed(self):
         self.is_changed = True
+        self.touch()
         # only set changed color for normal edit item
         if self.tag == 0:
-            self.setBackground(self.chg_color)
+            self.set_background(self.chg_color)
 
     def undo_change(self):
         self.is_changed = False
-        self.setBackground(self.pln_color)
+        self.touch()
+        self.set_background(self.pln_color)
+
+
+class ArgEditItem(QStandardItem):
+    """ The item shows an ArgValue while editing. """
+
+    def __init__(self, state: ArgValue):
+        if state.store_bg:
+            super().__init__()
+        else:
+            super().__init__(state.value)
+        self.state = state
+        state.item = self
+        if state.background is not None:
+            self.setBackground(state.background)
+        self.setEditable(state.editable)
+        self.setToolTip(state.dtype)
+
+    def __repr__(self):
+        return f"<ArgEditItem ARG:{self.state.belong_to} at {str(id(self))[-4:]}>"
 
 
 class ArgComboBox(QComboBox):
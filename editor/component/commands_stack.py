@@ -3,6 +3,77 @@ from PyQt5.QtWidgets import QUndoStack
 from editor.component.commands import CreateNodeCmd, CreateEdgeCmd, CreateNoteCmd
 from editor.component.commands import DeleteNodeCmd, DeleteEdgeCmd, DeleteNoteCmd
 from lib import Counter, debug
+from cfg import EDGE_DIRECT, EDGE_CURVES
+
+
+class KMBEdgeIndex(dict):
+    """ The edges by id, also indexed by the nodes they connect.
+
+    The commands in stack put and pop edges on it directly,
+    so the index is kept through create, delete, undo and redo.
+    The key (start, end, type) of an edge is saved once it's in,
+    since its items may be gone when it's popped.
+
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._incoming = {}  # node id -> {edge id: edge}
+        self._outgoing = {}  # node id -> {edge id: edge}
+        self._keys = {}      # (start id, end id, type) -> count
+        self._edge_keys = {}  # edge id -> (start id, end id, type)
+
+    def __setitem__(self, edge_id, edge):
+        if edge_id in self:
+            self._unindex(edge_id)
+        super().__setitem__(edge_id, edge)
+        key = (edge.start_item.id, edge.end_item.id, edge.edge_type)
+        self._edge_keys[edge_id] = key
+        self._keys[key] = self._keys.get(key, 0) + 1
+        self._outgoing.setdefault(key[0], {})[edge_id] = edge
+        self._incoming.setdefault(key[1], {})[edge_id] = edge
+
+    def __delitem__(self, edge_id):
+        self.pop(edge_id)
+
+    def pop(self, edge_id, *default):
+        if edge_id not in self:
+            return super().pop(edge_id, *default)
+        self._unindex(edge_id)
+        return super().pop(edge_id)
+
+    def clear(self):
+        super().clear()
+        self._incoming.clear()
+        self._outgoing.clear()
+        self._keys.clear()
+        self._edge_keys.clear()
+
+    def _unindex(self, edge_id):
+        key = self._edge_keys.pop(edge_id)
+        self._keys[key] -= 1
+        if not self._keys[key]:
+            del self._keys[key]
+        self._outgoing[key[0]].pop(edge_id)
+        self._incoming[key[1]].pop(edge_id)
+
+    def incoming(self, node_id: str) -> dict:
+        return self._incoming.get(node_id, {})
+
+    def outgoing(self, node_id: str) -> dict:
+        return self._outgoing.get(node_id, {})
+
+    def of_node(self, node_id: str) -> dict:
+        # all the edges that connect with node.
+        return {**self.outgoing(node_id), **self.incoming(node_id)}
+
+    def has(self, start_id: str, end_id: str, edge_type=None) -> bool:
+        # whether there's an edge from start to end,
+        # in this type or any type if it's None.
+        if edge_type is not None:
+            return (start_id, end_id, edge_type) in self._keys
+        return any((start_id, end_id, t) in self._keys
+                   for t in (EDGE_DIRECT, EDGE_CURVES))
 
 
 class KMBHistoryStack(QUndoStack):
@@ -10,7 +81,7 @@ class KMBHistoryStack(QUndoStack):
     def __init__(self, gr_scene, args_menu):
         super().__init__()
         self._nodes = {}
-        self._edges = {}
+        self._edges = KMBEdgeIndex()
         self._notes = {}
 
         self.gr_scene = gr_scene
@@ -67,6 +138,13 @@ class KMBHistoryStack(QUndoStack):
         # destroy one edge without saving into command stack.
         self._edges.pop(edge.id)
 
+    def edges_of(self, node) -> list:
+        # the edges that connect with node, by index.
+        return list(self._edges.of_node(node.id).values())
+
+    def has_edge(self, start_item, end_item, edge_type=None) -> bool:
+        return self._edges.has(start_item.id, end_item.id, edge_type)
+
     @property
     def notes(self):
         return self._notes
@@ -95,8 +173,6 @@ class KMBHistoryStack(QUndoStack):
 
     def _remove_relative_edges(self, node):
         # removing node also remove edge that connected to it.
-        edges = self._edges.copy()
-        for edge in edges.values():
-            if node == edge.start_item or node == edge.end_item:
-                self.gr_scene.removeItem(edge.gr_edge)
-                self.remove_edge(edge)
+        for edge in self.edges_of(node):
+            self.gr_scene.removeItem(edge.gr_edge)
+            self.remove_edge(edge)
@@ -2,13 +2,28 @@ from PyQt5.QtCore import QObject, QTimer, pyqtSignal
 
 
 class DelayedTimer(QObject):
+    """ Emit the string once it stops changing for min_delay,
+    or keeps changing for max_delay.
+
+    The delays adapt to the latency of the work after triggered,
+    which is reported by adapt(): the faster the work is, the
+    shorter the delays are, but never beyond the initial ones.
+
+    """
 
     triggered = pyqtSignal(str)
 
-    def __init__(self, parent=None, max_delay=2000, min_delay=500):
+    RATIO = 3     # delay / latency
+    SMOOTH = 0.3  # weight of the latest latency
+
+    def __init__(self, parent=None, max_delay=2000, min_delay=500, floor=50):
         super().__init__(parent)
         self.max_delay = max_delay
         self.min_delay = min_delay
+        self.floor = floor
+        self.ceil = min_delay
+        self.span = max_delay / min_delay
+        self.latency: float = None
         self.min_timer = QTimer(self)
         self.max_timer = QTimer(self)
         self.min_timer.timeout.connect(self.timeout)
@@ -20,6 +35,15 @@ class DelayedTimer(QObject):
         self.max_timer.stop()
         self.triggered.emit(self.string)
 
+    def adapt(self, latency: float):
+        # latency in ms, which is smoothed.
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.SMOOTH * (latency - self.latency)
+        self.min_delay = int(min(max(self.latency * self.RATIO, self.floor), self.ceil))
+        self.max_delay = int(self.min_delay * self.span)
+
     def trigger(self, p_str: str):
         self.string = p_str
         if not self.max_timer.isActive():
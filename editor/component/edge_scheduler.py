@@ -0,0 +1,34 @@
+from PyQt5.QtCore import QObject, QTimer
+
+
+class EdgeUpdateScheduler(QObject):
+    """ Update the geometry of edges at most once per frame.
+
+    Moving nodes only marks their edges dirty, then a single timer
+    recomputes every dirty edge once in the next frame, no matter
+    how many times its nodes moved in between.
+
+    """
+
+    FRAME = 16  # ms, about 60 fps.
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._dirty = {}  # edge id -> edge, in marking order.
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.FRAME)
+        self.timer.timeout.connect(self.flush)
+
+    def mark(self, edges):
+        for edge in edges:
+            self._dirty[edge.id] = edge
+        if self._dirty and not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        dirty, self._dirty = self._dirty, {}
+        for edge in dirty.values():
+            # the edge may be removed before this frame.
+            if edge.gr_edge is not None:
+                edge.update_positions()
@@ -0,0 +1,66 @@
+from PyQt5.QtWidgets import QGraphicsView
+from PyQt5.QtGui import QPainter
+from PyQt5.QtCore import QObject, QTimer
+
+
+class LevelOfDetail(QObject):
+    """ Switch the view between full and low quality rendering.
+
+    While a large scene is zoomed out and being scrolled, zoomed
+    or dragged, nodes are drawn as flat boxes and edges as plain
+    lines without antialiasing, their texts are skipped, and only
+    the changed parts of view are painted. Full quality comes back
+    once zoomed in, or after the view stays idle for a while.
+
+    """
+
+    SCALE = 0.5   # zoomed out below this scale,
+    ITEMS = 200   # with more nodes than this.
+    IDLE = 300    # ms
+    HINTS = (QPainter.Antialiasing |
+             QPainter.HighQualityAntialiasing |
+             QPainter.TextAntialiasing |
+             QPainter.SmoothPixmapTransform |
+             QPainter.LosslessImageRendering)
+
+    def __init__(self, view, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.low = False
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.IDLE)
+        self.timer.timeout.connect(self.restore)
+
+    def is_wanted(self) -> bool:
+        scene = self.view.gr_scene.scene
+        return (self.view.transform().m11() < self.SCALE and
+                len(scene.history.nodes) > self.ITEMS)
+
+    def touch(self):
+        # called on every interaction with view.
+        if self.is_wanted():
+            self._apply(True)
+            self.timer.start()
+        else:
+            self.restore()
+
+    def restore(self):
+        self.timer.stop()
+        self._apply(False)
+
+    # ----------UTILS----------
+
+    def _apply(self, low: bool):
+        if low == self.low:
+            return
+        self.low = low
+        gr_scene = self.view.gr_scene
+        gr_scene.lod = low
+        self.view.setRenderHints(QPainter.RenderHints() if low else self.HINTS)
+        self.view.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate if low
+                                        else QGraphicsView.FullViewportUpdate)
+        # the cached pixmaps of nodes are drawn again.
+        for node in gr_scene.scene.history.nodes.values():
+            node.gr_node.update()
+        self.view.viewport().update()
@@ -56,7 +56,7 @@ class ReferenceBySemaphore:
             for ref_dict in self._ref_by_dict.values():
                 for ref in ref_dict.values():
                     if ref.tag == 0:
-                        ref.setBackground(self.ref_color)
+                        ref.set_background(self.ref_color)
                     if value.startswith('@'):
                         pass  # avoid trapping in recursion.
                     elif value == '':
@@ -91,6 +91,40 @@ class ReferenceBySemaphore:
         return len(self._ref_by_dict.get(node_id))
 
 
+class DirtySemaphore:
+    """ The semaphore of nodes whose args changed since last serializing.
+
+    Anyone can subscribe it, the callback is called with node id
+    once the node turns dirty, and not again until it's taken.
+
+    """
+
+    def __init__(self):
+        self._dirty = set()
+        self._subscribers = []
+
+    def add(self, node_id: str):
+        if node_id in self._dirty:
+            return
+        self._dirty.add(node_id)
+        for callback in self._subscribers:
+            callback(node_id)
+
+    def get(self):
+        return frozenset(self._dirty)
+
+    def take(self) -> set:
+        # take all the dirty nodes, then they're clean.
+        dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+
 class ModelIOSemaphore:
     """ The semaphore of model's inputs and outputs. """
 
@@ -106,6 +140,7 @@ class ModelIOSemaphore:
             self._inputs[node_id] = node_vn_item
         else:
             self._outputs[node_id] = node_vn_item
+        self._owner.touch()
         debug(f'[IO {sign}pt] add {node_id} in {self._owner.var_name}')
 
     def get(self):
@@ -119,6 +154,7 @@ class ModelIOSemaphore:
         elif node_id in self._outputs:
             self._outputs.pop(node_id)
             debug(f'[DEL O] at {node_id}')
+        self._owner.touch()
 
     def order(self, order_key: list, io_type: str):
         # change the order of io
@@ -132,3 +168,4 @@ class ModelIOSemaphore:
             for key in new_dict.keys():
                 new_dict[key] = self._outputs[key]
             self._outputs = new_dict
+        self._owner.touch()
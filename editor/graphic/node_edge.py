@@ -2,7 +2,7 @@ import math
 
 from PyQt5.QtWidgets import QGraphicsPathItem, QGraphicsItem, QApplication
 from PyQt5.QtGui import QColor, QPen, QBrush
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QLineF
 
 from cfg import EDGE_WIDTH, EDGE_DIRECT, color
 
@@ -38,6 +38,10 @@ class KMBGraphicEdge(QGraphicsPathItem):
         self._pen_dragging.setStyle(Qt.DashDotLine)
         self._pen_dragging.setWidthF(self.width)
 
+        # plain line in low quality, one pixel wide in any zoom.
+        self._pen_lod = QPen(self._color_io)
+        self._pen_lod.setCosmetic(True)
+
         self._mark_pen = QPen(Qt.green)
         self._mark_pen.setWidthF(self.width)
         self._mark_brush = QBrush()
@@ -66,17 +70,27 @@ class KMBGraphicEdge(QGraphicsPathItem):
         # every type of edges are special here.
         raise NotImplemented
 
+    def refresh(self):
+        # the path is only calculated after src or dst moved,
+        # not in every painting.
+        self.setPath(self.calc_path())
+
     def boundingRect(self):
-        return self.shape().boundingRect()
+        # with half of the pen around, or the wide pens
+        # leave trails when only the changed parts are painted.
+        pad = self.width / 2
+        return self.path().boundingRect().adjusted(-pad, -pad, pad, pad)
 
     def shape(self):
-        return self.calc_path()
+        return self.path()
 
     def paint(self, painter, graphics_item, widget=None):
-        self.setPath(self.calc_path())
-
         path = self.path()
-        if self.edge.end_item is None:
+        scene = self.scene()
+        if scene is not None and scene.lod:
+            painter.setPen(self._pen_lod if not self.isSelected() else self._pen_selected)
+            painter.drawLine(QLineF(*self.pos_src, *self.pos_dst))
+        elif self.edge.end_item is None:
             painter.setPen(self._pen_dragging)
             painter.drawPath(path)
         else:
@@ -1,16 +1,20 @@
 from PyQt5.QtWidgets import (QGraphicsItem, QGraphicsPixmapItem,
                              QMenu, QAction, QInputDialog, QApplication)
-from PyQt5.QtGui import QPixmap, QCursor, QIcon
+from PyQt5.QtGui import QPixmap, QCursor, QIcon, QColor
 from PyQt5.QtCore import Qt, QPropertyAnimation, QPointF, QEasingCurve
 
 from editor.graphic.node_text import KMBNodeTextItem
 from editor.component.attrs_manager import GrPosManager
 from lib import debug, write_custom_pin, update_custom_pin
-from cfg import NODE_ICONx85_PATH, NODE_ICONx120_PATH, icon
+from cfg import NODE_ICONx85_PATH, NODE_ICONx120_PATH, icon, color
 
 
 class KMBNodeGraphicItem(QGraphicsPixmapItem):
 
+    PIXMAPS = {}  # (path, ratio) -> pixmap
+    COLORS = {}   # (path, ratio) -> the mean color of pixmap
+    ICONS = {}
+
     def __init__(self, node, name, sort, main_editor, parent=None):
         super().__init__(parent)
         self.node = node  # the wrapper of itself
@@ -24,27 +28,45 @@ class KMBNodeGraphicItem(QGraphicsPixmapItem):
         # compatible with Mac Retina screen.
         self.ratio = QApplication.desktop().screen().devicePixelRatio()
         if self.ratio == 2:
-            self.pix = QPixmap(NODE_ICONx120_PATH.format(self.sort, self.name))
+            path = NODE_ICONx120_PATH.format(self.sort, self.name)
             self.width = 60
             self.height = 60
         else:
-            self.pix = QPixmap(NODE_ICONx85_PATH.format(self.sort, self.name))
+            path = NODE_ICONx85_PATH.format(self.sort, self.name)
             self.width = 85
             self.height = 85
-        self.pix.setDevicePixelRatio(self.ratio)
+        # the same kind of nodes share one pixmap.
+        if (path, self.ratio) not in self.PIXMAPS:
+            pix = QPixmap(path)
+            pix.setDevicePixelRatio(self.ratio)
+            self.PIXMAPS[(path, self.ratio)] = pix
+            # the flat box drawn in low quality.
+            if pix.isNull():
+                mean = QColor(color['NODE_LOD'])
+            else:
+                mean = pix.scaled(1, 1, Qt.IgnoreAspectRatio,
+                                  Qt.SmoothTransformation).toImage().pixelColor(0, 0)
+                mean.setAlpha(255)
+            self.COLORS[(path, self.ratio)] = mean
+        self.pix = self.PIXMAPS[(path, self.ratio)]
+        self.lod_color = self.COLORS[(path, self.ratio)]
 
         self._arg_model = None
+        # icons of right menu are also shared.
+        if not self.ICONS:
+            self.ICONS.update({k: QIcon(icon[k]) for k in ('PIN_RM', 'PIN_UPDATE', 'TOKEN',
+                                                           'FREE', 'INPUTS', 'OUTPUTS')})
         # right menu for pin
         self.right_menu = QMenu()
-        self.rm_pin = QIcon(icon['PIN_RM'])
-        self.rm_pin_up = QIcon(icon['PIN_UPDATE'])
+        self.rm_pin = self.ICONS['PIN_RM']
+        self.rm_pin_up = self.ICONS['PIN_UPDATE']
         # right menu for ref
-        self.rm_token = QIcon(icon['TOKEN'])
-        self.rm_free = QIcon(icon['FREE'])
+        self.rm_token = self.ICONS['TOKEN']
+        self.rm_free = self.ICONS['FREE']
         self._ref_item = None
         # right menu for io
-        self.rm_input = QIcon(icon['INPUTS'])
-        self.rm_output = QIcon(icon['OUTPUTS'])
+        self.rm_input = self.ICONS['INPUTS']
+        self.rm_output = self.ICONS['OUTPUTS']
         self._io_item = None
         self._io_edge_id = None
         self._ref_edge_id = None
@@ -108,6 +130,15 @@ class KMBNodeGraphicItem(QGraphicsPixmapItem):
 
     # ------------OVERRIDE METHODS--------------
 
+    def paint(self, painter, option, widget=None):
+        # a flat box in low quality.
+        scene = self.scene()
+        if scene is not None and scene.lod:
+            painter.fillRect(self.boundingRect(),
+                             Qt.white if self.isSelected() else self.lod_color)
+        else:
+            super().paint(painter, option, widget)
+
     def mousePressEvent(self, event):
         super().mousePressEvent(event)
         self.setZValue(self.z_value)
@@ -116,10 +147,11 @@ class KMBNodeGraphicItem(QGraphicsPixmapItem):
     def mouseMoveEvent(self, event):
         super().mouseMoveEvent(event)
         self.is_modified()
-        # update selected node and its edge
-        for node in self.scene().scene.history.nodes.values():
-            if node.gr_node.isSelected():
-                node.update_connect_edges()
+        # update selected node and its edge,
+        # the scene keeps the selected ones already.
+        for item in self.scene().selectedItems():
+            if isinstance(item, KMBNodeGraphicItem):
+                item.node.update_connect_edges()
 
     def mouseReleaseEvent(self, event):
         super().mouseReleaseEvent(event)
@@ -181,7 +213,10 @@ class KMBNodeGraphicItem(QGraphicsPixmapItem):
 
         inh_actions = []  # actions for inherit args
         org_actions = []  # actions for original args
-        for idx, arg_name, arg_value in self._arg_model.items():
+        # only visit the Reference rows, by the index of store.
+        for idx in self._arg_model.ref_args:
+            arg_name = self._arg_model.item(idx, 0)
+            arg_value = self._arg_model.peek(idx)
             if conditions():
                 # make a action with different state mark.
                 if arg_value.is_referenced:
@@ -228,8 +263,11 @@ class KMBNodeGraphicItem(QGraphicsPixmapItem):
         # especially for Model. cannot pin.
         inputs = []
         outputs = []
-        for idx, arg_name, arg_value in self._arg_model.items():
-            item_name = arg_name.text()
+        for item_name in ('model_name', 'inputs', 'outputs'):
+            idxs = self._arg_model.rows_by_name(item_name)
+            if not idxs:
+                continue
+            arg_value = self._arg_model.peek(idxs[0])
             # sub header show with INPUTS.
             if item_name == 'model_name':
                 sub = self._make_a_sub_header(f'Model Name: {arg_value.value}')
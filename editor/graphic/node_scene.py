@@ -1,13 +1,20 @@
-import math
-
 from PyQt5.QtWidgets import QGraphicsScene
-from PyQt5.QtGui import QColor, QPen
-from PyQt5.QtCore import QLine, pyqtSignal
+from PyQt5.QtGui import QColor, QPen, QPixmap, QPainter, QBrush, QTransform
+from PyQt5.QtCore import QLineF, pyqtSignal
 
 from cfg import color
 
 
 class KMBNodeGraphicScene(QGraphicsScene):
+    """ The scene of nodes, with a grid in its background.
+
+    One tile of the grid (a dark square and its light lines) is
+    rendered once for each zoom level, then the background is
+    filled by it as a brush, instead of drawing every line.
+
+    """
+
+    MAX_TILE = 2048  # px, the biggest tile to render.
 
     # right menu signal, when picked up an arg item
     PICKED_ONE_ARG_TO_REF = pyqtSignal(str, int, str)  # dst id, idx, src id
@@ -32,6 +39,24 @@ class KMBNodeGraphicScene(QGraphicsScene):
         self._pen_dark.setWidth(2)
 
         self.setBackgroundBrush(self._color_background)
+        # zoom scale -> the tile brush of grid.
+        self._tiles = {}
+        # whether items are drawn in low quality, set by view.
+        self.lod = False
+
+    def set_colors(self, background=None, light=None, dark=None):
+        # the tiles are made again once colors changed.
+        if background is not None:
+            self._color_background = QColor(background)
+            self.setBackgroundBrush(self._color_background)
+        if light is not None:
+            self._color_light = QColor(light)
+            self._pen_light.setColor(self._color_light)
+        if dark is not None:
+            self._color_dark = QColor(dark)
+            self._pen_dark.setColor(self._color_dark)
+        self._tiles.clear()
+        self.update()
 
     def set_graphic_scene(self, width, height):
         self.setSceneRect(-width // 2, -height // 2, width, height)
@@ -61,34 +86,35 @@ class KMBNodeGraphicScene(QGraphicsScene):
         self.WAS_DONE_PICKING_ONE.emit(True)
 
     def drawBackground(self, painter, rect):
-        super().drawBackground(painter, rect)
-
-        left = int(math.floor(rect.left()))
-        right = int(math.ceil(rect.right()))
-        top = int(math.floor(rect.top()))
-        bottom = int(math.ceil(rect.bottom()))
-
-        first_left = left - (left % self.grid_size)
-        first_top = top - (top % self.grid_size)
-
-        lines_light, lines_dark = [], []
-        for x in range(first_left, right, self.grid_size):
-            if x % (self.grid_size * self.grid_squares) != 0:
-                lines_light.append(QLine(x, top, x, bottom))
-            else:
-                lines_dark.append(QLine(x, top, x, bottom))
-
-        for y in range(first_top, bottom, self.grid_size):
-            if y % (self.grid_size * self.grid_squares) != 0:
-                lines_light.append(QLine(left, y, right, y))
-            else:
-                lines_dark.append(QLine(left, y, right, y))
-
-        # draw the lines
+        scale = round(painter.worldTransform().m11(), 4)
+        brush = self._tiles.get(scale)
+        if brush is None:
+            brush = self._tiles[scale] = self._make_tile(scale)
+        painter.fillRect(rect, brush)
+
+    # ----------UTILS----------
+
+    def _make_tile(self, scale: float) -> QBrush:
+        # Render one tile in device pixels, so it's still sharp,
+        # then map it back to scene by the brush transform.
+        size = self.grid_size * self.grid_squares
+        scale = min(scale, self.MAX_TILE / size)
+        pixels = max(1, int(round(size * scale)))
+        scale = pixels / size
+        pixmap = QPixmap(pixels, pixels)
+        pixmap.fill(self._color_background)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.scale(scale, scale)
+        lines = [QLineF(x, 0, x, size) for x in range(self.grid_size, size, self.grid_size)]
+        lines += [QLineF(0, y, size, y) for y in range(self.grid_size, size, self.grid_size)]
         painter.setPen(self._pen_light)
-        if lines_light:
-            painter.drawLines(*lines_light)
-
+        painter.drawLines(lines)
+        # the dark line is on the edges, half of it in each tile.
         painter.setPen(self._pen_dark)
-        if lines_dark:
-            painter.drawLines(*lines_dark)
+        painter.drawLines([QLineF(0, 0, 0, size), QLineF(size, 0, size, size),
+                           QLineF(0, 0, size, 0), QLineF(0, size, size, size)])
+        painter.end()
+        brush = QBrush(pixmap)
+        brush.setTransform(QTransform.fromScale(1 / scale, 1 / scale))
+        return brush
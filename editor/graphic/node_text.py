@@ -28,6 +28,12 @@ class KMBNodeTextItem(QGraphicsTextItem):
     def __repr__(self):
         return "<NodeText {}>".format(self.text)
 
+    def paint(self, painter, option, widget=None):
+        # skipped in low quality.
+        scene = self.scene()
+        if scene is None or not scene.lod:
+            super().paint(painter, option, widget)
+
     def appear(self):
         self.setVisible(True)
 
@@ -1,6 +1,6 @@
 from PyQt5.QtWidgets import QGraphicsView, QApplication, QMessageBox
 from PyQt5.QtCore import Qt, QEvent, pyqtSignal, QPoint
-from PyQt5.QtGui import QPainter, QMouseEvent, QCursor, QPixmap, QWheelEvent
+from PyQt5.QtGui import QMouseEvent, QCursor, QPixmap, QWheelEvent
 
 from editor.graphic.node_item import KMBNodeGraphicItem
 from editor.graphic.node_edge import KMBGraphicEdge
@@ -9,6 +9,7 @@ from editor.wrapper.wrap_item import KMBNodeItem
 from editor.wrapper.wrap_edge import KMBEdge
 from editor.component.edge_type import KMBGraphicEdgeBezier, KMBGraphicEdgeDirect
 from editor.component.messages import PopMessageBox
+from editor.component.lod import LevelOfDetail
 from editor.widgets.sidebar import KMBViewSideBar
 from editor.threads import OrganizingThread, SearchBarThread
 
@@ -92,6 +93,10 @@ class KMBNodeGraphicView(QGraphicsView):
         self.current_node_pin_id = None
         # record group selected items.
         self.rubber_select = []
+        # the running organizing thread.
+        self.organizer = None
+        # low quality rendering for large scenes.
+        self.lod = LevelOfDetail(self, self)
 
         self.zoom_in_factor = 1.25
         self.zoom = 10
@@ -104,12 +109,10 @@ class KMBNodeGraphicView(QGraphicsView):
 
     def init_ui(self):
         self.setScene(self.gr_scene)
-        self.setRenderHints(QPainter.Antialiasing |
-                            QPainter.HighQualityAntialiasing |
-                            QPainter.TextAntialiasing |
-                            QPainter.SmoothPixmapTransform |
-                            QPainter.LosslessImageRendering)
+        self.setRenderHints(LevelOfDetail.HINTS)
         self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        # the grid is kept while items moving, only made on scrolling.
+        self.setCacheMode(QGraphicsView.CacheBackground)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setTransformationAnchor(self.AnchorUnderMouse)
@@ -208,7 +211,7 @@ class KMBNodeGraphicView(QGraphicsView):
         if self.mode == EDGE_DRAG:
             sc_pos = self.mapToScene(pos)
             self.drag_edge.gr_edge.set_dst(sc_pos.x(), sc_pos.y())
-            self.drag_edge.gr_edge.update()
+            self.drag_edge.gr_edge.refresh()
 
         # emit pos changed signal
         self.last_scene_mouse_pos = self.mapToScene(pos)
@@ -226,9 +229,17 @@ class KMBNodeGraphicView(QGraphicsView):
         else:
             if self.sidebar.on_display:
                 self.sidebar.slide_out_animation()
+        # dragging items, edge or rubber band.
+        if event.buttons() or self.mode == EDGE_DRAG:
+            self.lod.touch()
 
         super().mouseMoveEvent(event)
 
+    def scrollContentsBy(self, dx, dy):
+        # panning or scrolling.
+        self.lod.touch()
+        super().scrollContentsBy(dx, dy)
+
     def wheelEvent(self, event):
         # check whether should be end.
         if self.disable_wheel:
@@ -255,6 +266,7 @@ class KMBNodeGraphicView(QGraphicsView):
         # set the gr_scene scale
         if not clamped or self.zoom_clamp is False:
             self.scale(zoom_factor, zoom_factor)
+        self.lod.touch()
 
     def keyPressEvent(self, event):
         """ Shortcut: available only view is focused.
@@ -426,9 +438,10 @@ class KMBNodeGraphicView(QGraphicsView):
             self.current_node_item_name = args[0]
             self.current_node_item_sort = args[1]
             self.current_node_item_type = args[2]
-            self.current_node_pin_id = None
             self.current_node_pin_args = args[3]
             x, y = args[4]
+            # only the pin from search bar has its id.
+            self.current_node_pin_id = args[5] if len(args) > 5 else None
         else:
             x, y = self.get_last_xy()
         node = KMBNodeItem(self.gr_scene,
@@ -669,8 +682,15 @@ class KMBNodeGraphicView(QGraphicsView):
         self.wheelEvent(fake_wheel_event)
 
     def organize_nodes(self):
-        # start organizing nodes in another thread.
-        OrganizingThread(self.gr_scene.scene.history.nodes)()
+        # start organizing nodes in another thread,
+        # only one at a time.
+        scene = self.gr_scene.scene
+        if self.organizer is not None and self.organizer.isRunning() or\
+           scene.animator.is_running():
+            return
+        self.organizer = OrganizingThread(scene.history)
+        self.organizer.organized.connect(scene.animator.move)
+        self.organizer()
 
     def locating_center(self):
         # locating to view center.
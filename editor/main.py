@@ -1,4 +1,5 @@
-from PyQt5.QtWidgets import QMainWindow, QLabel, QAction, QFileDialog, QMessageBox
+from PyQt5.QtWidgets import (QMainWindow, QLabel, QAction, QFileDialog, QMessageBox,
+                             QProgressBar, QPushButton)
 from PyQt5.QtGui import QIcon
 
 from editor.widgets.about import AboutKMB
@@ -6,9 +7,16 @@ from editor.widgets.forms import ExportFormDialog
 from editor.widgets.node_editor import MainNodeEditor
 from editor.component.messages import PopMessageBox
 from editor.threads import SavingThread, LoadingThread
+from lib.parser.binary import XML_SUFFIX, BINARY_SUFFIX
 from cfg import icon, tips
 
 
+PROJECT_FILTER_XML = f'KMB Module (*{XML_SUFFIX})'
+PROJECT_FILTER_BIN = f'KMB Binary Module (*{BINARY_SUFFIX})'
+PROJECT_FILTERS = ';;'.join((PROJECT_FILTER_XML, PROJECT_FILTER_BIN))
+PROJECT_OPEN_FILTER = f'KMB Module (*{XML_SUFFIX} *{BINARY_SUFFIX})'
+
+
 class KMBMainWindow(QMainWindow):
 
     def __init__(self, screen_size):
@@ -22,6 +30,10 @@ class KMBMainWindow(QMainWindow):
         # init widget
         self.node_editor = MainNodeEditor(self)
         self.status_mouse_pos = QLabel("(x,y)")
+        self.status_progress = QProgressBar()
+        self.status_cancel = QPushButton('Cancel')
+        # background tasks that are running.
+        self.tasks = set()
         self.toolbar = self.addToolBar('Toolbar')
         self.history = self.node_editor.history
         # init attrs
@@ -83,7 +95,13 @@ class KMBMainWindow(QMainWindow):
 
     def create_status_bar(self):
         self.statusBar().showMessage("Welcome to Karken: KMB!")
+        self.statusBar().addPermanentWidget(self.status_progress)
+        self.statusBar().addPermanentWidget(self.status_cancel)
         self.statusBar().addPermanentWidget(self.status_mouse_pos)
+        self.status_progress.setFixedWidth(150)
+        self.status_progress.hide()
+        self.status_cancel.hide()
+        self.status_cancel.clicked.connect(self.cancel_tasks)
 
     def set_toolbar_tooltip(self):
         # set action tooltips
@@ -278,13 +296,16 @@ class KMBMainWindow(QMainWindow):
             file_dialog = QFileDialog()
             file = file_dialog.getSaveFileName(self,
                                                "Saving Module",
-                                               "/", "KMB Module (*.kmbm)")
+                                               "/", PROJECT_FILTERS)
             if file[0]:  # confirm
-                self.save_path = file[0]
+                self.save_path = self._with_suffix(*file)
             else:  # cancel
                 return False
-        # continue saving.
-        SavingThread(self.node_editor.serialize(), self.save_path)()
+        # continue saving, in background.
+        task = SavingThread(self.node_editor.serialize(), self.save_path)
+        task.failed.connect(self._on_save_failed)
+        task.canceled.connect(self.update_modify_state)
+        self.track_task(task, 'Saving...')
         # change windows title to current project path.
         self.setWindowTitle(self.save_path.replace('*', ''))
         self.is_modified = False
@@ -295,10 +316,14 @@ class KMBMainWindow(QMainWindow):
         pass
 
     def export_(self):
-        # export current project to a certain file.
-        if self.save_(otherwise='export'):
+        # export current project to a certain file,
+        # it comes from the nodes in memory, so no need to save first.
+        if self._cur_proj_is_empty():
+            self.pop_msg.make("Current project has nothing to export.")
+        else:
             model_name = self._get_model_name()
-            export = ExportFormDialog(self.save_path,
+            export = ExportFormDialog(self.node_editor.serialize(),
+                                      self.save_path,
                                       self, model_name,
                                       self.last_author,
                                       self.last_comment,
@@ -307,13 +332,18 @@ class KMBMainWindow(QMainWindow):
             (self.last_author,
              self.last_comment,
              self.last_location) = export.get_inputs()
-        else:
-            self.pop_msg.make('Export has been canceled.')
 
     def about_(self):
         AboutKMB(self)()
 
     def closeEvent(self, event):
+        # let the running tasks finish (like saving) before closing.
+        self._close_event(event)
+        if event.isAccepted():
+            for task in list(self.tasks):
+                task.wait()
+
+    def _close_event(self, event):
         if self.is_modified:
             state = self.close_msg.exec()
             if state == QMessageBox.Yes:
@@ -328,6 +358,45 @@ class KMBMainWindow(QMainWindow):
         else:
             event.accept()
 
+    # --------------------------------------
+    #                 TASKS
+    # --------------------------------------
+
+    def track_task(self, task, text: str):
+        # run the task in background, and show its progress.
+        self.tasks.add(task)
+        task.progress.connect(self.update_progress)
+        task.finished.connect(self._untrack_task)
+        self.status_progress.setRange(0, 0)  # busy until reported.
+        self.status_progress.show()
+        self.status_cancel.show()
+        self.statusBar().showMessage(text)
+        task()
+
+    def update_progress(self, done: int, total: int):
+        # total of 0 means unknown, then keep it busy.
+        self.status_progress.setRange(0, total)
+        self.status_progress.setValue(done)
+
+    def cancel_tasks(self):
+        for task in self.tasks:
+            task.cancel()
+
+    def _untrack_task(self):
+        task = self.sender()
+        self.tasks.discard(task)
+        if task.isInterruptionRequested():
+            self.statusBar().showMessage('Canceled.', 2000)
+        else:
+            self.statusBar().clearMessage()
+        if not self.tasks:
+            self.status_progress.hide()
+            self.status_cancel.hide()
+
+    def _on_save_failed(self, err: str):
+        self.update_modify_state()
+        self.pop_msg.make(f'Fail to save this project: {err}')
+
     # --------------------------------------
     #                  UTILS
     # --------------------------------------
@@ -349,18 +418,30 @@ class KMBMainWindow(QMainWindow):
         file_dialog = QFileDialog()
         file = file_dialog.getOpenFileName(self,
                                            "Karken: KMB Module File",
-                                           "/", "KMB Module (*.kmbm)")
+                                           "/", PROJECT_OPEN_FILTER)
         if file[0]:
             if self.save_path == file[0]:
                 self.pop_msg.make('That project is opening now.')
             else:
                 self._drop_cur_proj()
                 self.save_path = file[0]  # change save path to current.
-                LoadingThread(self.save_path, self.node_editor)()
+                task = LoadingThread(self.save_path, self.node_editor)
+                # a broken or canceled one leaves nothing.
+                task.failed.connect(self._drop_cur_proj)
+                task.canceled.connect(self._drop_cur_proj)
+                self.track_task(task, 'Opening...')
                 self.setWindowTitle(self.save_path)
         else:
             return
 
+    @classmethod
+    def _with_suffix(cls, path: str, selected: str) -> str:
+        # add the suffix of selected format if it's missing.
+        suffix = BINARY_SUFFIX if selected == PROJECT_FILTER_BIN else XML_SUFFIX
+        if not path.endswith((XML_SUFFIX, BINARY_SUFFIX)):
+            path += suffix
+        return path
+
     def _cur_proj_is_empty(self) -> bool:
         # check whether current project is empty.
         return False if self.node_editor.nodes_view.items() else True
@@ -1,61 +1,63 @@
 """ Animation threads """
-from PyQt5.QtCore import QThread, QPointF
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
 
-from cfg import SCENE_WIDTH, SCENE_HEIGHT
+from cfg import EDGE_CURVES
+from editor.component.animator import NodesAnimator
+from lib.layout import LayeredLayout
 
 
 class OrganizingThread(QThread):
     """ A thread for organizing the nodes pos.
-    Basically, split one scene into matrix, and
-    change the node pos to the nearest cell center. """
+    The nodes are laid out in layers by their direct edges,
+    and the notes keep beside the nearest node of theirs.
 
-    def __init__(self, node_set: dict, parent=None):
+    The pos and edges are read on main thread, the layout is
+    calculated here, then the animator moves them together.
+
+    """
+
+    organized = pyqtSignal(list, object)  # items, new pos
+
+    def __init__(self, history, parent=None):
         """
         initialize
 
-        :param node_set: a dict full of nodes wrapper.
+        :param history: the history stack of nodes, edges and notes.
         :param parent: its parent.
         """
         super().__init__(parent)
-        self.node_set = node_set
-        self.cell_size = 100.0
-        self.map_center_x = SCENE_WIDTH // 2
-        self.map_center_y = SCENE_HEIGHT // 2
+        self.history = history
+        self.nodes = []
+        self.notes = []
+        self.edges = None
+        self.refs = None
+        self.node_pos: np.ndarray = None
+        self.note_pos: np.ndarray = None
 
     def __call__(self):
-        self.run()
+        # items can only be touched on main thread.
+        self.nodes = list(self.history.nodes.values())
+        self.notes = list(self.history.notes.values())
+        if not self.nodes:
+            return
+        index = {node.id: i for i, node in enumerate(self.nodes)}
+        edges, refs = [], []
+        for edge in self.history.edges.values():
+            pair = (index[edge.start_item.id], index[edge.end_item.id])
+            (refs if edge.edge_type == EDGE_CURVES else edges).append(pair)
+        self.edges, self.refs = edges, refs
+        self.node_pos = NodesAnimator.positions(self.nodes)
+        self.note_pos = NodesAnimator.positions(self.notes)
+        self.start()
 
     def run(self):
-        records = set()  # avoid repeating
-        for node in self.node_set.values():
-            gr_node = node.gr_node
-            old_x, old_y = self.map_to_global(gr_node.pos())
-            row, col = self.cell_nearest_pos(old_x, old_y)
-            # check repeating
-            if (row, col) in records:
-                row += 1
-            else:
-                records.add((row, col))
-            new_x, new_y = self.map_to_scene(row, col)
-            gr_node.move_to_pos(new_x, new_y)
-
-    def cell_nearest_pos(self, x: float, y: float):
-        # calculate the node belong to which cell.
-        i = int(x / self.cell_size)
-        j = int(y / self.cell_size)
-        # find the pos of nearest cell.
-        cell_x = i * self.cell_size + self.cell_size // 2
-        cell_y = j * self.cell_size + self.cell_size // 2
-        return cell_x, cell_y
-
-    def map_to_global(self, pos: QPointF):
-        # map scene pos to global pos.
-        gx = self.map_center_x + pos.x()
-        gy = self.map_center_y - pos.y()
-        return gx, gy
-
-    def map_to_scene(self, x: float, y: float):
-        # map global pos to scene pos.
-        sx = x - self.map_center_x
-        sy = self.map_center_y - y
-        return sx, sy
+        pos = LayeredLayout(len(self.nodes), self.edges, self.refs,
+                            init=self.node_pos).layout()
+        if self.notes:
+            # the nearest node of each note, and keep the offset.
+            dist = ((self.note_pos[:, None, :] - self.node_pos[None, :, :]) ** 2).sum(axis=2)
+            nearest = dist.argmin(axis=1)
+            note_pos = pos[nearest] + self.note_pos - self.node_pos[nearest]
+            pos = np.concatenate((pos, note_pos))
+        self.organized.emit(self.nodes + self.notes, pos)
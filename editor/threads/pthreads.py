@@ -1,49 +1,169 @@
 """ Wrap parser into QThread. """
-from PyQt5.QtCore import QThread
+import os
+import copy
+import tempfile
 
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from cfg import PROJECT_COMPRESS
 from editor.component.messages import PopMessageBox
-from lib.parser import ExportError, LoadingError
-from lib.parser import Saver, Loader
+from lib.dbpool import ConnectionPool
+from lib.parser import LoadingError
+from lib.parser import make_saver, make_loader, ExportCache
+from lib.parser.compress import detect
 from lib.parser import PyParser, PyHandler
 
 
-class SavingThread(QThread):
+class TaskCanceled(Exception):
+    """ Raised in worker thread once it's canceled. """
 
-    def __init__(self, serialized, dst: str):
-        super().__init__()
-        self.saver = Saver(serialized, dst)
+
+class WorkerThread(QThread):
+    """ The thread that really runs in background.
+
+    Calling it starts the thread, then the GUI only hears
+    from it by signals, which are delivered on main thread.
+
+    """
+
+    progress = pyqtSignal(int, int)  # done, total (0 means unknown)
+    failed = pyqtSignal(str)
+    canceled = pyqtSignal()
 
     def __call__(self, *args, **kwargs):
-        self.run()
+        self.start()
+
+    def cancel(self):
+        self.requestInterruption()
+
+    def report(self, done: int, total: int = 0):
+        # report progress, also the point to stop if canceled.
+        if self.isInterruptionRequested():
+            raise TaskCanceled()
+        self.progress.emit(done, total)
+
+
+class SavingThread(WorkerThread):
+
+    saved = pyqtSignal(str)
+
+    def __init__(self, serialized, dst: str):
+        super().__init__()
+        self.dst = dst
+        # the format is chosen by the suffix of dst,
+        # and the compression keeps same as the existed one.
+        compress = detect(dst) if os.path.exists(dst) else PROJECT_COMPRESS
+        # save a snapshot, the scene may change while saving.
+        self.saver = make_saver(copy.deepcopy(serialized), dst, compress)
+        self.saver.progress = self.report
 
     def run(self):
-        self.saver.save_file()
+        # write into a temporary file first, so a canceled
+        # or failed saving never breaks the existed one,
+        # it's unique for each saving to the same dst.
+        fd, tmp = tempfile.mkstemp(suffix='.part',
+                                   prefix=os.path.basename(self.dst) + '.',
+                                   dir=os.path.dirname(os.path.abspath(self.dst)))
+        os.close(fd)
+        self.saver.dst_path = tmp
+        try:
+            self.saver.save_file()
+            os.replace(tmp, self.dst)
+            self.saved.emit(self.dst)
+        except TaskCanceled:
+            self._remove(tmp)
+            self.canceled.emit()
+        except Exception as err:
+            self._remove(tmp)
+            self.failed.emit(str(err))
+        finally:
+            ConnectionPool.close_thread()
+
+    @classmethod
+    def _remove(cls, path):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class LoadingThread(WorkerThread):
 
+    BATCH = 200  # nodes in one batch
 
-class LoadingThread(QThread):
+    loaded = pyqtSignal(list)
+    done = pyqtSignal()
 
     def __init__(self, src: str, editor):
         super().__init__()
-        self.loader = Loader(src)
+        # the format is detected from the file itself.
+        self.loader = make_loader(src)
         self.editor = editor
         self.msg_err = PopMessageBox('Open Error', run=True)
+        # the scene is built on main thread batch by batch,
+        # while the rest of file is still being read here.
+        self.broken = False
+        self.loaded.connect(self.on_loaded)
+        self.done.connect(self.on_done)
+        self.failed.connect(self.on_failed)
 
     def __call__(self, *args, **kwargs):
-        self.run()
+        self.editor.begin_deserialize()
+        self.start()
 
     def run(self):
+        batch = []
         try:
-            loads = self.loader.load_file()
-            self.editor.deserialize(loads)
+            for count, record in enumerate(self.loader.iter_file(), start=1):
+                batch.append(record)
+                if len(batch) >= self.BATCH:
+                    self.report(count)
+                    self.loaded.emit(batch)
+                    batch = []
+            self.loaded.emit(batch)
+            self.done.emit()
+        except TaskCanceled:
+            self.canceled.emit()
         except LoadingError as err:
-            self.msg_err.make(str(err), PopMessageBox.TYPE_ERROR)
+            self.failed.emit(str(err))
+        except Exception:
+            self.failed.emit(str(LoadingError(code=LoadingError.GOT_DAMAGED)))
+        finally:
+            ConnectionPool.close_thread()
+
+    def on_loaded(self, batch: list):
+        self._build(self.editor.deserialize_batch, batch)
 
+    def on_done(self):
+        self._build(self.editor.end_deserialize)
 
-class ExportThread(QThread):
+    def on_failed(self, err: str):
+        self.broken = True
+        self.msg_err.make(err, PopMessageBox.TYPE_ERROR)
+
+    def _build(self, slot, *args):
+        # Building runs on main thread, its errors are
+        # reported as the ones from reading.
+        if self.broken:
+            return
+        try:
+            slot(*args)
+        except LoadingError as err:
+            self._fail(str(err))
+        except Exception:
+            self._fail(str(LoadingError(code=LoadingError.GOT_DAMAGED)))
+
+    def _fail(self, err: str):
+        # the batches left are dropped.
+        self.cancel()
+        self.failed.emit(err)
+
+
+class ExportThread(WorkerThread):
 
     FMT_PY = 0  # python code
     FMT_MS = 1  # model summary
 
+    exported = pyqtSignal(str, int)
+
     def __init__(self, fmt: int, *args, parent):
         super().__init__()
         self.fmt = fmt
@@ -53,28 +173,43 @@ class ExportThread(QThread):
         self.msg_ok = PopMessageBox('Export Success', run=True)
         self.msg_err = PopMessageBox('Export Error', run=True)
         self.msg_warn = PopMessageBox('Export Warning', run=True)
+        # the message boxes only pop on main thread.
+        self.exported.connect(self.on_exported)
+        self.failed.connect(self.on_failed)
+        self.finished.connect(self.parent.close)
 
     def __call__(self, *args, **kwargs):
-        self.run()
+        # export a snapshot, the scene may change while exporting.
+        serialized, *args = self.args
+        self.args = (copy.deepcopy(serialized), *args)
+        self.start()
 
     def run(self):
         try:
-            w, c = self._execute()
-            # exception handler.
-            # success but with warnings.
-            if c > 0:
-                self.msg_warn.make('Export complete but got {} warnings.'.format(c),
-                                   PopMessageBox.TYPE_EXPORT_WARNING, extra_text=w)
-            # invalid export.
-            elif c < 0:
-                self.msg_err.make('Unfamiliar export format!')
-            # success. c = 0
-            else:
-                self.msg_ok.make('Export complete.', PopMessageBox.TYPE_OK)
-        except ExportError as err:
-            self.msg_err.make(str(err), PopMessageBox.TYPE_ERROR)
+            self.exported.emit(*self._execute())
+        except TaskCanceled:
+            self.canceled.emit()
+        # ExportError included, all reported by message.
+        except Exception as err:
+            self.failed.emit(str(err))
         finally:
-            self.parent.close()
+            ConnectionPool.close_thread()
+
+    def on_exported(self, w: str, c: int):
+        # exception handler.
+        # success but with warnings.
+        if c > 0:
+            self.msg_warn.make('Export complete but got {} warnings.'.format(c),
+                               PopMessageBox.TYPE_EXPORT_WARNING, extra_text=w)
+        # invalid export.
+        elif c < 0:
+            self.msg_err.make('Unfamiliar export format!')
+        # success. c = 0
+        else:
+            self.msg_ok.make('Export complete.', PopMessageBox.TYPE_OK)
+
+    def on_failed(self, err: str):
+        self.msg_err.make(err, PopMessageBox.TYPE_ERROR)
 
     def _execute(self):
         """
@@ -91,11 +226,16 @@ class ExportThread(QThread):
         return res
 
     def _run_fmt_py(self):
-        src, dst, name, author, comment = self.args
-        parser = PyParser(src)
+        serialized, src, dst, name, author, comment = self.args
+        # only the saved project has a place for cache.
+        cache = ExportCache.for_project(src) if src else None
+        self.report(0, 3)
+        parser = PyParser.from_serialized(serialized, cache)
+        self.report(1, 3)
         handler = PyHandler(parser, name, author, comment)
+        self.report(2, 3)
         return handler.export(dst)
 
     def _run_fmt_ms(self):
-        _, dst, name, author, _ = self.args
+        _, _, dst, name, author, _ = self.args
         return '', -1
@@ -1,7 +1,10 @@
 """ Searching thread """
-from PyQt5.QtCore import QThread
+import threading
 
-from lib import blur_query
+from PyQt5.QtCore import QThread, QCoreApplication, pyqtSignal
+
+from lib import SearchIndex
+from lib.dbpool import ConnectionPool
 from editor.widgets.search_bar import KMBSearchBar
 
 
@@ -29,7 +32,7 @@ class SearchBarThread(QThread):
     def is_display(self):
         return self.search_bar.on_display
 
-    def new_node(self, name: str, sort: str, category: str, args: str):
+    def new_node(self, name: str, sort: str, category: str, args: str, pin_id: str):
         # also change the coords every time making new node.
         if self.cur_stack >= self.stack:
             self.coords[0] += abs(self.step)
@@ -39,7 +42,7 @@ class SearchBarThread(QThread):
             self.coords[1] += self.step
             self.cur_stack += 1
         # candies are made of repeating nbr and args string.
-        self.view.add_node(name, sort, category, args, self.coords)
+        self.view.add_node(name, sort, category, args, self.coords, pin_id or None)
 
     def run(self):
         # run all the callbacks here.
@@ -63,21 +66,59 @@ class SearchBarThread(QThread):
 
 
 class SearchingThread(QThread):
-    """ A thread only for searching process. """
+    """ A thread only for searching process.
+
+    Every query is tagged with a generation number, the thread only
+    runs the newest one waiting, and emits its results by signal.
+    Those results older than the current generation are stale, and
+    the receiver should drop them. The thread quits after being idle
+    for a while, and starts again with the next query.
+
+    """
+
+    IDLE = 1.0  # seconds
+
+    searched = pyqtSignal(int, list, object)  # generation, results, candies
 
     def __init__(self, parent):
         super().__init__(parent)  # view
-        self.query_word: str = None
-        self.query_results = []
-        self.query_candies = None
+        self.index = SearchIndex()
+        self.generation = 0
+        self._pending = None  # (generation, query_word)
+        self._alive = False
+        self._cond = threading.Condition()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
 
     def search(self, query_word: str) -> int:
-        self.query_word = query_word
-        self.run()
-        # return the count of results.
-        return len(self.query_results)
-
-    def _search_candy(self):
+        # queue the query and return its generation.
+        with self._cond:
+            self.generation += 1
+            self._pending = (self.generation, query_word)
+            self._cond.notify()
+            if not self._alive:
+                self._alive = True
+                # it may be just quitting.
+                self.wait()
+                self.start()
+            return self.generation
+
+    def cancel(self):
+        # make all the queries stale.
+        with self._cond:
+            self.generation += 1
+            self._pending = None
+
+    def stop(self):
+        self.requestInterruption()
+        with self._cond:
+            self._pending = None
+            self._cond.notify()
+        self.wait()
+
+    @classmethod
+    def parse_candy(cls, query_word: str):
         """
         Some grammar in query line edit.
 
@@ -86,41 +127,42 @@ class SearchingThread(QThread):
 
         also with auto complete function.
         if the typing arg is not exist, then will pass it.
+
+        :return: the word to query and candies.
         """
-        query = self.query_word.replace(' ', '').split(';', 1)
+        query = query_word.replace(' ', '').split(';', 1)
         word, *args = query
         # :N candy
         nbr = 1
         if ':' in word:
-            query, nbr = word.split(':')
-            self.query_word = query
+            word, nbr = word.split(':', 1)
             nbr = int(nbr) if nbr.isdigit() else 1
         # [ARG; [...]] candy
         args = args[0] if args else 'None'
-        self.query_candies = (nbr, args)
-
-    def clean(self):
-        self.query_word = None
-        self.query_results = []
-        self.query_candies = None
-
-    def fetchall(self):
-        # a generator that fetch all query results.
-        for result in self.query_results:
-            # also highlight the key word.
-            from_idx = result[0].lower().index(self.query_word)
-            yield result, from_idx, len(self.query_word)
-        # clean all after fetching.
-        self.clean()
-
-    def fetch_candies(self):
-        return self.query_candies
+        return word, (nbr, args)
 
     def run(self):
-        self._search_candy()
-        self._query_database()
-
-    def _query_database(self):
-        # do query through database.
-        # fields: name, info, sort, category
-        self.query_results += blur_query(self.query_word)
+        try:
+            self._serve()
+        finally:
+            # it starts again with a new connection.
+            ConnectionPool.close_thread()
+
+    def _serve(self):
+        while not self.isInterruptionRequested():
+            with self._cond:
+                if self._pending is None:
+                    self._cond.wait(self.IDLE)
+                if self._pending is None:
+                    # nothing comes while waiting.
+                    self._alive = False
+                    return
+                generation, query_word = self._pending
+                self._pending = None
+            word, candies = self.parse_candy(query_word)
+            # do query through the index of nodes and pins,
+            # with the part of key word to highlight.
+            results = self.index.search(word)
+            if generation == self.generation:
+                self.searched.emit(generation, results, candies)
+        self._alive = False
@@ -20,7 +20,8 @@ class ExportFormDialog(QDialog):
     """ Form widget for export function. """
 
     def __init__(self,
-                 src_loc: str,
+                 serialized: dict,
+                 src_loc: str = None,
                  parent=None,
                  model_name: str = None,
                  last_author: str = None,
@@ -48,11 +49,13 @@ class ExportFormDialog(QDialog):
         self._title_font = QFont('Times New Roman')
 
         # recording inputs
+        self.serialized = serialized
         self.src_loc = src_loc
         self.dst_loc: str = last_location
         self.model_name: str = model_name
         self.model_author: str = last_author
         self.model_comment: str = last_comment
+        self.task: ExportThread = None
 
         self.init_ui()
         self.setup_body()
@@ -110,13 +113,19 @@ class ExportFormDialog(QDialog):
         # completed form.
         else:
             fmt = self.format.currentIndex()
-            ExportThread(fmt,
-                         self.src_loc,
-                         self.dst_loc,
-                         self.model_name,
-                         self.model_author,
-                         self.model_comment,
-                         parent=self)()
+            self.task = ExportThread(fmt,
+                                     self.serialized,
+                                     self.src_loc,
+                                     self.dst_loc,
+                                     self.model_name,
+                                     self.model_author,
+                                     self.model_comment,
+                                     parent=self)
+            # export in background, and now cancel button stops it.
+            self.confirm.setEnabled(False)
+            self.cancel.clicked.disconnect(self.close)
+            self.cancel.clicked.connect(self.task.cancel)
+            self.parent().track_task(self.task, 'Exporting...')
 
     # ----------UTILS----------
 
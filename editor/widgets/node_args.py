@@ -2,8 +2,9 @@ from PyQt5.QtWidgets import QTableView, QHeaderView, QAction, QMenu
 from PyQt5.QtGui import QStandardItemModel, QContextMenuEvent, QCursor
 from PyQt5.QtCore import Qt, pyqtSignal
 
-from editor.component.args_model import ArgsPreviewModel, ArgsEditableModel
+from editor.component.args_model import ArgsPreviewModel, ArgsStore
 from editor.component.args_model_item import ArgComboBox, ArgCheckBox, ArgIOOrderButton
+from editor.component.semaphores import DirtySemaphore
 from lib import DataBase4Args, debug, AutoInspector
 
 
@@ -24,9 +25,13 @@ class KMBNodesArgsMenu(QTableView):
         self.null_model = QStandardItemModel()
         # checking the value by its type.
         self.inspector = AutoInspector()
-        # for collection the ArgsEditableModel
+        # for collection the ArgsStore of nodes
         self.edit_model = {}
+        # the nodes whose args changed since last serializing.
+        self.dirty = DirtySemaphore()
         self.current_model = None
+        # the Qt model of current one, only lives while editing.
+        self.current_qt_model = None
         self.current_ref_model = None
         self.current_ref_dst_model_id = None
 
@@ -46,6 +51,7 @@ class KMBNodesArgsMenu(QTableView):
         self.IS_MODIFIED.emit(True)
 
     def set_preview_args(self, node_name):
+        self.evict_model()
         id_string, inherit = self.db_link.get_args_id(node_name)
         preview_model = ArgsPreviewModel(
             db_link=self.db_link,
@@ -56,14 +62,17 @@ class KMBNodesArgsMenu(QTableView):
         self.setModel(preview_model)
 
     def set_editing_args(self, node_id: str):
+        # the model of last node is no longer needed.
+        self.evict_model()
         if node_id == 'null':
             # set an empty model.
             self.setModel(self.null_model)
             return
-        # load args model that already exists.
+        # make the model from args store that already exists.
         try:
             self.current_model = self.edit_model[node_id]
-            self.setModel(self.current_model)
+            self.current_qt_model = self.current_model.materialize()
+            self.setModel(self.current_qt_model)
             # try to set combo box args
             if self.current_model.combo_args:
                 self.add_combobox_cell()
@@ -73,10 +82,18 @@ class KMBNodesArgsMenu(QTableView):
             # try to set io order args
             if self.current_model.io_order_args:
                 self.add_io_order_cell(node_id)
-            self.current_model.itemChanged.connect(self.modify_item)
+            self.current_qt_model.itemChanged.connect(self.modify_item)
         except KeyError:
             self.setModel(self.null_model)
 
+    def evict_model(self):
+        # drop the Qt model, only the args store stays.
+        if self.current_qt_model is None:
+            return
+        self.setModel(self.null_model)
+        self.current_qt_model.release()
+        self.current_qt_model = None
+
     def add_combobox_cell(self):
         for row, arg_init, args_list in self.current_model.combo_args:
             index = self.model().index(row, 1)
@@ -121,6 +138,8 @@ class KMBNodesArgsMenu(QTableView):
 
     def modify_item(self, item):
         old_value = item.text()
+        # the value behind the item.
+        item = item.state
         if item.is_referenced:
             # avoid referenced item here nor bug.
             pass
@@ -183,7 +202,7 @@ class KMBNodesArgsMenu(QTableView):
         # after adding node in canvas
         # first time make new model.
         id_string, inherit = self.db_link.get_args_id(node_name)
-        model = ArgsEditableModel(
+        model = ArgsStore(
             db_link=self.db_link,
             node_name=node_name,
             node_type=node_type,
@@ -194,6 +213,7 @@ class KMBNodesArgsMenu(QTableView):
             # the original args.
         )
         model.get_args(add_custom_args=True, count=count)
+        model.track(node_id, self.dirty)
         # then store it but don't display it.
         self.edit_model[node_id] = model
 
@@ -221,6 +241,7 @@ class KMBNodesArgsMenu(QTableView):
                                                  value_item.id_str)
         # finally hide that model instead of deleting.
         # self.edit_model.__delitem__(node_id)
+        self.evict_model()
         self.setModel(self.null_model)
 
     def fetch_node(self, node_id: str):
@@ -25,6 +25,7 @@ class MainNodeEditor(QWidget):
         )
         self.splitter = QSplitter(self)
         self.history = self.nodes_scene.history
+        self._loading = None
         # setup
         self.setup_layout()
         self.setup_slots()
@@ -169,7 +170,21 @@ class MainNodeEditor(QWidget):
                 print(v)
         return nodes_dict
 
-    def deserialize(self, feeds: dict):
-        # call by Loading thread.
-        print(feeds)
+    def deserialize(self, feeds):
         self.nodes_scene.deserialize(feeds, self.args_menu)
+
+    # call by Loading thread, the nodes come in batches,
+    # and the edges are made after all of them are ready.
+
+    def begin_deserialize(self):
+        self._loading = ({}, [])  # node_map, pending
+
+    def deserialize_batch(self, batch: list):
+        node_map, pending = self._loading
+        self.nodes_scene.deserialize_nodes(batch, self.args_menu,
+                                           node_map, pending)
+
+    def end_deserialize(self):
+        node_map, pending = self._loading
+        self.nodes_scene.deserialize_links(pending, self.args_menu, node_map)
+        self._loading = None
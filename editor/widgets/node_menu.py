@@ -1,5 +1,3 @@
-import sqlite3
-
 from PyQt5.QtWidgets import (QVBoxLayout, QToolButton, QGroupBox,
                              QToolBox, QTabWidget, QGridLayout)
 from PyQt5.QtCore import QSize, Qt, pyqtSignal
@@ -7,13 +5,10 @@ from PyQt5.QtGui import QIcon
 
 from editor.component.pin_toolbutton import PinToolBox
 from lib import read_custom_pin, create_ucp_tip
+from lib.catalog import NodeCatalog
 from cfg import icon, NODE_ICONx500_PATH
 
 
-DATABASE = sqlite3.connect('lib/node.db')
-CURSOR = DATABASE.cursor()
-
-
 class KMBNodesMenu(QTabWidget):
 
     # name, category, sort
@@ -44,10 +39,8 @@ class KMBNodesMenu(QTabWidget):
 
     def set_toolbox(self):
         nodes = {}
-        res = CURSOR.execute('SELECT * FROM nodes')
-        for one in res.fetchall():
-            _, name, info, _, _, sort, category = one
-            nodes.setdefault((sort, category), []).append((name, info))
+        for node in NodeCatalog.get().nodes.values():
+            nodes.setdefault((node.sort, node.category), []).append((node.name, node.info))
 
         for sc, ls in nodes.items():
             s, c = sc  # sorts & category
@@ -139,11 +132,8 @@ class KMBNodesMenu(QTabWidget):
 
     @classmethod
     def get_cs_from_db(cls, node_name: str):
-        # get category and sort from database by node name.
-        res = CURSOR.execute('SELECT CATEGORY, SORT '
-                             'FROM nodes '
-                             'WHERE NAME=(?)', (node_name,)).fetchone()
-        return res
+        # get category and sort from catalog by node name.
+        return NodeCatalog.get().category_sort(node_name)
 
     @classmethod
     def set_node_button(cls,
@@ -1,3 +1,4 @@
+import time
 from typing import Generator
 
 from PyQt5.QtWidgets import (QLineEdit, QAction, QWidget, QVBoxLayout, QApplication,
@@ -40,7 +41,9 @@ class KMBSearchBar(QWidget):
         # init delay timer and search thread
         self.delay_timer = DelayedTimer(self.search_line)
         self.search_thread = search_thread
+        self.query_at = None
         # init slots
+        self.search_thread.searched.connect(self.show_results)
         self.search_line.textChanged.connect(self.delay_timer.trigger)
         self.delay_timer.triggered.connect(self.do_query)
         self.search_line.FOCUS_ON_BODY.connect(self.focus_on_body)
@@ -52,16 +55,22 @@ class KMBSearchBar(QWidget):
         self.setStyleSheet(load_stylesheet(SS_SEARCH))
 
     def do_query(self, query_str: str):
-        # begin search and updates browser body.
+        # begin search, the results come later.
         if not query_str:
             self.recover()
         else:
-            count = self.search_thread.search(query_str)
-            generator = self.search_thread.fetchall()
-            candies = self.search_thread.fetch_candies()
-            self.search_body.feed_items(generator)
-            self.search_body.feed_candies(candies)
-            self.update_height(count)
+            self.query_at = time.perf_counter()
+            self.search_thread.search(query_str)
+
+    def show_results(self, generation: int, results: list, candies: tuple):
+        # updates browser body, if the results are not stale.
+        if generation != self.search_thread.generation:
+            return
+        self.search_body.feed_items(iter(results))
+        self.search_body.feed_candies(candies)
+        self.update_height(len(results))
+        # the delay follows how long it takes from query to display.
+        self.delay_timer.adapt((time.perf_counter() - self.query_at) * 1000)
 
     def update_size(self, width: int, height: int):
         self.w = int(width * self.width_ratio)
@@ -121,7 +130,8 @@ class KMBSearchBar(QWidget):
         self.search_line.setFocus()
 
     def recover(self):
-        # back to where begins.
+        # back to where begins, and drop the results on the way.
+        self.search_thread.cancel()
         self.search_body.clear()
         self.search_body.close()
         self.setFixedHeight(self.h)
@@ -169,7 +179,7 @@ class KMBSearchBrowserBody(QListWidget):
     """ The output results of search bar. """
 
     FOCUS_ON_LINE = pyqtSignal(bool)
-    ENTER_NEW_ITEM = pyqtSignal(str, str, str, str)  # name, sort, category, args
+    ENTER_NEW_ITEM = pyqtSignal(str, str, str, str, str)  # name, sort, category, args, pin_id
 
     def __init__(self, parent):
         super().__init__(parent)
@@ -180,6 +190,8 @@ class KMBSearchBrowserBody(QListWidget):
         self.setAlternatingRowColors(True)
         self._width = self.width()
         self._candies: (int, str) = None  # like cookies, but carrying something else.
+        self._rows = 0  # the rows of result items, summary not included.
+        self._summary = None
 
     def focusOutEvent(self, event):
         self.clearSelection()
@@ -223,22 +235,36 @@ class KMBSearchBrowserBody(QListWidget):
     def slide_out_actions(self):
         pass
 
+    def clear(self):
+        super().clear()
+        self._rows = 0
+        self._summary = None
+
     def feed_items(self, items_gen: Generator):
-        # clean first.
-        self.clear()
+        # the item widgets of last results are reused,
+        # only the extra rows are made or removed.
         count = 0
         # show the result items.
-        for item, from_idx, step in items_gen:
+        for entry, from_idx, step in items_gen:
+            if count < self._rows:
+                real_item = self.itemWidget(self.item(count))
+                real_item.set_entry(entry, key_word_selection=(from_idx, step))
+            else:
+                real_item = KMBCustomQueryItem(
+                    entry, key_word_selection=(from_idx, step)
+                )
+                fake_item = QListWidgetItem()
+                fake_item.setSizeHint(QSize(self.width(), QUERY_HEIGHT))
+                self.insertItem(count, fake_item)
+                self.setItemWidget(fake_item, real_item)
             count += 1
-            real_item = KMBCustomQueryItem(
-                *item, key_word_selection=(from_idx, step)
-            )
-            fake_item = QListWidgetItem(self)
-            fake_item.setSizeHint(QSize(self.width(), QUERY_HEIGHT))
-            self.addItem(fake_item)
-            self.setItemWidget(fake_item, real_item)
+        for _ in range(count, self._rows):
+            self.takeItem(count)
+        self._rows = count
         # summary results at last.
-        self.addItem(f'   {count} results')
+        if self._summary is None:
+            self._summary = QListWidgetItem(self)
+        self._summary.setText(f'   {count} results')
 
     def feed_candies(self, candies: (int, str)):
         self._candies = candies
@@ -248,8 +274,12 @@ class KMBSearchBrowserBody(QListWidget):
         item = self.itemWidget(self.currentItem())
         if item is None:
             return
+        # the args of pin go first, then those in candies.
+        args = ';'.join(a for a in (item.pin_args, self._candies[1])
+                        if a and a != 'None') or 'None'
         for _ in range(self._candies[0]):
-            self.ENTER_NEW_ITEM.emit(item.name, item.sort, item.category, self._candies[1])
+            self.ENTER_NEW_ITEM.emit(item.name, item.sort, item.category,
+                                     args, item.pin_id or '')
         # eat all the candies after entering.
         self._candies = None
 
@@ -257,26 +287,26 @@ class KMBSearchBrowserBody(QListWidget):
 class KMBCustomQueryItem(QWidget):
     """ The query item of search body. """
 
+    # the icons are shared by all items.
+    PIXMAPS = {}
+
     def __init__(self,
-                 *args: str,
+                 entry,
                  parent=None,
                  key_word_selection: tuple = None):
         super().__init__(parent)
-        self.name, self.info, self.sort, self.category = args
         self.setFixedHeight(QUERY_HEIGHT)
         # init layouts
         self.main_layout = QHBoxLayout(self)
         self.text_layout = QVBoxLayout()
         # init widgets
         # main header
-        self.header = QLabel(f'<b>{self.name}</b> - {self.category}')
-        if key_word_selection is not None:
-            self.header.setSelection(*key_word_selection)
+        self.header = QLabel()
         # scroll sub header
-        self.sub_text = ScrollableLabel(self.info)
+        self.sub_text = ScrollableLabel('')
         # icon placeholder
         self.icon = QLabel()
-        self.init_icon()
+        self.set_entry(entry, key_word_selection)
         # combine
         self.text_layout.addWidget(self.header, alignment=Qt.AlignLeft)
         self.text_layout.addWidget(self.sub_text, alignment=Qt.AlignLeft)
@@ -284,15 +314,28 @@ class KMBCustomQueryItem(QWidget):
         self.main_layout.addLayout(self.text_layout)
         self.main_layout.addStretch(-1)
 
+    def set_entry(self, entry, key_word_selection: tuple = None):
+        # fill or refill the item with a search entry.
+        (self.label, self.name, self.info, self.sort,
+         self.category, self.pin_args, self.pin_id) = entry
+        self.header.setText(f'<b>{self.label}</b> - {self.category}')
+        if key_word_selection is not None and key_word_selection[1]:
+            self.header.setSelection(*key_word_selection)
+        self.sub_text.label.setText(self.info)
+        self.init_icon()
+
     def init_icon(self):
-        # set compatible
-        pix = QPixmap(NODE_ICONx85_PATH.format(self.sort, self.name))
-        ratio = QApplication.desktop().screen().devicePixelRatio()
-        if ratio == 1:
-            pass
-        else:
-            pix.setDevicePixelRatio(ratio)
-        self.icon.setPixmap(pix)
+        path = NODE_ICONx85_PATH.format(self.sort, self.name)
+        if path not in self.PIXMAPS:
+            # set compatible
+            pix = QPixmap(path)
+            ratio = QApplication.desktop().screen().devicePixelRatio()
+            if ratio == 1:
+                pass
+            else:
+                pix.setDevicePixelRatio(ratio)
+            self.PIXMAPS[path] = pix
+        self.icon.setPixmap(self.PIXMAPS[path])
 
 
 class ScrollableLabel(QScrollArea):
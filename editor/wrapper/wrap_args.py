@@ -10,6 +10,8 @@ class KMBArgsMenu(Serializable):
     def __init__(self, parent=None):
         super().__init__()
         self.panel = KMBNodesArgsMenu(self, parent)
+        # node id -> (args, var name) of last serializing.
+        self._serialized = {}
 
     def fetch(self, key):
         # fetch args model by key: node id
@@ -18,18 +20,22 @@ class KMBArgsMenu(Serializable):
 
     def serialize(self):
         # get <args> element for node.
-        args_dict = OrderedDict()
-        var_names_dict = {}
-        for node_id, model in self.panel.edit_model.items():
-            args_dict[node_id] = model.extract_args(
+        # only the dirty nodes are extracted again,
+        # the others are the same as last time.
+        for node_id in self.panel.dirty.take():
+            model = self.panel.fetch_node(node_id)
+            self._serialized[node_id] = (model.extract_args(
                 get_changed=True,
                 get_referenced=True,
                 get_required=True,
                 get_datatype=True,
                 get_io=True,
                 get_pined=True
-            )
-            var_names_dict[node_id] = model.var_name
+            ), model.var_name)
+        args_dict = OrderedDict()
+        var_names_dict = {}
+        for node_id in self.panel.edit_model:
+            args_dict[node_id], var_names_dict[node_id] = self._serialized[node_id]
         return args_dict, var_names_dict
 
     def deserialize(self, feed: dict, new_nodes: dict, node_map: dict, old_id: str, include_args=False):
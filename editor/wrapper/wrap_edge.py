@@ -74,7 +74,7 @@ class KMBEdge(Serializable):
             self.gr_edge.set_dst(end_pos.x()+patch, end_pos.y()+patch)
         else:
             self.gr_edge.set_dst(src_pos.x()+patch, src_pos.y()+patch)
-        self.gr_edge.update()
+        self.gr_edge.refresh()
 
     def remove_from_current_items(self):
         self.end_item = None
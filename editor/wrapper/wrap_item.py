@@ -36,8 +36,10 @@ class KMBNodeItem(Serializable):
         self.gr_node.set_pos(x, y)
 
     def update_connect_edges(self):
-        for edge in self.gr_scene.scene.history.edges.values():
-            edge.update_positions()
+        # only the edges of self need to move,
+        # and they are moved in next frame, only once.
+        scene = self.gr_scene.scene
+        scene.edge_scheduler.mark(scene.history.edges_of(self))
 
     def serialize(self):
         # common tag here:
@@ -5,6 +5,8 @@ from editor.wrapper.wrap_item import KMBNodeItem
 from editor.wrapper.wrap_args import KMBArgsMenu
 from editor.wrapper.serializable import Serializable
 from editor.component.commands_stack import KMBHistoryStack
+from editor.component.edge_scheduler import EdgeUpdateScheduler
+from editor.component.animator import NodesAnimator
 
 from cfg import EDGE_DIRECT, EDGE_CURVES, SCENE_WIDTH, SCENE_HEIGHT
 
@@ -22,6 +24,10 @@ class KMBNodeScene(Serializable):
         self.graphic_scene.set_graphic_scene(self.scene_width,
                                              self.scene_height)
         self.history = KMBHistoryStack(self.graphic_scene, self.args_menu)
+        # edges of moving nodes are updated frame by frame.
+        self.edge_scheduler = EdgeUpdateScheduler(self.graphic_scene)
+        # nodes organized are moved together by it.
+        self.animator = NodesAnimator(self, self.graphic_scene)
 
     # -------------------------------
     #              CHECK
@@ -58,18 +64,11 @@ class KMBNodeScene(Serializable):
             if edge.start_item.gr_name == "Model":
                 return -1
             # 5. check the same edge in previous edges.
-            for e in self.history.edges.values():
-                if (
-                    (
-                        e.start_item == edge.start_item and
-                        e.end_item == edge.end_item
-                    ) or
-                    (
-                        e.start_item == edge.end_item and
-                        e.end_item == edge.start_item
-                    )
-                ):
-                    return -1
+            if (
+                self.history.has_edge(edge.start_item, edge.end_item) or
+                self.history.has_edge(edge.end_item, edge.start_item)
+            ):
+                return -1
             # io node cannot be token as Wrapper layer's arg anymore.
             edge.start_item.as_arg = False
             edge.end_item.as_arg = False
@@ -112,13 +111,9 @@ class KMBNodeScene(Serializable):
                 edge.end_item.gr_name == "Model"
             ):
                 return -1
-            # 3. check through all the edges, refuse to repeat edge.
-            for e in self.history.edges.values():
-                if (
-                    e.start_item == edge.start_item and
-                    e.end_item is edge.end_item
-                ):
-                    return -1
+            # 3. check the edges, refuse to repeat edge.
+            if self.history.has_edge(edge.start_item, edge.end_item):
+                return -1
         return 1
 
     # -------------------------------
@@ -195,12 +190,22 @@ class KMBNodeScene(Serializable):
                     nodes[edge_from]['output'].append(edge_to)
         return nodes
 
-    def deserialize(self, feeds: dict, args_menu: KMBArgsMenu):
+    def deserialize(self, feeds, args_menu: KMBArgsMenu):
+        # feeds can be a dict or a stream of (old_id, node),
+        # so building can start while the file is still being read.
+        if isinstance(feeds, dict):
+            feeds = feeds.items()
         # map old node id to new id. (wrapper, graphic)
         node_map = {}
+        # nodes that still have edges or args to recover.
+        pending = []
+        self.deserialize_nodes(feeds, args_menu, node_map, pending)
+        self.deserialize_links(pending, args_menu, node_map)
 
-        # First Loop
-        for old_id, node in feeds.items():
+    def deserialize_nodes(self, feeds, args_menu: KMBArgsMenu,
+                          node_map: dict, pending: list):
+        # First Loop: could be called batch by batch.
+        for old_id, node in feeds:
             if node['recover'] == 'node':
                 # deserialize Node
                 new_node = KMBNodeItem(self.graphic_scene,
@@ -227,9 +232,13 @@ class KMBNodeScene(Serializable):
                                    with_focus=False)
                 new_note.deserialize(node['text'])
                 self.history.dump_note(new_note)
+                continue
+            pending.append((old_id, node))
 
-        # Second Loop
-        for old_id, node in feeds.items():
+    def deserialize_links(self, pending: list, args_menu: KMBArgsMenu,
+                          node_map: dict):
+        # Second Loop: after all the nodes are ready.
+        for old_id, node in pending:
             # deserialize io Edge by node_map except the one to Model.
             ipts: str = node.get('input')
             opts: str = node.get('output')
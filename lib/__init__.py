@@ -1,5 +1,6 @@
 from lib.utils import *
-from lib.dblink import DataBase4Args, blur_query
+from lib.dblink import DataBase4Args
 from lib.counter import Counter
 from lib.auto import AutoInspector
 from lib.pins import *
+from lib.search import SearchIndex
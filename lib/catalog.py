@@ -0,0 +1,87 @@
+from collections import namedtuple
+
+from lib.utils import split_args_id
+from lib.dbpool import ConnectionPool
+
+
+# The node record in catalog, args are pre-expanded rows.
+NodeRecord = namedtuple('NodeRecord', ('id', 'name', 'info',
+                                       'ori_args', 'inh_args',
+                                       'sort', 'category',
+                                       'org_rows', 'inh_rows'))
+
+
+class NodeCatalog:
+    """ All the nodes and args in database, loaded only once.
+
+    Everything in it is immutable (tuples), so it's safe to share
+    between widgets and threads, and no SQL runs after loading.
+
+    """
+
+    DATABASE = 'lib/node.db'
+    _instance = None
+
+    def __init__(self, path: str = DATABASE):
+        db = ConnectionPool.get(path, read_only=True).connect()
+        nodes = db.execute('SELECT * FROM nodes ORDER BY ID').fetchall()
+        org_args = db.execute('SELECT * FROM org_args').fetchall()
+        inh_args = db.execute('SELECT * FROM inh_args').fetchall()
+        box_args = db.execute('SELECT * FROM box_args').fetchall()
+
+        self.org_args = {row[0]: row for row in org_args}
+        inh = {}
+        for row in inh_args:
+            inh.setdefault(row[0], []).append(row)
+        self.inh_args = {k: tuple(v) for k, v in inh.items()}
+        # box values are split once here.
+        self.box_args = {id_: tuple(values.split(';'))
+                         for id_, values in box_args}
+        # the expanded org args by its id string, like '1-10'.
+        self._org_rows = {}
+        self.nodes = {}
+        for id_, name, info, ori, inh_id, sort, category in nodes:
+            self.nodes[name] = NodeRecord(id_, name, info, ori, inh_id,
+                                          sort, category,
+                                          self.org_rows(ori),
+                                          self.inh_rows(inh_id))
+
+    @classmethod
+    def get(cls):
+        # The shared catalog, load it at the first time.
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def node(self, name: str) -> NodeRecord:
+        return self.nodes.get(name)
+
+    def args_id(self, name: str):
+        # (ORI_ARGS, INH_ARGS) of node.
+        node = self.nodes.get(name)
+        if node is None:
+            return None
+        return node.ori_args, node.inh_args
+
+    def category_sort(self, name: str):
+        node = self.nodes.get(name)
+        if node is None:
+            return None
+        return node.category, node.sort
+
+    def org_rows(self, id_string) -> tuple:
+        if not id_string:
+            return ()
+        id_string = str(id_string)
+        if id_string not in self._org_rows:
+            self._org_rows[id_string] = tuple(
+                self.org_args.get(i) for i in split_args_id(id_string))
+        return self._org_rows[id_string]
+
+    def inh_rows(self, inh_id) -> tuple:
+        if not inh_id:
+            return ()
+        return self.inh_args.get(int(inh_id), ())
+
+    def box_values(self, box_id) -> tuple:
+        return self.box_args.get(int(box_id), ())
@@ -1,48 +1,28 @@
-import sqlite3
+from lib.catalog import NodeCatalog
 
-from lib import split_args_id
 
+class DataBase4Args:
+    """ Get arguments from Database.
 
-def blur_query(key_word: str) -> list:
-    # blur query in database.
-    db = sqlite3.connect('lib/node.db')
-    cursor = db.cursor()
-    query = cursor.execute(
-        f"SELECT NAME, INFO, SORT, CATEGORY FROM nodes WHERE NAME LIKE '%{key_word}%'"
-    )
-    return query.fetchall()
-
+    All of them come from the catalog in memory,
+    so there's no query while creating nodes.
 
-class DataBase4Args:
-    """ Get arguments from Database. """
+    """
 
-    DATABASE = sqlite3.connect('lib/node.db')
-    CURSOR = DATABASE.cursor()
+    def __init__(self):
+        self.catalog = NodeCatalog.get()
 
     def get_args_id(self, node_name: str):
-        res = self.CURSOR.execute(
-            'SELECT ORI_ARGS, INH_ARGS FROM nodes WHERE NAME=(?)',
-            (node_name, )
-        )
-        return res.fetchone()
+        return self.catalog.args_id(node_name)
 
     def get_inh_args(self, inh_id: str):
-        res = self.CURSOR.execute(
-            f'SELECT * FROM inh_args WHERE ID={inh_id}'
-        )
-        for i, r in enumerate(res.fetchall()):
+        for i, r in enumerate(self.catalog.inh_rows(inh_id)):
             yield i, r
 
     def get_org_args(self, org_id: str):
-        split_id = split_args_id(org_id)
-        for i, id_ in enumerate(split_id):
-            res = self.CURSOR.execute(
-                f'SELECT * FROM org_args WHERE ID={id_}'
-            )
-            yield i, res.fetchone()
-
-    def get_box_args(self, box_id: int):
-        res = self.CURSOR.execute(
-            f'SELECT "VALUES" FROM box_args WHERE ID={box_id}'
-        )
-        return res.fetchone()[0]
+        for i, r in enumerate(self.catalog.org_rows(org_id)):
+            yield i, r
+
+    def get_box_args(self, box_id: int) -> tuple:
+        # the candidate values, already split.
+        return self.catalog.box_values(box_id)
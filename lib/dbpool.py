@@ -0,0 +1,101 @@
+""" The connections of databases, one for each thread. """
+import os
+import atexit
+import sqlite3
+import threading
+from urllib.request import pathname2url
+
+
+class ConnectionPool:
+    """ Keep one connection for each thread to a database.
+
+    A thread always gets the same connection, so there's no cost of
+    connecting on hot paths, and no connection is shared by threads.
+    The read-only database is opened as immutable, with mmap on.
+    Otherwise it's opened in WAL mode, so reading is not blocked by
+    writing from other threads.
+
+    Get the pool by `ConnectionPool.get`, there's only one pool
+    for each database, and all of them are closed at exit.
+    A worker thread should call `ConnectionPool.close_thread`
+    before it ends, or its connections are kept till exit.
+
+    """
+
+    MMAP_SIZE = 1 << 24  # 16M
+    _pools = {}  # (abspath, read_only) -> pool
+    _pools_lock = threading.Lock()
+
+    def __init__(self, path: str, read_only: bool = False):
+        self.path = path
+        self.read_only = read_only
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._conns = []
+
+    @classmethod
+    def get(cls, path: str, read_only: bool = False):
+        key = (os.path.abspath(path), read_only)
+        with cls._pools_lock:
+            if key not in cls._pools:
+                cls._pools[key] = cls(path, read_only)
+            return cls._pools[key]
+
+    @classmethod
+    def close_pools(cls):
+        # closing is also where WAL file is merged back.
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+        for pool in pools:
+            pool.close_all()
+
+    @classmethod
+    def close_thread(cls):
+        # close the connections of current thread in all pools.
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+        for pool in pools:
+            pool.close()
+
+    def connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            with self._lock:
+                self._conns.append(conn)
+        return conn
+
+    def close(self):
+        # close the connection of current thread.
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
+            with self._lock:
+                self._conns.remove(conn)
+            conn.close()
+
+    def close_all(self):
+        with self._lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
+
+    # ----------UTILS----------
+
+    def _open(self) -> sqlite3.Connection:
+        path = os.path.abspath(self.path)
+        # closing is done by pool, maybe from another thread.
+        if self.read_only:
+            uri = f'file:{pathname2url(path)}?mode=ro&immutable=1'
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            conn.execute(f'PRAGMA mmap_size={self.MMAP_SIZE}')
+            conn.execute('PRAGMA query_only=1')
+        else:
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+
+atexit.register(ConnectionPool.close_pools)
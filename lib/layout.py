@@ -0,0 +1,273 @@
+""" Layered (Sugiyama style) layout of the nodes graph. """
+import numpy as np
+
+
+class LayeredLayout:
+    """ Layout the DAG of direct edges in layers, from left to right.
+
+    1. The edges against the flow are reversed to break cycles.
+    2. Each node goes to the layer of its longest path from sources.
+    3. The long edges get dummy nodes in every layer they cross,
+       then the order in layers is swept by barycenter to reduce
+       crossings.
+    4. Each node moves toward the mean of its neighbors, but keeps
+       the order and gaps in its layer.
+
+    The sources of ref edges which have no direct edges are placed
+    beside their targets, so are the sources referring to them, all
+    in one column with rows reserved. The nodes left are put in a
+    grid below.
+    Nodes are identified by index, their positions are returned
+    as an array of shape (n, 2).
+
+    """
+
+    LAYER_GAP = 200.0      # between layers, along x.
+    NODE_GAP = 140.0       # between nodes in one layer, along y.
+    DUMMY_GAP = 60.0       # for dummy nodes, which are not seen.
+    SATELLITE_GAP = 100.0  # between nodes beside one target.
+    SWEEPS = 4             # rounds of crossing reduction and balancing.
+
+    def __init__(self, n: int, edges=(), refs=(), init=None):
+        """
+        :param n: the count of nodes.
+        :param edges: the direct edges as (src, dst).
+        :param refs: the ref edges as (src, dst).
+        :param init: the positions now, which decide the first order
+        in layers, and where the result is centered.
+        """
+        self.n = n
+        self.edges = np.asarray(edges, dtype=int).reshape(-1, 2)
+        self.refs = np.asarray(refs, dtype=int).reshape(-1, 2)
+        self.init = None if init is None else np.asarray(init, dtype=float).reshape(-1, 2)
+
+    def layout(self) -> np.ndarray:
+        pos = np.full((self.n, 2), np.nan)
+        edges = self.edges[self.edges[:, 0] != self.edges[:, 1]]
+        main = np.unique(edges)
+        satellites = self._satellite_trees(main, self._satellites(main))
+        if len(main):
+            pos[main] = self._layout_main(main, edges, satellites)
+        self._place_satellites(pos, satellites)
+        self._place_rest(pos)
+        if self.init is not None and self.n:
+            pos += self.init.mean(axis=0) - pos.mean(axis=0)
+        return pos
+
+    # ----------UTILS----------
+
+    def _satellites(self, main) -> dict:
+        # target -> the nodes beside it, in order.
+        is_main = np.zeros(self.n, dtype=bool)
+        is_main[main] = True
+        satellites = {}
+        placed = set()
+        for src, dst in self.refs.tolist():
+            if is_main[src] or src in placed or src == dst:
+                continue
+            placed.add(src)
+            satellites.setdefault(dst, []).append(src)
+        return satellites
+
+    @classmethod
+    def _satellite_trees(cls, main, satellites: dict) -> dict:
+        # main target -> all the nodes beside it, in depth first order,
+        # so the ones referring to a satellite sit next to it.
+        trees = {}
+        for target in main.tolist():
+            if target not in satellites:
+                continue
+            nodes = []
+            stack = list(reversed(satellites[target]))
+            while stack:
+                node = stack.pop()
+                nodes.append(node)
+                stack.extend(reversed(satellites.get(node, ())))
+            trees[target] = nodes
+        return trees
+
+    def _layout_main(self, main, edges, satellites) -> np.ndarray:
+        m = len(main)
+        local = np.full(self.n, -1, dtype=int)
+        local[main] = np.arange(m)
+        src, dst = local[edges[:, 0]], local[edges[:, 1]]
+        src, dst = self._break_cycles(m, src, dst)
+        layer = self._assign_layers(m, src, dst)
+        # the first order in layers follows the y now.
+        key = (self.init[main, 1] if self.init is not None
+               else np.arange(m, dtype=float))
+        v_layer, v_key, src, dst = self._add_dummies(layer, key, src, dst)
+        layers = self._reduce_crossings(v_layer, v_key, src, dst)
+        # the taller one for the nodes which have satellites.
+        height = np.full(len(v_layer), self.DUMMY_GAP)
+        height[:m] = self.NODE_GAP
+        for target, nodes in satellites.items():
+            if local[target] >= 0:
+                height[local[target]] = max(self.NODE_GAP,
+                                            len(nodes) * self.SATELLITE_GAP)
+        y = self._assign_y(layers, height, src, dst)
+        return np.column_stack((v_layer[:m] * self.LAYER_GAP, y[:m]))
+
+    @classmethod
+    def _break_cycles(cls, m, src, dst):
+        # Reverse the edges that go back in the DFS.
+        adj = [[] for _ in range(m)]
+        for k, (u, v) in enumerate(zip(src.tolist(), dst.tolist())):
+            adj[u].append((v, k))
+        state = [0] * m  # 0: new, 1: in stack, 2: done
+        back = []
+        for root in range(m):
+            if state[root]:
+                continue
+            state[root] = 1
+            stack = [(root, iter(adj[root]))]
+            while stack:
+                u, it = stack[-1]
+                for v, k in it:
+                    if state[v] == 1:
+                        back.append(k)
+                    elif state[v] == 0:
+                        state[v] = 1
+                        stack.append((v, iter(adj[v])))
+                        break
+                else:
+                    state[u] = 2
+                    stack.pop()
+        src, dst = src.copy(), dst.copy()
+        src[back], dst[back] = dst[back], src[back]
+        return src, dst
+
+    @classmethod
+    def _assign_layers(cls, m, src, dst) -> np.ndarray:
+        # The longest path from sources, in topological order.
+        indegree = np.bincount(dst, minlength=m)
+        order = np.argsort(src, kind='stable')
+        starts = np.searchsorted(src[order], np.arange(m + 1))
+        layer = np.zeros(m, dtype=int)
+        ready = list(np.flatnonzero(indegree == 0))
+        while ready:
+            u = ready.pop()
+            for k in order[starts[u]:starts[u + 1]]:
+                v = dst[k]
+                layer[v] = max(layer[v], layer[u] + 1)
+                indegree[v] -= 1
+                if not indegree[v]:
+                    ready.append(v)
+        return layer
+
+    @classmethod
+    def _add_dummies(cls, layer, key, src, dst):
+        # Split the edges crossing layers by dummy nodes,
+        # so every edge links two adjacent layers.
+        span = layer[dst] - layer[src]
+        long = np.flatnonzero(span > 1)
+        v_layer = [layer]
+        v_key = [key]
+        new_src = [src[span == 1]]
+        new_dst = [dst[span == 1]]
+        count = len(layer)
+        for k in long.tolist():
+            u, v, s = src[k], dst[k], span[k]
+            chain = np.arange(count, count + s - 1)
+            count += s - 1
+            v_layer.append(layer[u] + np.arange(1, s))
+            v_key.append(np.linspace(key[u], key[v], s + 1)[1:-1])
+            new_src.append(np.concatenate(([u], chain)))
+            new_dst.append(np.concatenate((chain, [v])))
+        return (np.concatenate(v_layer), np.concatenate(v_key),
+                np.concatenate(new_src), np.concatenate(new_dst))
+
+    def _reduce_crossings(self, v_layer, v_key, src, dst) -> list:
+        # Sweep down and up, sort each layer by the barycenter
+        # of its neighbors' ranks in the layer just swept.
+        n_layers = v_layer.max() + 1
+        layers = [np.flatnonzero(v_layer == i) for i in range(n_layers)]
+        rank = np.zeros(len(v_layer))
+        for i, verts in enumerate(layers):
+            verts = verts[np.argsort(v_key[verts], kind='stable')]
+            layers[i] = verts
+            rank[verts] = np.arange(len(verts))
+        # edges by the layer of dst, all go from layer i - 1 to i.
+        by_dst = [np.flatnonzero(v_layer[dst] == i) for i in range(n_layers)]
+        for _ in range(self.SWEEPS):
+            for i in range(1, n_layers):
+                k = by_dst[i]
+                layers[i] = self._sort_by_barycenter(layers[i], rank, src[k], dst[k])
+            for i in range(n_layers - 2, -1, -1):
+                k = by_dst[i + 1]
+                layers[i] = self._sort_by_barycenter(layers[i], rank, dst[k], src[k])
+        return layers
+
+    @classmethod
+    def _sort_by_barycenter(cls, verts, rank, fixed, free) -> np.ndarray:
+        # The ranks of fixed ones are known, free ones are in verts.
+        size = len(verts)
+        if size < 2:
+            return verts
+        local = rank[free].astype(int)
+        sums = np.bincount(local, weights=rank[fixed], minlength=size)
+        counts = np.bincount(local, minlength=size)
+        # the one without neighbor keeps its rank.
+        bary = np.arange(size, dtype=float)
+        linked = counts > 0
+        bary[linked] = sums[linked] / counts[linked]
+        verts = verts[np.argsort(bary, kind='stable')]
+        rank[verts] = np.arange(size)
+        return verts
+
+    def _assign_y(self, layers, height, src, dst) -> np.ndarray:
+        # Start from the packed layers, then move each node toward
+        # the mean y of its neighbors, keeping the order and gaps.
+        y = np.zeros(len(height))
+        for verts in layers:
+            offsets = self._offsets(height[verts])
+            y[verts] = offsets - offsets[-1] / 2
+        ends = np.concatenate((src, dst))
+        others = np.concatenate((dst, src))
+        counts = np.bincount(ends, minlength=len(y))
+        for _ in range(self.SWEEPS):
+            sums = np.bincount(ends, weights=y[others], minlength=len(y))
+            want = np.where(counts > 0, sums / np.maximum(counts, 1), y)
+            for verts in layers:
+                y[verts] = self._separate(want[verts], height[verts])
+        return y
+
+    @classmethod
+    def _offsets(cls, height) -> np.ndarray:
+        # the least offset of each one from the first one.
+        gaps = (height[1:] + height[:-1]) / 2
+        return np.concatenate(([0.0], np.cumsum(gaps)))
+
+    @classmethod
+    def _separate(cls, want, height) -> np.ndarray:
+        # The closest positions to want that keep the gaps,
+        # by pushing down from the top and up from the bottom,
+        # both keep the gaps, so does their mean.
+        if len(want) < 2:
+            return want
+        s = cls._offsets(height)
+        down = s + np.maximum.accumulate(want - s)
+        up = s + np.minimum.accumulate((want - s)[::-1])[::-1]
+        return (down + up) / 2
+
+    def _place_satellites(self, pos, satellites: dict):
+        # Beside the target on the left, one by one along y,
+        # the rows are reserved by the height of target.
+        for target, nodes in satellites.items():
+            x, y = pos[target]
+            offsets = (np.arange(len(nodes)) - (len(nodes) - 1) / 2) * self.SATELLITE_GAP
+            pos[nodes, 0] = x - self.LAYER_GAP / 2
+            pos[nodes, 1] = y + offsets
+
+    def _place_rest(self, pos):
+        # The nodes without any edge go to a grid below.
+        rest = np.flatnonzero(np.isnan(pos[:, 0]))
+        if not len(rest):
+            return
+        placed = ~np.isnan(pos[:, 0])
+        left = pos[placed, 0].min() if placed.any() else 0.0
+        top = pos[placed, 1].max() + self.NODE_GAP * 2 if placed.any() else 0.0
+        cols = int(np.ceil(np.sqrt(len(rest))))
+        idx = np.arange(len(rest))
+        pos[rest, 0] = left + (idx % cols) * self.LAYER_GAP
+        pos[rest, 1] = top + (idx // cols) * self.NODE_GAP
@@ -1,4 +1,8 @@
 from lib.parser.pyparser import PyParser, PyHandler
 from lib.parser.saver import Saver
 from lib.parser.loader import Loader
+from lib.parser.cache import ExportCache
+from lib.parser.binary import (BinarySaver, BinaryLoader,
+                               make_saver, make_loader, convert)
+from lib.parser.compress import COMPRESS_SUPPORT
 from lib.parser.errors import *
@@ -0,0 +1,357 @@
+""" The compact binary format of project.
+
+Layout of a .kmbb file:
+
+    magic 'KMBB' | version | int typecode ('H' or 'I')
+    string count | string blob size
+    string lengths (uint32 array) | string blob (utf-8)
+    int count | int array
+
+Every string (tag, attribute, text) is stored once in the string
+table, and the tree is a flat int array of string indexes:
+
+    tag, attrs count, (key, value) * count, text + 1, children count, ...
+
+where text 0 means None or empty. All arrays are little-endian.
+
+"""
+import sys
+import lzma
+import struct
+from array import array
+
+import lxml.html
+
+from lib.parser.saver import Saver
+from lib.parser.loader import Loader
+from lib.parser.errors import LoadingError
+from lib.parser.compress import open_read, open_write
+
+etree = lxml.html.etree
+
+MAGIC = b'KMBB'
+VERSION = 1
+XML_SUFFIX = '.kmbm'
+BINARY_SUFFIX = '.kmbb'
+
+_HEAD = struct.Struct('<4sBc')
+_SIZE = struct.Struct('<II')
+_COUNT = struct.Struct('<I')
+
+# The tags of nodes with fields, besides them there are notes.
+NODE_TAGS = ('layer', 'model', 'unit', 'ph')
+
+
+class BinaryElement:
+    """ A light element decoded from binary,
+    which acts like the etree element in Loader. """
+
+    __slots__ = ('tag', 'text', 'attrib', 'children')
+
+    def __init__(self, tag, text, attrib, children):
+        self.tag = tag
+        self.text = text
+        self.attrib = attrib
+        self.children = children
+
+    def get(self, key, default=None):
+        return self.attrib.get(key, default)
+
+    def __iter__(self):
+        return iter(self.children)
+
+    def __len__(self):
+        return len(self.children)
+
+
+class BinaryLoader(Loader):
+    """ Load binary file and parse into dict.
+
+    The records are decoded straight into the dict of nodes,
+    without building any element for them.
+
+    """
+
+    def iter_file(self):
+        ints, strs = read_tables(self.src_path)
+        try:
+            yield from _decode_records(ints, strs)
+        # StopIteration turns into RuntimeError in generator,
+        # and a missing field or position is also damaged.
+        except (RuntimeError, IndexError, KeyError, ValueError):
+            raise LoadingError(code=LoadingError.GOT_DAMAGED)
+
+
+class BinarySaver(Saver):
+    """ Save the nodes in binary format.
+
+    The records are encoded straight from the serialized nodes,
+    into the same string table and int array as encoding the
+    tree built by Saver, but without building it.
+
+    """
+
+    def save_file(self):
+        ints, index = _encode_records(self.serialized, self.progress)
+        _write_tables(ints, index, self.dst_path, self.compress)
+
+
+# ----------UTILS----------
+
+def is_binary(path: str) -> bool:
+    # Detect the format by magic, not by suffix.
+    with open_read(path) as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def make_loader(src_path: str) -> Loader:
+    if is_binary(src_path):
+        return BinaryLoader(src_path)
+    return Loader(src_path)
+
+
+def make_saver(serialized, dst_path: str, compress=None) -> Saver:
+    if dst_path.endswith(BINARY_SUFFIX):
+        return BinarySaver(serialized, dst_path, compress)
+    return Saver(serialized, dst_path, compress)
+
+
+def _le(arr: array) -> array:
+    # Arrays are stored as little-endian.
+    if sys.byteorder == 'big':
+        arr.byteswap()
+    return arr
+
+
+def _encode(root, index: dict) -> list:
+    # Elements come in document order, which is
+    # the same order as decoding them recursively.
+    ints = []
+    add = ints.append
+    for elm in root.iter(etree.Element):
+        add(index.setdefault(elm.tag, len(index)))
+        attrib = elm.attrib
+        add(len(attrib))
+        for k, v in attrib.items():
+            add(index.setdefault(k, len(index)))
+            add(index.setdefault(v, len(index)))
+        n = len(elm)
+        text = elm.text
+        # The indents between children are not kept, and
+        # empty text is None, the same as reading XML.
+        if not text or (n and not text.strip()):
+            add(0)
+        else:
+            add(index.setdefault(text, len(index)) + 1)
+        add(n)
+    return ints
+
+
+def _decode_head(nxt, strs):
+    # Decode the tag, attrs and text of one element,
+    # return them with the count of its children.
+    tag = strs[nxt()]
+    n = nxt()
+    attrib = {strs[nxt()]: strs[nxt()] for _ in range(n)} if n else {}
+    t = nxt()
+    return tag, attrib, strs[t - 1] if t else None, nxt()
+
+
+def _decode(nxt, strs):
+    tag, attrib, text, n = _decode_head(nxt, strs)
+    children = [_decode(nxt, strs) for _ in range(n)]
+    return BinaryElement(tag, text, attrib, children)
+
+
+def _encode_records(serialized: dict, progress=None):
+    # Encode the nodes one by one, in the same order and with
+    # the same elements as Saver, return the ints and index.
+    index = {}
+    ints = []
+    add = ints.append
+
+    def element(tag, attrs, text, n):
+        add(index.setdefault(tag, len(index)))
+        add(len(attrs))
+        for k, v in attrs:
+            add(index.setdefault(k, len(index)))
+            add(index.setdefault(v, len(index)))
+        add(index.setdefault(text, len(index)) + 1 if text else 0)
+        add(n)
+
+    element('kmbscene', (), None, 0)
+    count = 0
+    total = len(serialized)
+    for i, raw in enumerate(serialized.values(), start=1):
+        tag = raw['tag']
+        attrs = [('id', raw['id']), ('x', raw['x']), ('y', raw['y'])]
+        if tag == 'note':
+            element(tag, attrs, raw['content'], 0)
+            count += 1
+        elif tag in NODE_TAGS:
+            if tag == 'layer' and raw['class_'] == 'Input':
+                attrs.append(('head', 'head'))
+            elif tag == 'unit':
+                attrs.insert(0, ('u', raw['type']))
+            fields = [('tp', raw['tp']), ('sort', raw['sort']), ('var', raw['var'])]
+            if tag != 'ph':
+                fields.append(('class', raw['class_']))
+            tails = []
+            if tag == 'layer':
+                tails = [('mode', raw['mode']),
+                         ('input', Saver.seq2str(raw['input'])),
+                         ('output', Saver.seq2str(raw['output']))]
+            element(tag, attrs, None, len(fields) + len(tails) + 1)
+            for f_tag, f_text in fields:
+                element(f_tag, (), f_text, 0)
+            args = raw['args']
+            io_convert = tag == 'model'
+            element('args', (), None, len(args))
+            for name, (value, dtype) in args.items():
+                element(name, (('c', dtype), ),
+                        Saver.arg_text(name, value, io_convert), 0)
+            for f_tag, f_text in tails:
+                element(f_tag, (), f_text, 0)
+            count += 1
+        # else ...
+        if progress is not None:
+            progress(i, total)
+    # the children count of root.
+    ints[3] = count
+    return ints, index
+
+
+def _decode_records(ints, strs):
+    # Generate the (id, node) for Loader, in the same
+    # fields as it loads from XML.
+    nxt = iter(ints.tolist()).__next__
+    *_, count = _decode_head(nxt, strs)
+    for _ in range(count):
+        tag, attrib, text, n = _decode_head(nxt, strs)
+        fields = {}
+        for _ in range(n):
+            c_tag, _, c_text, m = _decode_head(nxt, strs)
+            if c_tag != 'args':
+                fields[c_tag] = c_text
+                # nothing should be here, but keep in step.
+                for _ in range(m):
+                    _decode(nxt, strs)
+                continue
+            # the <args>, whose children are (value, class).
+            args = {}
+            for _ in range(m):
+                a_tag, a_attrib, a_text, k = _decode_head(nxt, strs)
+                for _ in range(k):
+                    _decode(nxt, strs)
+                args[a_tag] = (a_text, a_attrib.get('c'))
+            fields[c_tag] = args
+        record = {'x': float(attrib['x']), 'y': float(attrib['y'])}
+        if tag == 'note':
+            record['text'] = text
+            record['recover'] = 'note'
+        elif tag in NODE_TAGS:
+            record['var'] = fields['var']
+            record['cls'] = 'PlaceHolder' if tag == 'ph' else fields['class']
+            record['arg'] = fields['args']
+            record['type'] = fields['tp']
+            record['sort'] = fields['sort']
+            if tag == 'layer':
+                record['input'] = fields['input']
+                record['output'] = fields['output']
+            record['recover'] = 'node'
+        else:
+            continue
+        yield attrib.get('id'), record
+
+
+def write_binary(tree, dst_path: str, compress=None):
+    root = tree.getroot() if hasattr(tree, 'getroot') else tree
+    index = {}
+    ints = _encode(root, index)
+    _write_tables(ints, index, dst_path, compress)
+
+
+def _write_tables(ints: list, index: dict, dst_path: str, compress=None):
+    # Use 2 bytes for int if there are not too many strings.
+    code = 'H' if len(index) < 1 << 16 else 'I'
+    ints = array(code, ints)
+    strs = [s.encode() for s in index]
+    lens = array('I', [len(s) for s in strs])
+    blob = b''.join(strs)
+    with open_write(dst_path, compress) as f:
+        f.write(_HEAD.pack(MAGIC, VERSION, code.encode()))
+        f.write(_SIZE.pack(len(strs), len(blob)))
+        f.write(_le(lens).tobytes())
+        f.write(blob)
+        f.write(_COUNT.pack(len(ints)))
+        f.write(_le(ints).tobytes())
+
+
+def read_tables(src_path: str):
+    # Read the string table and int array of file.
+    try:
+        with open_read(src_path) as f:
+            content = f.read()
+        magic, version, code = _HEAD.unpack_from(content, 0)
+        if magic != MAGIC or version != VERSION:
+            raise LoadingError(code=LoadingError.GOT_DAMAGED)
+        pos = _HEAD.size
+        n_strs, n_blob = _SIZE.unpack_from(content, pos)
+        pos += _SIZE.size
+        lens = array('I')
+        lens.frombytes(content[pos:pos + lens.itemsize * n_strs])
+        _le(lens)
+        pos += lens.itemsize * n_strs
+        blob = content[pos:pos + n_blob]
+        pos += n_blob
+        strs = []
+        start = 0
+        for n in lens:
+            strs.append(blob[start:start + n].decode())
+            start += n
+        n_ints, = _COUNT.unpack_from(content, pos)
+        pos += _COUNT.size
+        ints = array(code.decode())
+        ints.frombytes(content[pos:pos + ints.itemsize * n_ints])
+        _le(ints)
+    # a broken compressed file fails on reading.
+    except (struct.error, ValueError, UnicodeDecodeError, EOFError,
+            OSError, lzma.LZMAError):
+        raise LoadingError(code=LoadingError.GOT_DAMAGED)
+    return ints, strs
+
+
+def read_binary(src_path: str) -> BinaryElement:
+    ints, strs = read_tables(src_path)
+    try:
+        return _decode(iter(ints.tolist()).__next__, strs)
+    except (StopIteration, IndexError):
+        raise LoadingError(code=LoadingError.GOT_DAMAGED)
+
+
+def to_etree(elm: BinaryElement):
+    # Rebuild the etree element from binary element.
+    node = etree.Element(elm.tag, elm.attrib)
+    node.text = elm.text
+    for child in elm:
+        node.append(to_etree(child))
+    return node
+
+
+def read_tree(src_path: str):
+    # Read the tree of project in either format.
+    if is_binary(src_path):
+        return etree.ElementTree(to_etree(read_binary(src_path)))
+    with open_read(src_path) as src:
+        return etree.parse(src)
+
+
+def convert(src_path: str, dst_path: str, compress=None):
+    # Convert project between XML and binary,
+    # the format of dst is decided by its suffix.
+    tree = read_tree(src_path)
+    if dst_path.endswith(BINARY_SUFFIX):
+        write_binary(tree, dst_path, compress)
+    else:
+        with open_write(dst_path, compress) as f:
+            tree.write(f, pretty_print=True)
@@ -0,0 +1,122 @@
+""" The export cache of parser. """
+import os
+import json
+import hashlib
+
+
+class ExportCache:
+    """ Cache the line fragments of every node between exports.
+
+    It's stored next to the project file, and each fragment is
+    keyed by the hash of what its lines depend on. Fragments that
+    are not used by the latest export will be dropped on saving.
+
+    The first line of cache file is a header, with the digest of
+    the project file and options it was exported from, and the
+    warnings. An unchanged project is known by the header only,
+    the fragments are read only when some node is parsed.
+    The first export of a project only writes the header, since
+    there's nothing to reuse, nodes are hashed from the next one.
+
+    """
+
+    VERSION = 2
+    SUFFIX = '.kmbcache'
+    CHUNK = 1 << 20
+
+    def __init__(self, path: str):
+        self.path = path
+        header = self._load_header()
+        # whether it was exported before, fragments are kept if so.
+        self.reusable = bool(header)
+        # the project exported last time.
+        self.last_source = header.get('source')
+        self.last_warnings = header.get('warnings', [])
+        # the project exported this time, only set by the one
+        # who exports from the project file.
+        self.source = None
+        self.warnings = []
+        self._fragments = None
+        self.used = {}
+
+    @classmethod
+    def for_project(cls, src_path: str):
+        # The cache file of project, like 'model.kmbm' -> 'model.kmbcache'.
+        return cls(os.path.splitext(src_path)[0] + cls.SUFFIX)
+
+    @classmethod
+    def digest(cls, src_path: str, *options) -> str:
+        # The hash of project file, along with the export options.
+        sha = hashlib.sha1(json.dumps(options).encode())
+        with open(src_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(cls.CHUNK), b''):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    def is_fresh(self, source: str, output: str) -> bool:
+        # Nothing to do if the same project was exported to output.
+        return source == self.last_source and os.path.exists(output)
+
+    @property
+    def fragments(self) -> dict:
+        if self._fragments is None:
+            self._fragments = self._load_fragments()
+        return self._fragments
+
+    def get(self, key: str):
+        fragment = self.fragments.get(key)
+        if fragment is not None:
+            self.used[key] = fragment
+        return fragment
+
+    def put(self, key: str, fragment: dict):
+        self.used[key] = fragment
+
+    def save(self, warnings=()):
+        self.warnings = [str(w) for w in warnings]
+        header = {'version': self.VERSION,
+                  'source': self.source,
+                  'warnings': self.warnings}
+        # Skip writing if nothing changed since the last export.
+        if self.used == self.fragments and os.path.exists(self.path) and \
+           self.source == self.last_source and self.warnings == self.last_warnings:
+            return
+        try:
+            # dumps at once is much faster than dump by pieces.
+            content = '\n'.join((json.dumps(header),
+                                 json.dumps(self.used, separators=(',', ':'))))
+            with open(self.path, 'w') as f:
+                f.write(content)
+        # Failing on cache should never stop an export.
+        except OSError:
+            return
+        self._fragments = self.used
+        self.last_source = self.source
+        self.last_warnings = self.warnings
+
+    # ----------UTILS----------
+
+    def _load_header(self) -> dict:
+        try:
+            with open(self.path, 'r') as f:
+                header = json.loads(f.readline())
+        # A missing or damaged cache just means starting over.
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(header, dict) or \
+           header.get('version') != self.VERSION:
+            return {}
+        return header
+
+    def _load_fragments(self) -> dict:
+        try:
+            with open(self.path, 'r') as f:
+                header = json.loads(f.readline())
+                fragments = json.loads(f.readline() or '{}')
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(header, dict) or \
+           header.get('version') != self.VERSION or \
+           not isinstance(fragments, dict):
+            return {}
+        return fragments
@@ -0,0 +1,46 @@
+""" Transparent compression of project files. """
+import gzip
+import lzma
+
+COMPRESS_GZIP = 'gzip'
+COMPRESS_LZMA = 'lzma'
+COMPRESS_SUPPORT = (COMPRESS_GZIP, COMPRESS_LZMA)
+
+_MAGIC = {
+    COMPRESS_GZIP: b'\x1f\x8b',
+    COMPRESS_LZMA: b'\xfd7zXZ\x00',
+}
+
+
+def detect(path: str):
+    # Detect the compression by magic,
+    # return None if it's not compressed.
+    with open(path, 'rb') as f:
+        head = f.read(max(len(m) for m in _MAGIC.values()))
+    for compress, magic in _MAGIC.items():
+        if head.startswith(magic):
+            return compress
+    return None
+
+
+def open_read(path: str):
+    # Open the file for reading, which decompresses
+    # incrementally while it's being read.
+    compress = detect(path)
+    if compress == COMPRESS_GZIP:
+        return gzip.open(path, 'rb')
+    if compress == COMPRESS_LZMA:
+        return lzma.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def open_write(path: str, compress: str = None):
+    # Open the file for writing, the content
+    # goes into compressor as it's written.
+    if compress == COMPRESS_GZIP:
+        return gzip.open(path, 'wb')
+    if compress == COMPRESS_LZMA:
+        return lzma.open(path, 'wb')
+    if compress is not None:
+        raise ValueError(f'compress should be in {COMPRESS_SUPPORT}.')
+    return open(path, 'wb')
@@ -93,4 +93,11 @@ class PyUnusedLayerWarning(PyParsingWarning):
 class PyUnreleasedModelWarning(PyParsingWarning):
     """ Model was unreleased because missing Inputs or Outputs. """
     def __str__(self):
-        return "{} was never released, please check I/O integrity"
+        return "{} was never released, please check I/O integrity".format(*self.args)
+
+
+class PyUnsatisfiedInputWarning(PyParsingWarning):
+    """ Node got part of its inputs but never released,
+        because the rest of them never arrived. """
+    def __str__(self):
+        return "{} was never released, still waiting for: {}".format(*self.args)
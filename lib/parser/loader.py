@@ -1,26 +1,46 @@
 """ The load function in editor. """
 import lxml.html
 
+from lib.parser.compress import open_read
+
 etree = lxml.html.etree
 
 
 class Loader:
-    """ Load XML and parse into dict. """
+    """ Load XML and parse into dict.
+
+    The file is read by iterparse, every node is converted in one
+    pass over its children and then cleared, so the whole tree is
+    never kept in memory. Use iter_file() to get the nodes while
+    the file is still being read.
+
+    """
 
     def __init__(self, src_path: str):
         self.src_path = src_path
-        self.content = etree.parse(self.src_path)
         self.nodes = {}  # collecting nodes
 
     def _gen(self):
-        for node in self.content.xpath('*'):
-            yield node
+        # Only the direct children of root are nodes.
+        depth = 0
+        # compressed file is decompressed while parsing.
+        with open_read(self.src_path) as src:
+            for event, node in etree.iterparse(src, events=('start', 'end')):
+                if event == 'start':
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth != 1:
+                    continue
+                yield node
+                # Free the node and those already processed.
+                node.clear()
+                while node.getprevious() is not None:
+                    del node.getparent()[0]
 
     def _for_layer(self, feed):
         com = self._common(feed)
-        ipt = feed.xpath('input/text()')[0]
-        opt = feed.xpath('output/text()')[0]
-        self.nodes[com['id']] = {
+        return com['id'], {
             'x': com['x'],
             'y': com['y'],
             'var': com['var'],
@@ -28,14 +48,14 @@ class Loader:
             'arg': com['arg'],
             'type': com['type'],
             'sort': com['sort'],
-            'input': ipt,
-            'output': opt,
+            'input': com['input'],
+            'output': com['output'],
             'recover': 'node'
         }
 
     def _for_model(self, feed):
         com = self._common(feed)
-        self.nodes[com['id']] = {
+        return com['id'], {
             'x': com['x'],
             'y': com['y'],
             'var': com['var'],
@@ -48,7 +68,7 @@ class Loader:
 
     def _for_unit(self, feed):
         com = self._common(feed)
-        self.nodes[com['id']] = {
+        return com['id'], {
             'x': com['x'],
             'y': com['y'],
             'var': com['var'],
@@ -60,8 +80,8 @@ class Loader:
         }
 
     def _for_ph(self, feed):
-        com = self._common(feed, include_class=False)
-        self.nodes[com['id']] = {
+        com = self._common(feed)
+        return com['id'], {
             'x': com['x'],
             'y': com['y'],
             'var': com['var'],
@@ -74,62 +94,61 @@ class Loader:
 
     def _for_note(self, feed):
         com = self._common(feed, simplify=True)
-        text = feed.xpath('./text()')[0]
-        self.nodes[com['id']] = {
+        return com['id'], {
             'x': com['x'],
             'y': com['y'],
-            'text': text,
+            'text': feed.text,
             'recover': 'note'
         }
 
-    def _load(self):
+    def iter_file(self):
+        # A generator of (id, node) in file order.
         for node in self._gen():
             tag = node.tag
             if tag == 'layer':
-                self._for_layer(node)
+                yield self._for_layer(node)
             elif tag == 'model':
-                self._for_model(node)
+                yield self._for_model(node)
             elif tag == 'unit':
-                self._for_unit(node)
+                yield self._for_unit(node)
             elif tag == 'ph':
-                self._for_ph(node)
+                yield self._for_ph(node)
             elif tag == 'note':
-                self._for_note(node)
+                yield self._for_note(node)
             # else ...
 
     def load_file(self):
-        self._load()
+        self.nodes.update(self.iter_file())
         return self.nodes
 
     # ----------UTILS----------
 
-    def _common(self, feed,
-                simplify=False,
-                include_var=True,
-                include_args=True,
-                include_class=True):
+    def _common(self, feed, simplify=False):
         common = dict()
         # common fields have
         # id, x, y, var, cls, arg
-        common['id'] = feed.xpath('./@id')[0]
-        common['x'] = float(feed.xpath('./@x')[0])
-        common['y'] = float(feed.xpath('./@y')[0])
+        common['id'] = feed.get('id')
+        common['x'] = float(feed.get('x'))
+        common['y'] = float(feed.get('y'))
         # if it's simplify, then return early.
         if simplify:
             return common
-        common['type'] = feed.xpath('tp/text()')[0]
-        common['sort'] = feed.xpath('sort/text()')[0]
-        # for some optional kwargs.
-        if include_var:
-            common['var'] = feed.xpath('var/text()')[0]
-        if include_class:
-            common['cls'] = feed.xpath('class/text()')[0]
-        if include_args:
-            common['arg'] = self._unwrap_args(feed.xpath('args')[0])
+        # grab all the child tags in one pass,
+        # like tp, sort, var, class, args, input and output.
+        for child in feed:
+            if child.tag == 'tp':
+                common['type'] = child.text
+            elif child.tag == 'class':
+                common['cls'] = child.text
+            elif child.tag == 'args':
+                common['arg'] = self._unwrap_args(child)
+            else:
+                common[child.tag] = child.text
         return common
 
-    def _unwrap_args(self, arg_node):
+    @classmethod
+    def _unwrap_args(cls, arg_node):
         args = {}
-        for arg in arg_node.xpath('*'):
-            args[arg.tag] = (arg.xpath('./text()')[0], arg.xpath('./@c')[0])
+        for arg in arg_node:
+            args[arg.tag] = (arg.text, arg.get('c'))
         return args
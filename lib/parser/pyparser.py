@@ -1,9 +1,12 @@
 import os
 import re
 import time
+import hashlib
 
 import lxml.html
 
+from lib.parser.saver import Saver
+from lib.parser.binary import read_tree
 from lib.parser.errors import *
 
 
@@ -55,6 +58,24 @@ TAG_MODEL_SRC = 'models'
 
 IO_SPLIT = ';'
 
+# Compiled XPath, shared by every parser instead of
+# compiling the same expression on each lookup.
+XPATH_ALL_ID = etree.XPath(f'//*[@{ATTR_ID}]')
+XPATH_ARGS_N = etree.XPath(f'{TAG_ARGS}//*')
+XPATH_ARGS_V = etree.XPath(f'{TAG_ARGS}//*/text()')
+XPATH_ARGS_C = etree.XPath(f'{TAG_ARGS}//*/@{ATTR_ARG_CLS}')
+XPATH_TEXT = {tag: etree.XPath(f'{tag}/text()')
+              for tag in (TAG_VNM, TAG_CLS, TAG_MODE,
+                          L_TAG_INPUT, L_TAG_OUTPUT)}
+
+
+def xpath_text(tag: str):
+    # Get the compiled XPath of '<tag>/text()',
+    # compile and keep it if it's a new one.
+    if tag not in XPATH_TEXT:
+        XPATH_TEXT[tag] = etree.XPath(f'{tag}/text()')
+    return XPATH_TEXT[tag]
+
 
 class PlaceHolder(object):
     """ The super class of all the placeholders.
@@ -64,39 +85,64 @@ class PlaceHolder(object):
     @:param src_id: which is the gain value, and is related to 'got_'.
     @:param dst_id: which is the key pass to placeholder manger.
 
+    Every placeholder keeps the sets of ids it still waits for,
+    so a gain costs O(1) and a repeated edge is only counted once.
+
     """
 
     def __init__(self, dst_id):
         self.dst_id = dst_id
         self.var_nm = None
         self.cls_nm = None
-        self.ep_ipt = None
-        self.ep_opt = None
-        self.gt_ipt = []
-        self.gt_opt = []
+        self.released = False
+        self._ep_ipt = []
+        self._ep_opt = []
+        self._wt_ipt = set()
+        self._wt_opt = set()
 
-    def check(self):
-        # Check self gt_ and ep_ whether ready to go.
-        # Cannot use '==' directly, it will compare both
-        # list item's content and position. In this case,
-        # just focus on content comparing. Refer to cmp_cnt().
-        pass
+    def get_ep_ipt(self):
+        return self._ep_ipt
+
+    def set_ep_ipt(self, ids: list):
+        self._ep_ipt = ids
+        self._wt_ipt = set(ids)
+
+    ep_ipt = property(get_ep_ipt, set_ep_ipt)
+
+    def get_ep_opt(self):
+        return self._ep_opt
+
+    def set_ep_opt(self, ids: list):
+        self._ep_opt = ids
+        self._wt_opt = set(ids)
+
+    ep_opt = property(get_ep_opt, set_ep_opt)
+
+    @property
+    def gt_ipt(self):
+        return [i for i in self._ep_ipt if i not in self._wt_ipt]
+
+    @property
+    def gt_opt(self):
+        return [o for o in self._ep_opt if o not in self._wt_opt]
+
+    def check(self) -> bool:
+        # Check self whether ready to go,
+        # and it can only be released once.
+        raise NotImplementedError
 
     def gain(self, src_id):
-        # Gain the value to the gt_ipt or gt_opt.
-        # The src_id could be single item or a list.
-        if src_id in self.ep_ipt:
-            self.gt_ipt.append(src_id)
-        if src_id in self.ep_opt:
-            self.gt_opt.append(src_id)
+        # Gain the value to the inputs or outputs,
+        # the ids that not expected will be ignored.
+        self._wt_ipt.discard(src_id)
+        self._wt_opt.discard(src_id)
 
-    @classmethod
-    def cmp_cnt(cls, a: list, b: list):
-        # Compare list without position factor.
-        if len(a) == len(b):
-            r = [True for c in a if c in b]
-            return all(r)
-        return False
+    def release(self):
+        self.released = True
+
+    def unsatisfied(self) -> list:
+        # The ids that are still waited for, in expected order.
+        return [i for i in self._ep_ipt if i in self._wt_ipt]
 
     def __str__(self):
         txt = ""
@@ -117,8 +163,12 @@ class ModelPlaceHolder(PlaceHolder):
         super().__init__(dst_id)
 
     def check(self):
-        return self.cmp_cnt(self.gt_ipt, self.ep_ipt) and\
-               self.cmp_cnt(self.gt_opt, self.ep_opt)
+        return not self.released and\
+               not self._wt_ipt and not self._wt_opt
+
+    def unsatisfied(self):
+        return super().unsatisfied() + \
+               [o for o in self._ep_opt if o in self._wt_opt]
 
 
 class NodePlaceHolder(PlaceHolder):
@@ -132,7 +182,7 @@ class NodePlaceHolder(PlaceHolder):
         super().__init__(dst_id)
 
     def check(self):
-        return self.cmp_cnt(self.gt_ipt, self.ep_ipt)
+        return not self.released and not self._wt_ipt
 
 
 class PlaceHolderHub:
@@ -150,6 +200,49 @@ class PlaceHolderHub:
     def get(self, key) -> PlaceHolder:
         return self.repo.get(key)
 
+    def unreleased(self):
+        # Generate placeholders that never got ready.
+        for placeholder in self.repo.values():
+            if not placeholder.released:
+                yield placeholder
+
+
+class PyGraph:
+    """ In-memory graph of the I/O edges between elements.
+
+    The edges are read once from every <input> and <output>,
+    then the parser walks through them without touching XML.
+
+    """
+
+    def __init__(self, elements):
+        self._inputs = {}
+        self._outputs = {}
+        for id_, elm in elements:
+            ipt = PyParser.get_node_value_in_elm(elm, L_TAG_INPUT, raw=True)
+            opt = PyParser.get_node_value_in_elm(elm, L_TAG_OUTPUT, raw=True)
+            self._inputs[id_] = self._valid_ids(ipt)
+            self._outputs[id_] = self._valid_ids(opt)
+
+    @classmethod
+    def _valid_ids(cls, ids):
+        # Get rid of the empty mark of I/O.
+        if ids is None or ids == ['null']:
+            return []
+        return ids
+
+    def inputs(self, id_) -> list:
+        return self._inputs.get(id_, [])
+
+    def outputs(self, id_) -> list:
+        return self._outputs.get(id_, [])
+
+    def out_edges(self, element, var_nm, cur_id) -> list:
+        # The edges wait in stack, so reverse them to keep
+        # the first output on the top.
+        return [(element, var_nm, cur_id, output_id)
+                for output_id in reversed(self.outputs(cur_id))]
+
 
 class ArgItem:
     """ That store in the attrs_dict. """
@@ -184,6 +277,7 @@ class PyLines:
 
     def __init__(self):
         self.lines = []
+        self.fields = []
         self._counts = set()
 
     def __len__(self):
@@ -202,6 +296,7 @@ class PyLines:
         if call:
             line += f'({call})'
         self.lines.append(line)
+        self.fields.append([var, src, cls, args, call])
         self._counts.add(f'{cls}:{var}')
 
     def contains(self, elm: str) -> bool:
@@ -215,10 +310,26 @@ class PyLines:
 
 
 class PyParser:
-    """ Parse XML file to PY lines. """
+    """ Parse XML file to PY lines.
 
-    def __init__(self, src_path: str):
-        self.content = etree.parse(src_path)
+    The src can be either a file path (XML or binary) or a tree
+    in memory, see from_serialized() for parsing the live editor.
+
+    """
+
+    def __init__(self, src, cache=None):
+        if isinstance(src, str):
+            self.content = read_tree(src)
+        else:
+            self.content = src
+        # The fragments of lines can be reused from cache.
+        self.cache = cache
+        self.hashes = {}
+        self.fragment = None
+        # Index all the elements by id in one pass.
+        self.id_index = {elm.get(ATTR_ID): elm
+                         for elm in XPATH_ALL_ID(self.content)}
+        self.graph = PyGraph(self.id_index.items())
         self.phs_hub = PlaceHolderHub()
         # This is the tag <ph>, not same as the one above.
         self.phs_tag = set()
@@ -243,9 +354,26 @@ class PyParser:
             self.cur_item = cur_item
             self.line_handler()
 
+    @classmethod
+    def from_serialized(cls, serialized: dict, cache=None):
+        # Parse the nodes that serialized by editor,
+        # without saving them to a file and loading back.
+        return cls(Saver(serialized).build(), cache)
+
     def commit(self):
+        # Check whether any node got part of its inputs but
+        # never released, and tell which ones are missing.
+        waiting = set()
+        for ph in self.phs_hub.unreleased():
+            waiting.add(ph.dst_id)
+            missing = ', '.join(self.get_var_by_id(i)
+                                for i in ph.unsatisfied())
+            self.warnings.append(PyUnsatisfiedInputWarning(
+                f'{ph.cls_nm}:{ph.var_nm}', missing))
         # Check whether have any unused Layer node.
         for i, node in self.gen_elm_by_tag('layer', 'model'):
+            if node.get(ATTR_ID) in waiting:
+                continue
             elm = '{}:{}'.format(self.get_tag_by_elm(node, 'class')[0],
                                  self.get_tag_by_elm(node, 'var')[0])
             if not self.lines.contains(elm):
@@ -255,6 +383,8 @@ class PyParser:
                     self.warnings.append(PyUnreleasedModelWarning(elm))
                 # else ...
         # Finally commit.
+        if self.cache is not None:
+            self.cache.save(self.warnings)
         return (self.lines.get(),
                 self.phs_tag, self.src_dir,
                 self.rtn_mod, self.warnings)
@@ -267,16 +397,32 @@ class PyParser:
         # Usually element only has two attributes:
         # one is id, the other is start. ID is one and only.
         # Making node.py optional, sometimes it's necessary to add constraint.
-        if node is None:
+        if attr == ATTR_ID and node is None:
+            elm = self.get_elm_by_id(args)
+            res = [elm] if elm is not None else []
+        elif node is None:
             res = self.content.xpath(f'//*[@{attr}="{args}"]')
         else:
             res = self.content.xpath(f'//{node}[@{attr}="{args}"]')
         # Return the unpack the list.
         return res
 
+    def get_elm_by_id(self, id_):
+        # Look up the element in id index.
+        # Return None if there's no such element.
+        return self.id_index.get(str(id_))
+
+    def get_var_by_id(self, id_):
+        # Get the var name of element, or its id if
+        # the element or var doesn't exist.
+        elm = self.get_elm_by_id(id_)
+        if elm is None:
+            return str(id_)
+        return self.get_node_value_in_elm(elm, TAG_VNM) or str(id_)
+
     @classmethod
     def get_tag_by_elm(cls, element, tag):
-        return element.xpath(f'{tag}/text()')
+        return xpath_text(tag)(element)
 
     def gen_elm_by_tag(self, *tags: str):
         # Generate elements that match the tag.
@@ -292,7 +438,7 @@ class PyParser:
         # Form 2: ["string1", "string2", ...]
         # Form 3: [string] (raw)
         try:
-            res = element.xpath(f'{node}/text()')[0]
+            res = xpath_text(node)(element)[0]
         # If got nothing, return None.
         except IndexError:
             return None
@@ -316,7 +462,7 @@ class PyParser:
         # But this function can do batch operation.
         res = []
         for i in id_:
-            n = self.get_elm_by_attr(ATTR_ID, i)[0]
+            n = self.get_elm_by_id(i)
             r = self.get_node_value_in_elm(n, node)
             res.append(r)
         if len(res) == 1:
@@ -328,9 +474,9 @@ class PyParser:
     def get_args_by_elm(cls, element, passing=None):
         # Get all the <attrs> node.py that in element.
         attrs = {}
-        attrs_n = element.xpath(f'{TAG_ARGS}//*')
-        attrs_v = element.xpath(f'{TAG_ARGS}//*/text()')
-        attrs_c = element.xpath(f'{TAG_ARGS}//*/@{ATTR_ARG_CLS}')
+        attrs_n = XPATH_ARGS_N(element)
+        attrs_v = XPATH_ARGS_V(element)
+        attrs_c = XPATH_ARGS_C(element)
 
         for n, c, v in zip(attrs_n, attrs_c, attrs_v):
             # Raise missing required arg value.
@@ -350,16 +496,16 @@ class PyParser:
     def get_args_by_id(self, id_):
         # First select the element by id.
         # Then get arguments from that element.
-        elm = self.get_elm_by_attr(ATTR_ID, id_)[0]
+        elm = self.get_elm_by_id(id_)
         atr = self.get_args_by_elm(elm)
         return atr
 
     def get_tag_by_id(self, id_, value: str = None):
         # Get the tag name by its id. If the element
         # have single value, activate value to get it.
-        elm = self.get_elm_by_attr(ATTR_ID, id_)[0]
+        elm = self.get_elm_by_id(id_)
         if value:
-            val = elm.xpath(f'{value}/text()')[0]
+            val = xpath_text(value)(elm)[0]
             return elm.tag, val
         return elm.tag
 
@@ -372,108 +518,163 @@ class PyParser:
 
         # Those which node.py has attr 'head="true"' will be enter.
         # Also these node.py have null <input>, unlike CA mode.
-        var_nm, cls_nm = self.get_batch_node_value(self.cur_item,
-                                                   TAG_VNM, TAG_CLS)
-        args = self.args_handler(self.cur_item)
-        src = self.src_handler(self.cur_item)
-        cur_id = self.cur_item.xpath(f'@{ATTR_ID}')[0]
-        self.lines.add(var=var_nm,
-                       src=src,
-                       cls=cls_nm,
-                       args=args)
+        var_nm = self.get_node_value_in_elm(self.cur_item, TAG_VNM)
+        cur_id = self.cur_item.get(ATTR_ID)
+        self.fragment_handler(self.cur_item)
         self.clue_handler(self.cur_item, var_nm, cur_id)
 
     def clue_handler(self, element, var_nm, cur_id):
-        """ Parse the clue by DFS. """
+        """ Parse the clue by a topological scheduler.
+
+        Every output edge is pushed onto an explicit stack, so the
+        lines come out in the same order as a DFS, but without any
+        recursion no matter how deep the model is.
+
+        """
 
         # Start with element, end with model.
-        output_ids = self.get_node_value_in_elm(element, L_TAG_OUTPUT, raw=True)
-        for output_id in output_ids:
-            try:
-                nxt_elm = self.get_elm_by_attr(ATTR_ID, output_id)[0]
-            except IndexError:
+        stack = self.graph.out_edges(element, var_nm, cur_id)
+        while stack:
+            element, var_nm, cur_id, output_id = stack.pop()
+            nxt_elm = self.get_elm_by_id(output_id)
+            if nxt_elm is None:
                 src = self.get_tag_by_elm(element, 'class')[0]
                 var = self.get_tag_by_elm(element, 'var')[0]
                 raise PyMissingNecessaryConnectionError(src, var)
 
-            nxt_var, nxt_cls = self.get_batch_node_value(nxt_elm,
-                                                         TAG_VNM, TAG_CLS)
+            nxt_cls = self.get_node_value_in_elm(nxt_elm, TAG_CLS)
             # Making attributes to a valid line.
             if nxt_cls == TAG_MODEL_CLS_VALUE:
                 # Endpoint case.
                 self.model_handler(cur_id, output_id)
+                continue
+            ok = self.node_handler(cur_id, output_id)
+            if not ok:
+                continue
+            # One input case.
+            if len(ok) == 1:
+                res_var_nm = var_nm
+            # Multi-input case.
             else:
-                nxt_ipt = self.get_node_value_in_elm(nxt_elm, L_TAG_INPUT)
-                nxt_arg = self.args_handler(nxt_elm)
-                nxt_src = self.src_handler(nxt_elm)
-                # One input case.
-                if cur_id == nxt_ipt:
-                    self.lines.add(var=nxt_var,
-                                   src=nxt_src,
-                                   cls=nxt_cls,
-                                   args=nxt_arg,
-                                   call=var_nm)
-                    self.clue_handler(nxt_elm, nxt_var, output_id)
-                # Multi-input case.
-                elif cur_id in nxt_ipt:
-                    ok = self.node_handler(cur_id, output_id)
-                    if ok:
-                        res_var_nm = self.get_node_value_by_id(ok, TAG_VNM)
-                        self.lines.add(var=nxt_var,
-                                       src=nxt_src,
-                                       cls=nxt_cls,
-                                       args=nxt_arg,
-                                       call=res_var_nm)
-                        self.clue_handler(nxt_elm, nxt_var, output_id)
+                res_var_nm = self.get_node_value_by_id(ok, TAG_VNM)
+            nxt_var = self.fragment_handler(nxt_elm, call=res_var_nm)
+            stack += self.graph.out_edges(nxt_elm, nxt_var, output_id)
 
     def node_handler(self, src_id, dst_id):
         """ Node handler: setup and check input to go. """
 
-        element = self.get_elm_by_attr(ATTR_ID, dst_id)[0]
-
-        if self.phs_hub.contains(dst_id):
-            node = self.phs_hub.get(dst_id)
-            node.gain(src_id)
-            # Check to make sure can release.
-            if node.check():
-                return node.ep_ipt
-        else:
+        node = self.phs_hub.get(dst_id)
+        if node is None:
             # Setup a new one and put into placeholder.
-            ph = NodePlaceHolder(dst_id)
-            ph.var_nm, ph.cls_nm, ph.ep_ipt, ph.ep_opt = \
-                self.get_batch_node_value(element,
-                                          TAG_VNM, TAG_CLS,
-                                          L_TAG_INPUT, L_TAG_OUTPUT)
-            ph.gain(src_id)
-            self.phs_hub.put(ph)
+            element = self.get_elm_by_id(dst_id)
+            node = NodePlaceHolder(dst_id)
+            node.var_nm, node.cls_nm = \
+                self.get_batch_node_value(element, TAG_VNM, TAG_CLS)
+            node.ep_ipt = self.graph.inputs(dst_id)
+            node.ep_opt = self.graph.outputs(dst_id)
+            self.phs_hub.put(node)
+        node.gain(src_id)
+        # Check to make sure can release.
+        if node.check():
+            node.release()
+            return node.ep_ipt
 
     def model_handler(self, src_id, dst_id):
         """ Model handler: setup and check to go. """
 
-        elem = self.get_elm_by_attr(ATTR_ID, dst_id)[0]
+        elem = self.get_elm_by_id(dst_id)
         args = self.get_args_by_elm(elem)
 
-        if self.phs_hub.contains(dst_id):
-            # Find out and check to make line.
-            model = self.phs_hub.get(dst_id)
-            model.gain(src_id)
-            if model.check():
-                res_src = self.src_handler(elem)
-                res_args = self.args_handler(args)
-                self.lines.add(var=model.var_nm,
-                               cls=model.cls_nm,
-                               src=res_src,
-                               args=res_args)
-                self.rtn_mod.append(model.var_nm)
-        else:
+        model = self.phs_hub.get(dst_id)
+        if model is None:
             # Setup a new one and put into placeholder.
-            ph = ModelPlaceHolder(dst_id)
-            ph.var_nm, ph.cls_nm = self.get_batch_node_value(elem,
-                                                             TAG_VNM, TAG_CLS)
-            ph.ep_ipt, ph.ep_opt = [v.v for v in args[M_TAG_INPUT]],\
-                                   [v.v for v in args[M_TAG_OUTPUT]]
-            ph.gain(src_id)
-            self.phs_hub.put(ph)
+            model = ModelPlaceHolder(dst_id)
+            model.var_nm, model.cls_nm = \
+                self.get_batch_node_value(elem, TAG_VNM, TAG_CLS)
+            model.ep_ipt = [v.v for v in args[M_TAG_INPUT]]
+            model.ep_opt = [v.v for v in args[M_TAG_OUTPUT]]
+            self.phs_hub.put(model)
+        model.gain(src_id)
+        # Find out and check to make line.
+        if model.check():
+            model.release()
+            self.fragment_handler(elem, args=args)
+            self.rtn_mod.append(model.var_nm)
+
+    def fragment_handler(self, elm, call=None, args=None):
+        """ Fragment handler: make the line of element,
+        along with the lines made by its args.
+
+        If there's a cache, the fragment is reused as long as
+        the hash of everything it depends on is not changed.
+
+        @:param args: parsed args dict, parse element if None.
+
+        """
+        var_nm, cls_nm = self.get_batch_node_value(elm, TAG_VNM, TAG_CLS)
+        key = None
+        if self.cache is not None and self.cache.reusable:
+            key = self.hash_handler(elm, call)
+            fragment = self.cache.get(key)
+            if fragment is not None:
+                for fields in fragment['lines']:
+                    self.lines.add(*fields)
+                self.src_dir.update(fragment['src'])
+                self.phs_tag.update(fragment['phs'])
+                return var_nm
+            self.fragment = {'lines': [], 'src': [], 'phs': []}
+        start = len(self.lines)
+
+        res_args = self.args_handler(elm if args is None else args)
+        res_src = self.src_handler(elm)
+        self.lines.add(var=var_nm,
+                       src=res_src,
+                       cls=cls_nm,
+                       args=res_args,
+                       call=call)
+        if key is not None:
+            self.fragment['lines'] = self.lines.fields[start:]
+            self.cache.put(key, self.fragment)
+            self.fragment = None
+        return var_nm
+
+    def hash_handler(self, elm, call=None):
+        """ Hash handler: hash the element with its call.
+
+        The ids are left out, since they are changed every time
+        the project is opened, use the content they refer to instead.
+
+        """
+        content = f'{self.elm_hash(elm)}:{call}'
+        return hashlib.sha1(content.encode()).hexdigest()
+
+    def elm_hash(self, elm):
+        # Hash the content of element, x and y are not included.
+        # Only walk its children once, no XPath here.
+        id_ = elm.get(ATTR_ID)
+        if id_ in self.hashes:
+            return self.hashes[id_]
+        # Mark it first in case it refers to itself.
+        self.hashes[id_] = id_
+        # Joined by control characters which never show up in project.
+        content = [elm.tag, str(elm.get(ATTR_UNIT))]
+        for child in elm:
+            if child.tag == TAG_ARGS:
+                for n in child.iterdescendants():
+                    c = n.get(ATTR_ARG_CLS)
+                    v = n.text
+                    if c == ATTR_ARG_CLS_VALUE_ID and v:
+                        v = IO_SPLIT.join(self.ref_hash(i) for i in v.split(IO_SPLIT))
+                    content.append(f'{n.tag}\x1f{c}\x1f{v}')
+            elif child.tag in (TAG_VNM, TAG_CLS, TAG_MODE):
+                content.append(f'{child.tag}\x1f{child.text}')
+        self.hashes[id_] = hashlib.sha1('\x1e'.join(content).encode()).hexdigest()
+        return self.hashes[id_]
+
+    def ref_hash(self, id_):
+        # Hash the element referred, or the id itself if not found.
+        ref = self.get_elm_by_id(id_)
+        return id_ if ref is None else self.elm_hash(ref)
 
     def args_handler(self, argv):
         """ Arguments handler: make args to a valid string.
@@ -529,10 +730,12 @@ class PyParser:
         if tag == TAG_MODEL:
             res = TAG_MODEL_SRC
         elif tag == TAG_UNIT:
-            res = elm.xpath(f'@{ATTR_UNIT}')[0]
+            res = elm.get(ATTR_UNIT)
         else:
             res = TAG_LAYER_SRC
         self.src_dir.add(res)
+        if self.fragment is not None:
+            self.fragment['src'].append(res)
         return res
 
     # ------------------------------------
@@ -564,7 +767,7 @@ class PyParser:
 
     def unit_type_support(self, id_, collector: list):
         """ Support for <unit> in type handler"""
-        elm = self.get_elm_by_attr(ATTR_ID, id_)[0]
+        elm = self.get_elm_by_id(id_)
         collector.append(self.gv_mv_cv(elm))
 
     def ph_type_support(self, id_, collector: list):
@@ -575,12 +778,14 @@ class PyParser:
         # The tag finally goes into test_p,
         # it will be parse to the attr of class.
         self.phs_tag.add(value)
+        if self.fragment is not None:
+            self.fragment['phs'].append(value)
         collector.append(f'self.{value}')
 
     def layer_type_support(self, id_, collector: list):
         """ Support for <layer> in type handler. """
 
-        elm = self.get_elm_by_attr(ATTR_ID, id_)[0]
+        elm = self.get_elm_by_id(id_)
         mode = self.get_node_value_in_elm(elm, TAG_MODE)
         # Only IO, AC node will be added in lines.
         if mode in (TAG_MODE_VALUE_IO, TAG_MODE_VALUE_AC):
@@ -607,7 +812,7 @@ class PyHandler:
                  comment: str = None):
         self.parser = parser
         self.title = self.check_title(model_name)
-        self.author = author.capitalize()
+        self.author = author.capitalize() if author else 'Unknown'
         self.comment = comment
         self.time = time.strftime('%y/%m/%d',
                                   time.localtime(time.time()))
@@ -643,7 +848,8 @@ class PyHandler:
         self.brk()
 
     def make_import(self):
-        for src in self.src:
+        # Sorted, so the same project always gets the same file.
+        for src in sorted(self.src):
             self.add(f'from keras import {src}')
         self.brk(2)
 
@@ -654,12 +860,12 @@ class PyHandler:
         self.brk()
         self.add(self.tab(1) +
                  f'def __init__(self, '
-                 f'{ ", ".join(ph for ph in self.phs) }'
+                 f'{ ", ".join(ph for ph in sorted(self.phs)) }'
                  f'):')
         if len(self.phs):
             self.add(*[self.tab(2) +
                        f'self.{ph} = {ph}'
-                       for ph in self.phs])
+                       for ph in sorted(self.phs)])
         else:
             self.add(self.tab(2) + 'pass')
         # Make a break line.
@@ -711,10 +917,15 @@ class PyHandler:
         self.make_class()
         self.make_build()
 
-    def check_path(self, path):
+    def check_path(self, path, cnt: str) -> bool:
         # Existed file got covered with new one.
+        # Return False if it's the same, no need to cover.
         if os.path.exists(path):
+            with open(path, 'r') as py:
+                if py.read() == cnt:
+                    return False
             self.warnings.append(PyExistedFileCoveredWarning(path))
+        return True
 
     @classmethod
     def check_title(cls, title: str):
@@ -728,13 +939,15 @@ class PyHandler:
         else:
             return 'Model'
 
+    @classmethod
+    def output_path(cls, dst, model_name: str = 'Model'):
+        return '{}/{}.py'.format(dst, cls.check_title(model_name).lower())
+
     def export(self, dst):
-        file = '{}/{}.py'.format(dst, self.title.lower())
+        file = self.output_path(dst, self.title)
         self.organize()
-        self.check_path(file)
-        with open(file, 'w') as py:
-            cnt = ''
-            for line in self.contents:
-                cnt += (line + '\n')
-            py.write(cnt)
+        cnt = ''.join(line + '\n' for line in self.contents)
+        if self.check_path(file, cnt):
+            with open(file, 'w') as py:
+                py.write(cnt)
         return self.make_warnings(), len(self.warnings)
@@ -1,16 +1,21 @@
 """ The save function in editor """
 import lxml.html
 
+from lib.parser.compress import open_write
+
 etree = lxml.html.etree
 
 
 class Saver:
 
-    def __init__(self, serialized, dst_path):
+    def __init__(self, serialized, dst_path=None, compress=None):
         self.serialized = serialized
         self.dst_path = dst_path
+        self.compress = compress
+        # called with (done, total) after each node.
+        self.progress = None
 
-        self.root = etree.Element('kmbscene')
+        self.root = None
 
     def _for_layer(self, feed: dict):
         layer = etree.SubElement(self.root, feed['tag'])
@@ -49,7 +54,8 @@ class Saver:
         self._common_attrs(note, feed)
 
     def _save(self):
-        for raw in self.serialized.values():
+        total = len(self.serialized)
+        for i, raw in enumerate(self.serialized.values(), start=1):
             tag = raw['tag']
             if tag == 'layer':
                 self._for_layer(raw)
@@ -62,11 +68,22 @@ class Saver:
             elif tag == 'note':
                 self._for_note(raw)
             # else ...
+            if self.progress is not None:
+                self.progress(i, total)
+
+    def build(self):
+        # build the XML tree in memory only once,
+        # so it can be saved or parsed directly.
+        if self.root is None:
+            self.root = etree.Element('kmbscene')
+            self._save()
+        return etree.ElementTree(self.root)
 
     def save_file(self):
-        self._save()
-        file = etree.ElementTree(self.root)
-        file.write(open(self.dst_path, 'wb'), pretty_print=True)
+        # the XML streams into file (or compressor).
+        file = self.build()
+        with open_write(self.dst_path, self.compress) as f:
+            file.write(f, pretty_print=True)
 
     # ----------UTILS----------
 
@@ -98,18 +115,20 @@ class Saver:
             args = etree.SubElement(root, 'args')
             self._args_wheel(args, feed['args'])
 
+    @classmethod
+    def arg_text(cls, arg_name: str, arg_value, io_convert=False) -> str:
+        if io_convert and arg_name in ('inputs', 'outputs'):
+            # convert io sequence to string, split by `;`.
+            return cls.seq2str(arg_value, repair_req=True)
+        elif arg_value is None or not arg_value:
+            # required value but got None instead.
+            # then set a mark, means this args is required.
+            return '!REQ'
+        return arg_value
+
     def _args_wheel(self, root, args: dict, io_convert=False):
         # deliver the args to element.
-        for arg_name, arg_field in args.items():
-            arg_value, arg_dtype = arg_field
+        for arg_name, (arg_value, arg_dtype) in args.items():
             arg_item = etree.SubElement(root, arg_name)
-            if io_convert and arg_name in ('inputs', 'outputs'):
-                # convert io sequence to string, split by `;`.
-                arg_item.text = self.seq2str(arg_field[0], repair_req=True)
-            elif arg_value is None or not arg_value:
-                # required value but got None instead.
-                # then set a mark, means this args is required.
-                arg_item.text = '!REQ'
-            else:
-                arg_item.text = arg_value
+            arg_item.text = self.arg_text(arg_name, arg_value, io_convert)
             arg_item.set('c', arg_dtype)
@@ -1,11 +1,13 @@
 """ All kinds of atom operations for custom pins. """
 import os
-import sqlite3
 
 from cfg import UCP_LOC
+from lib.dbpool import ConnectionPool
 
 # file for User Custom Pin
 UCP_FILE = UCP_LOC + 'pins.sqlite'
+# the connections to ucp file stay open.
+UCP_POOL = ConnectionPool.get(UCP_FILE)
 
 
 # ----------MAIN----------
@@ -24,7 +26,7 @@ def write_custom_pin(*pin_args):
     # collect all the needs.
     pin_nm, args, org_nm = pin_args
     # start insert pin item
-    ucp = sqlite3.connect(UCP_FILE)
+    ucp = UCP_POOL.connect()
     cur = ucp.cursor()
     cur.execute(
         """ INSERT INTO UCP(
@@ -33,7 +35,6 @@ def write_custom_pin(*pin_args):
         """,
         (pin_nm, args, 'Pins', org_nm))
     ucp.commit()
-    ucp.close()
 
 
 def read_custom_pin():
@@ -43,31 +44,28 @@ def read_custom_pin():
             not os.path.exists(UCP_FILE)
     ):
         return None
-    ucp = sqlite3.connect(UCP_FILE)
+    ucp = UCP_POOL.connect()
     cur = ucp.cursor()
     cur.execute('SELECT * FROM UCP')
     for pin in cur.fetchall():
         yield pin
-    ucp.close()
 
 
 def remove_custom_pin(pin_id):
     """ Remove one pin from file. """
-    ucp = sqlite3.connect(UCP_FILE)
+    ucp = UCP_POOL.connect()
     cur = ucp.cursor()
     cur.execute('DELETE FROM UCP WHERE ID=?', (pin_id, ))
     ucp.commit()
-    ucp.close()
 
 
 def update_custom_pin(pin_id: int, pin_args: str):
     """ Update one existing pin's args. """
-    ucp = sqlite3.connect(UCP_FILE)
+    ucp = UCP_POOL.connect()
     cur = ucp.cursor()
     cur.execute('UPDATE UCP SET PIN_ARGS=? WHERE ID=?',
                 (pin_args, pin_id))
     ucp.commit()
-    ucp.close()
 
 
 # ----------UTILS----------
@@ -75,7 +73,7 @@ def update_custom_pin(pin_id: int, pin_args: str):
 
 def create_ucp():
     """ Create user custom pin table. """
-    ucp = sqlite3.connect(UCP_FILE)
+    ucp = UCP_POOL.connect()
     cur = ucp.cursor()
     cur.execute(""" CREATE TABLE UCP(
         ID         INTEGER PRIMARY KEY AUTOINCREMENT ,
@@ -84,7 +82,6 @@ def create_ucp():
         CATEGORY   TEXT NOT NULL ,
         ORG_NAME   TEXT NOT NULL ); """)
     ucp.commit()
-    ucp.close()
 
 
 def _pin_args_split(pin_args: str, equation_split=True):
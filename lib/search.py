@@ -0,0 +1,185 @@
+""" Ranked search over nodes and pins. """
+import os
+from bisect import bisect_left
+from collections import namedtuple, OrderedDict
+
+from lib.catalog import NodeCatalog
+from lib.pins import UCP_FILE, read_custom_pin
+
+# The label is what shows and matches, it's the pin name for pins,
+# or the node name for nodes, whose pin_args and pin_id are None.
+SearchEntry = namedtuple('SearchEntry', ('label', 'name', 'info',
+                                         'sort', 'category',
+                                         'pin_args', 'pin_id'))
+
+# The smaller rank comes first.
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_SUBSTRING = 2
+RANK_INFO = 3
+RANK_FUZZY = 4
+
+
+class SearchIndex:
+    """ Search nodes and pins by their label and info.
+
+    The labels are sorted for prefix matching, and the trigrams of
+    labels and infos are indexed, so one query only checks a few
+    candidates. Results are ranked in order of exact, prefix,
+    substring of label, substring of info, and fuzzy which has
+    the letters in order (like 'cv2d' for Conv2D).
+
+    No SQL or regex is involved, so any character is safe in query.
+    Recent results are kept in a LRU cache, and a query that extends
+    the last one only checks those matched last time, since whatever
+    matches the longer word also matches the shorter one.
+
+    """
+
+    GRAM = 3
+    CACHE_SIZE = 64
+
+    def __init__(self, catalog: NodeCatalog = None):
+        catalog = catalog or NodeCatalog.get()
+        self.nodes = [SearchEntry(n.name, n.name, n.info, n.sort, n.category, None, None)
+                      for n in catalog.nodes.values()]
+        self.entries = []
+        self._labels = []   # lower labels
+        self._infos = []    # lower infos
+        self._sorted = []   # sorted (lower label, idx)
+        self._grams = {}    # gram -> {idx}
+        self._pins_mtime = None
+        self._cache = OrderedDict()  # word -> (results, matched idx)
+        self._last = ('', None)      # the last word and its matched idx
+        self.build(self.nodes)
+
+    def build(self, entries: list):
+        self.entries = entries
+        self._labels = [e.label.lower() for e in entries]
+        self._infos = [(e.info or '').lower() for e in entries]
+        self._sorted = sorted((label, i) for i, label in enumerate(self._labels))
+        self._grams = {}
+        for i, (label, info) in enumerate(zip(self._labels, self._infos)):
+            for gram in self._split_grams(label) | self._split_grams(info):
+                self._grams.setdefault(gram, set()).add(i)
+        # the indexes are changed, so do the results.
+        self._cache.clear()
+        self._last = ('', None)
+
+    def refresh_pins(self):
+        # Rebuild only when the pins file changed,
+        # in WAL mode the changes go to its -wal file first.
+        mtime = tuple(os.path.getmtime(f) if os.path.exists(f) else None
+                      for f in (UCP_FILE, UCP_FILE + '-wal'))
+        if mtime == self._pins_mtime:
+            return
+        self._pins_mtime = mtime
+        catalog = NodeCatalog.get()
+        pins = []
+        for pin_id, pin_name, pin_args, _, org_name in read_custom_pin() or ():
+            node = catalog.node(org_name)
+            if node is None:
+                continue
+            pins.append(SearchEntry(pin_name, org_name,
+                                    f'Pin of {org_name}: {pin_args or "None"}',
+                                    node.sort, node.category,
+                                    pin_args, str(pin_id)))
+        self.build(self.nodes + pins)
+
+    def search(self, word: str) -> list:
+        """
+        Search the word in nodes and pins.
+
+        :return: a ranked list of (entry, from_idx, step),
+        where from_idx and step mark the matched part of label.
+        """
+        self.refresh_pins()
+        word = word.lower()
+        if not word:
+            return []
+        if word in self._cache:
+            self._cache.move_to_end(word)
+            results, matched = self._cache[word]
+        else:
+            last_word, last_matched = self._last
+            if last_matched is not None and word.startswith(last_word):
+                ranked = self._narrow(word, last_matched)
+            else:
+                ranked = self._rank(word)
+            results, matched = self._sort(word, ranked), frozenset(ranked)
+            self._cache[word] = (results, matched)
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        self._last = (word, matched)
+        return results
+
+    # ----------UTILS----------
+
+    def _rank(self, word: str) -> dict:
+        # Rank all the entries through indexes.
+        ranked = {}
+        labels = self._labels
+        # exact and prefix, by the sorted labels.
+        pos = bisect_left(self._sorted, (word, -1))
+        while pos < len(self._sorted) and self._sorted[pos][0].startswith(word):
+            label, i = self._sorted[pos]
+            ranked[i] = RANK_EXACT if label == word else RANK_PREFIX
+            pos += 1
+        # substring, only in those have all the grams.
+        for i in self._candidates(word):
+            if i in ranked:
+                continue
+            if word in labels[i]:
+                ranked[i] = RANK_SUBSTRING
+            elif word in self._infos[i]:
+                ranked[i] = RANK_INFO
+        # fuzzy, for the rest of labels.
+        if len(word) > 1:
+            for i, label in enumerate(labels):
+                if i not in ranked and self._is_subsequence(word, label):
+                    ranked[i] = RANK_FUZZY
+        return ranked
+
+    def _narrow(self, word: str, pool) -> dict:
+        # Rank only the entries in pool, one by one.
+        ranked = {}
+        fuzzy = len(word) > 1
+        for i in pool:
+            label = self._labels[i]
+            if label == word:
+                ranked[i] = RANK_EXACT
+            elif label.startswith(word):
+                ranked[i] = RANK_PREFIX
+            elif word in label:
+                ranked[i] = RANK_SUBSTRING
+            elif word in self._infos[i]:
+                ranked[i] = RANK_INFO
+            elif fuzzy and self._is_subsequence(word, label):
+                ranked[i] = RANK_FUZZY
+        return ranked
+
+    def _sort(self, word: str, ranked: dict) -> list:
+        labels = self._labels
+        results = []
+        for i in sorted(ranked, key=lambda k: (ranked[k], len(labels[k]), labels[k], k)):
+            from_idx = labels[i].find(word) if ranked[i] <= RANK_SUBSTRING else 0
+            step = len(word) if ranked[i] <= RANK_SUBSTRING else 0
+            results.append((self.entries[i], from_idx, step))
+        return results
+
+    @classmethod
+    def _split_grams(cls, text: str) -> set:
+        return {text[i:i + cls.GRAM] for i in range(len(text) - cls.GRAM + 1)}
+
+    def _candidates(self, word: str):
+        grams = self._split_grams(word)
+        # too short to have a gram, check all of them.
+        if not grams:
+            return range(len(self.entries))
+        sets = sorted((self._grams.get(g, set()) for g in grams), key=len)
+        return sets[0].intersection(*sets[1:])
+
+    @classmethod
+    def _is_subsequence(cls, word: str, text: str) -> bool:
+        it = iter(text)
+        return all(c in it for c in word)
@@ -0,0 +1,176 @@
+import os
+import unittest
+
+# set to parent directory
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from editor.component.args_model import ArgsStore, ArgsPreviewModel
+from editor.component.semaphores import DirtySemaphore
+from lib import DataBase4Args
+
+
+DB = DataBase4Args()
+
+
+def make_store(node_name='Dense', count=1, pin_args='None', node_id='1'):
+    id_string, inherit = DB.get_args_id(node_name)
+    store = ArgsStore(DB, node_name, 'Layers', id_string, inherit, pin_args)
+    store.get_args(add_custom_args=True, count=count)
+    store.track(node_id, None)
+    return store
+
+
+class ArgsPrototypeTest(unittest.TestCase):
+
+    def test_rows(self):
+        store = make_store()
+        node = DB.catalog.node('Dense')
+        names = [row.arg_name for row in store.rows]
+        self.assertEqual(names, [r[1] for r in node.inh_rows] + ['var_name'] +
+                         [r[2] for r in node.org_rows])
+        self.assertEqual(store.io_separator, len(node.inh_rows))
+        self.assertEqual(store.var_name_idx, names.index('var_name'))
+        # rows with check button, combo box and io order.
+        self.assertEqual([store.rows[i].arg_name for i in store.check_args],
+                         ['trainable', 'use_bias'])
+        self.assertEqual([row[0] for row in store.combo_args],
+                         [names.index('kernel_initializer'),
+                          names.index('bias_initializer'),
+                          names.index('activation')])
+        self.assertEqual(store.io_order_args, [])
+        self.assertEqual(store.rows_by_name('units'), (names.index('units'), ))
+        # units has no default, so it's required.
+        self.assertTrue(store.peek(names.index('units')).is_required)
+        self.assertFalse(store.peek(names.index('use_bias')).is_required)
+
+    def test_shared(self):
+        a, b = make_store(), make_store()
+        self.assertIs(a.proto, b.proto)
+        # default values are shared till changed.
+        idx = a.rows_by_name('use_bias')[0]
+        self.assertIs(a.peek(idx), b.peek(idx))
+        self.assertIsNot(a.item(idx, 1), b.peek(idx))
+        # without custom args, it's another kind.
+        c = ArgsStore(DB, 'Dense', 'Layers', *DB.get_args_id('Dense'), 'None')
+        c.get_args()
+        self.assertIsNot(c.proto, a.proto)
+        self.assertEqual(c.rows_by_name('var_name'), ())
+        model = make_store('Model')
+        self.assertEqual(model.io_order_args,
+                         list(model.rows_by_name('inputs', 'org') +
+                              model.rows_by_name('outputs', 'org')))
+
+
+class ArgsStoreTest(unittest.TestCase):
+
+    def own_values(self, store):
+        return {store.rows[i].arg_name: v.value
+                for i, v in enumerate(store.values) if v is not None}
+
+    def test_stamp(self):
+        self.assertEqual(self.own_values(make_store(count=3)),
+                         {'name': 'dense_3', 'var_name': 'dense'})
+        # auto counted var name.
+        self.assertEqual(make_store('Input', count=2).var_name, 'input_2')
+        self.assertEqual(make_store('Input', count=1).var_name, 'input')
+
+    def test_stamp_pins(self):
+        store = make_store(pin_args='units=64;activation=relu')
+        values = self.own_values(store)
+        self.assertEqual((values['units'], values['activation']), ('64', 'relu'))
+        idx, value = store.get_item_by_name('units')
+        self.assertTrue(value.is_pined)
+        self.assertIn(('units', '64'), store.extract_args(get_pined=True).items())
+        # other stores are not pined.
+        self.assertFalse(make_store().peek(idx).is_pined)
+
+    def test_compact(self):
+        store = make_store()
+        idx, value = store.get_item_by_name('use_bias')
+        self.assertIs(store.values[idx], value)
+        # nothing changed, back to the shared default.
+        store.compact()
+        self.assertIsNone(store.values[idx])
+        # changed one is kept.
+        idx, value = store.get_item_by_name('units')
+        self.assertTrue(store.reassign_value(value, '32'))
+        store.compact()
+        self.assertIs(store.values[idx], value)
+        self.assertIsNotNone(store.values[store.var_name_idx])
+
+
+class ArgsEditableModelTest(unittest.TestCase):
+
+    def own_names(self, store):
+        return {store.rows[i].arg_name for i, v in enumerate(store.values) if v is not None}
+
+    def test_materialize(self):
+        store = make_store()
+        model = store.materialize()
+        self.assertEqual(model.rowCount(), len(store.rows))
+        for idx, row in enumerate(store.rows):
+            self.assertEqual(model.item(idx, 0).text(), row.arg_name)
+            self.assertIs(model.item(idx, 1).state, store.values[idx])
+        self.assertEqual(model.item(store.var_name_idx, 1).text(), 'dense')
+        # the box args show nothing in front.
+        idx = store.combo_args[0][0]
+        self.assertEqual(model.item(idx, 1).text(), '')
+
+    def test_round_trip(self):
+        store = make_store()
+        model = store.materialize()
+        idx, _ = store.get_item_by_name('units')
+        store.reassign_value(model.item(idx, 1).state, '128')
+        store.set_var_name('fc')
+        # the shown items follow the store.
+        self.assertEqual(model.item(idx, 1).text(), '128')
+        self.assertEqual(model.item(store.var_name_idx, 1).text(), 'fc')
+        model.release()
+        self.assertEqual(self.own_names(store), {'name', 'var_name', 'units'})
+        self.assertTrue(all(v is None or v.item is None for v in store.values))
+        # and shows the same again.
+        model = store.materialize()
+        self.assertEqual(model.item(idx, 1).text(), '128')
+        self.assertEqual(model.item(store.var_name_idx, 1).text(), 'fc')
+        self.assertEqual(store.extract_args(get_changed=True), {'units': '128'})
+        model.release()
+
+    def test_preview(self):
+        id_string, inherit = DB.get_args_id('Dense')
+        model = ArgsPreviewModel(DB, 'Dense', id_string, inherit)
+        model.get_args()
+        node = DB.catalog.node('Dense')
+        self.assertEqual([model.item(i, 1).text() for i in range(model.rowCount())],
+                         [r[1] for r in node.inh_rows] + [r[2] for r in node.org_rows])
+
+
+class DirtySemaphoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dirty = DirtySemaphore()
+        self.called = []
+        self.dirty.subscribe(self.called.append)
+        self.store = make_store(node_id='7')
+        self.store.track('7', self.dirty)
+
+    def test_track(self):
+        self.assertEqual(self.dirty.get(), {'7'})
+        self.assertEqual(self.dirty.take(), {'7'})
+        self.assertEqual(self.dirty.get(), set())
+
+    def test_change(self):
+        self.dirty.take()
+        # reading is not a change.
+        self.store.materialize().release()
+        self.store.extract_args(get_changed=True)
+        self.assertEqual(self.dirty.get(), set())
+        idx, value = self.store.get_item_by_name('units')
+        self.store.reassign_value(value, '8')
+        self.store.set_var_name('fc')
+        self.assertEqual(self.dirty.take(), {'7'})
+        # only called once each time it turns dirty.
+        self.assertEqual(self.called, ['7', '7'])
+        self.dirty.unsubscribe(self.called.append)
+        self.store.reassign_item(idx, '16')
+        self.assertEqual(self.dirty.get(), {'7'})
+        self.assertEqual(self.called, ['7', '7'])
@@ -0,0 +1,116 @@
+import os
+import sqlite3
+import threading
+import unittest
+
+# set to parent directory
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.catalog import NodeCatalog
+from lib.dbpool import ConnectionPool
+from lib.utils import split_args_id
+
+
+class NodeCatalogTest(unittest.TestCase):
+    """ The catalog gives the same as querying database. """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.catalog = NodeCatalog.get()
+        cls.db = sqlite3.connect(NodeCatalog.DATABASE)
+        cls.cursor = cls.db.cursor()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+
+    def test_shared(self):
+        self.assertIs(NodeCatalog.get(), self.catalog)
+
+    def test_nodes(self):
+        rows = self.cursor.execute('SELECT * FROM nodes').fetchall()
+        self.assertEqual(len(rows), len(self.catalog.nodes))
+        for id_, name, info, ori, inh, sort, category in rows:
+            node = self.catalog.node(name)
+            self.assertEqual((node.id, node.info, node.sort, node.category),
+                             (id_, info, sort, category))
+        self.assertIsNone(self.catalog.node('NoSuchNode'))
+
+    def test_args_id(self):
+        for name in self.catalog.nodes:
+            res = self.cursor.execute(
+                'SELECT ORI_ARGS, INH_ARGS FROM nodes WHERE NAME=(?)', (name, ))
+            self.assertEqual(self.catalog.args_id(name), res.fetchone())
+        self.assertIsNone(self.catalog.args_id('NoSuchNode'))
+
+    def test_category_sort(self):
+        for name in self.catalog.nodes:
+            res = self.cursor.execute(
+                'SELECT CATEGORY, SORT FROM nodes WHERE NAME=(?)', (name, ))
+            self.assertEqual(self.catalog.category_sort(name), res.fetchone())
+        self.assertIsNone(self.catalog.category_sort('NoSuchNode'))
+
+    def test_category_listing(self):
+        # the node menu groups nodes by (sort, category).
+        expected = {}
+        for _, name, info, _, _, sort, category in \
+                self.cursor.execute('SELECT * FROM nodes').fetchall():
+            expected.setdefault((sort, category), []).append((name, info))
+        listed = {}
+        for node in self.catalog.nodes.values():
+            listed.setdefault((node.sort, node.category), []).append((node.name, node.info))
+        self.assertEqual(listed, expected)
+
+    def test_org_rows(self):
+        for node in self.catalog.nodes.values():
+            expected = tuple(
+                self.cursor.execute(f'SELECT * FROM org_args WHERE ID={id_}').fetchone()
+                for id_ in split_args_id(node.ori_args)) if node.ori_args else ()
+            self.assertEqual(self.catalog.org_rows(node.ori_args), expected)
+            self.assertEqual(node.org_rows, expected)
+
+    def test_inh_rows(self):
+        for node in self.catalog.nodes.values():
+            if not node.inh_args:
+                self.assertEqual(node.inh_rows, ())
+                continue
+            expected = tuple(self.cursor.execute(
+                f'SELECT * FROM inh_args WHERE ID={node.inh_args}').fetchall())
+            self.assertEqual(self.catalog.inh_rows(node.inh_args), expected)
+            self.assertEqual(node.inh_rows, expected)
+
+    def test_box_values(self):
+        for id_, values in self.cursor.execute(
+                'SELECT ID, "VALUES" FROM box_args').fetchall():
+            self.assertEqual(self.catalog.box_values(id_), tuple(values.split(';')))
+        self.assertEqual(self.catalog.box_values(-1), ())
+
+    def test_one_pool_for_each_path(self):
+        path = os.path.abspath(NodeCatalog.DATABASE)
+        NodeCatalog(path)
+        count = len(ConnectionPool._pools)
+        for _ in range(3):
+            NodeCatalog(path)
+        self.assertEqual(len(ConnectionPool._pools), count)
+        self.assertIs(ConnectionPool.get(NodeCatalog.DATABASE, read_only=True),
+                      ConnectionPool.get(path, read_only=True))
+
+    def test_close_thread(self):
+        pool = ConnectionPool.get(NodeCatalog.DATABASE, read_only=True)
+        count = len(pool._conns)
+        conns = []
+
+        def work():
+            conns.append(pool.connect())
+            ConnectionPool.close_thread()
+
+        for _ in range(3):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        # nothing left after the threads end.
+        self.assertEqual(len(pool._conns), count)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conns[0].execute('SELECT 1')
+        # and the current thread keeps its own.
+        self.assertIs(pool.connect(), pool.connect())
@@ -0,0 +1,82 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from argparse import Namespace
+
+# set to parent directory
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cmd_parser import collect_batch, export_one, run_batch
+from test.test_parser import make_project
+
+
+GOOD = ([('0', 'input', 'Input', 'null', '1;9'),
+         ('1', 'dense', 'Dense', '0', '9')], ('9', '0', '1'))
+# without any Input node.
+BROKEN = ([('1', 'dense', 'Dense', 'null', '9')], ('9', '1', '1'))
+
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.good = self.add_project('good.kmbm', *GOOD)
+        self.broken = self.add_project('broken.kmbm', *BROKEN)
+        with open(os.path.join(self.dir, 'notes.txt'), 'w') as f:
+            f.write('not a project')
+        self.dst = os.path.join(self.dir, 'out')
+        os.mkdir(self.dst)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def add_project(self, name, layers, model):
+        src = os.path.join(self.dir, name)
+        shutil.move(make_project(layers, model), src)
+        return src
+
+    def make_args(self, batch, dst=None, report=None):
+        return Namespace(batch=batch, dst=dst, type='.py', author=None,
+                         workers=2, report=report, no_cache=False)
+
+    def test_collect_batch(self):
+        self.assertEqual(collect_batch(self.dir), [self.broken, self.good])
+        self.assertEqual(collect_batch(os.path.join(self.dir, 'g*')), [self.good])
+        self.assertEqual(collect_batch(os.path.join(self.dir, '*.kmbb')), [])
+
+    def test_export_one(self):
+        result = export_one(self.good, self.dst, '.py', None, False)
+        self.assertEqual(result['status'], 'ok')
+        self.assertIsNone(result['error'])
+        self.assertTrue(os.path.exists(os.path.join(self.dst, 'good.py')))
+        # the error is kept in result, not raised.
+        result = export_one(self.broken, self.dst, '.py', None, False)
+        self.assertEqual(result['status'], 'error')
+        self.assertTrue(result['error'].startswith('PyMissingInputError'))
+        self.assertFalse(os.path.exists(os.path.join(self.dst, 'broken.py')))
+
+    def test_report_and_exit_code(self):
+        report = os.path.join(self.dir, 'report.json')
+        self.assertEqual(run_batch(self.make_args(self.dir, self.dst, report)), 1)
+        with open(report) as f:
+            results = json.load(f)
+        self.assertEqual([(r['src'], r['status']) for r in results],
+                         [(self.broken, 'error'), (self.good, 'ok')])
+        self.assertTrue(os.path.exists(os.path.join(self.dst, 'good.py')))
+        # all good.
+        self.assertEqual(run_batch(self.make_args(self.good, self.dst, report)), 0)
+        # nothing to export.
+        self.assertEqual(run_batch(self.make_args(self.dst + '/*.kmbm', self.dst)), 1)
+
+    def test_default_dst(self):
+        report = os.path.join(self.dir, 'report.json')
+        cwd = os.getcwd()
+        os.chdir(self.dir)
+        try:
+            self.assertEqual(run_batch(self.make_args(self.good, report=report)), 0)
+        finally:
+            os.chdir(cwd)
+        # into the current directory.
+        self.assertTrue(os.path.exists(os.path.join(self.dir, 'good.py')))
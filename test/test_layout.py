@@ -0,0 +1,80 @@
+import os
+import unittest
+
+import numpy as np
+
+# set to parent directory
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.layout import LayeredLayout
+
+
+NODE_SIZE = 85  # the biggest node item.
+
+
+class LayeredLayoutTest(unittest.TestCase):
+
+    def assert_apart(self, pos):
+        # every position is set, and no two nodes overlap.
+        self.assertFalse(np.isnan(pos).any())
+        dx = np.abs(pos[:, None, 0] - pos[None, :, 0])
+        dy = np.abs(pos[:, None, 1] - pos[None, :, 1])
+        overlap = (dx < NODE_SIZE) & (dy < NODE_SIZE)
+        np.fill_diagonal(overlap, False)
+        self.assertFalse(overlap.any(), pos)
+
+    def test_chain(self):
+        pos = LayeredLayout(3, [(0, 1), (1, 2)]).layout()
+        self.assertEqual(pos[:, 0].tolist(), [0.0, 200.0, 400.0])
+        self.assertEqual(pos[:, 1].tolist(), [0.0, 0.0, 0.0])
+
+    def test_break_cycles(self):
+        src, dst = np.array([0, 1, 2]), np.array([1, 2, 0])
+        src, dst = LayeredLayout._break_cycles(3, src, dst)
+        layer = LayeredLayout._assign_layers(3, src, dst)
+        # acyclic now, every edge goes forward.
+        self.assertTrue((layer[dst] > layer[src]).all())
+        pos = LayeredLayout(3, [(0, 1), (1, 2), (2, 0)]).layout()
+        self.assertEqual(sorted(pos[:, 0].tolist()), [0.0, 200.0, 400.0])
+        self.assert_apart(pos)
+
+    def test_dummies(self):
+        layer = np.array([0, 1, 3])
+        src, dst = np.array([0, 1, 0]), np.array([1, 2, 2])
+        v_layer, v_key, src, dst = LayeredLayout._add_dummies(
+            layer, np.zeros(3), src, dst)
+        # 1 dummy for 1 -> 2, 2 dummies for 0 -> 2.
+        self.assertEqual(len(v_layer), 6)
+        self.assertTrue((v_layer[dst] - v_layer[src] == 1).all())
+        pos = LayeredLayout(4, [(0, 1), (1, 2), (2, 3), (0, 3)]).layout()
+        self.assertEqual(pos[:, 0].tolist(), [0.0, 200.0, 400.0, 600.0])
+        self.assert_apart(pos)
+
+    def test_satellites(self):
+        pos = LayeredLayout(4, [(0, 1)], [(2, 1), (3, 1)]).layout()
+        self.assertEqual(pos[2, 0], pos[1, 0] - LayeredLayout.LAYER_GAP / 2)
+        self.assertEqual(pos[3, 0], pos[2, 0])
+        self.assert_apart(pos)
+
+    def test_nested_satellites(self):
+        pos = LayeredLayout(4, [(0, 1)], [(2, 1), (3, 2)]).layout()
+        self.assert_apart(pos)
+        pos = LayeredLayout(9, [(0, 1), (2, 3)],
+                            [(4, 1), (5, 4), (6, 5), (7, 3), (8, 4)]).layout()
+        self.assert_apart(pos)
+
+    def test_isolated(self):
+        pos = LayeredLayout(6, [(0, 1)]).layout()
+        self.assert_apart(pos)
+        # below the graph.
+        self.assertTrue((pos[2:, 1] > pos[:2, 1].max()).all())
+        pos = LayeredLayout(4).layout()
+        self.assert_apart(pos)
+
+    def test_centered(self):
+        init = [(1000, 500), (1200, 700), (900, 300)]
+        pos = LayeredLayout(3, [(0, 1), (1, 2)], init=init).layout()
+        np.testing.assert_allclose(pos.mean(axis=0), np.mean(init, axis=0))
+
+    def test_empty(self):
+        self.assertEqual(LayeredLayout(0).layout().shape, (0, 2))
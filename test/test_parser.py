@@ -0,0 +1,269 @@
+import os
+import tempfile
+import unittest
+
+# set to parent directory
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.parser import (PyParser, Saver, ExportCache, LoadingError,
+                        PyUnsatisfiedInputWarning, COMPRESS_SUPPORT,
+                        make_saver, make_loader, convert)
+from lib.parser.binary import BINARY_SUFFIX
+from lib.parser.compress import detect
+from lib.parser.pyparser import NodePlaceHolder, ModelPlaceHolder
+from cmd_parser import export
+
+
+LAYER = """
+  <layer id="{id}" x="0" y="0"{head}>
+    <tp>Layers</tp><sort>Core</sort>
+    <var>{var}</var><class>{cls}</class>
+    <args/><mode>IO</mode>
+    <input>{ipt}</input><output>{opt}</output>
+  </layer>"""
+
+MODEL = """
+  <model id="{id}" x="0" y="0">
+    <tp>Common</tp><sort>Common</sort>
+    <var>model</var><class>Model</class>
+    <args>
+      <inputs c="id">{ipt}</inputs>
+      <outputs c="id">{opt}</outputs>
+    </args>
+  </model>"""
+
+
+def make_project(layers, model):
+    content = '<kmbscene>'
+    for id_, var, cls, ipt, opt in layers:
+        content += LAYER.format(id=id_, var=var, cls=cls,
+                                ipt=ipt, opt=opt,
+                                head=' head="head"' if cls == 'Input' else '')
+    content += MODEL.format(id=model[0], ipt=model[1], opt=model[2])
+    content += '</kmbscene>'
+    file = tempfile.NamedTemporaryFile('w', suffix='.kmbm', delete=False)
+    file.write(content)
+    file.close()
+    return file.name
+
+
+class PlaceHolderTest(unittest.TestCase):
+
+    def test_node_duplicate_gain(self):
+        ph = NodePlaceHolder('3')
+        ph.ep_ipt = ['1', '2']
+        ph.gain('1')
+        ph.gain('1')
+        self.assertFalse(ph.check(), 'duplicate edge released node')
+        ph.gain('2')
+        self.assertTrue(ph.check(), 'node not released')
+        ph.release()
+        self.assertFalse(ph.check(), 'node released twice')
+
+    def test_model_unsatisfied(self):
+        ph = ModelPlaceHolder('9')
+        ph.ep_ipt = ['1']
+        ph.ep_opt = ['4', '5']
+        ph.gain('1')
+        ph.gain('6')  # not expected
+        ph.gain('4')
+        self.assertEqual(ph.unsatisfied(), ['5'], 'unsatisfied error')
+        self.assertFalse(ph.check(), 'model released early')
+
+
+class PyParserTest(unittest.TestCase):
+
+    def tearDown(self):
+        os.remove(self.src)
+
+    def test_deep_chain(self):
+        # much deeper than the default recursion limit.
+        n = 3000
+        layers = [('0', 'input', 'Input', 'null', f'1;{n}')]
+        for i in range(1, n):
+            layers.append((str(i), f'dense_{i}', 'Dense',
+                           str(i - 1), str(i + 1)))
+        self.src = make_project(layers, (str(n), '0', str(n - 1)))
+        lines, *_, warnings = PyParser(self.src).commit()
+        self.assertEqual(len(lines), n + 1, 'lines count error')
+        self.assertEqual(lines[-2], f'dense_{n - 1} = layers.Dense()(dense_{n - 2})')
+        self.assertEqual(warnings, [], 'deep chain warnings')
+
+    def test_merge_order(self):
+        layers = [('0', 'input', 'Input', 'null', '1;2;3;9'),
+                  ('1', 'a', 'Dense', '0', '3'),
+                  ('2', 'b', 'Dense', '0', '3'),
+                  ('3', 'add', 'Add', '1;2;0', '9')]
+        self.src = make_project(layers, ('9', '0', '3'))
+        lines, *_ = PyParser(self.src).commit()
+        self.assertEqual(lines, ['input = layers.Input()',
+                                 'a = layers.Dense()(input)',
+                                 'b = layers.Dense()(input)',
+                                 'add = layers.Add()([a, b, input])',
+                                 'model = models.Model(inputs=input, outputs=add)'])
+
+    def test_unsatisfied_merge(self):
+        # 'c' is never connected from any Input.
+        layers = [('0', 'input', 'Input', 'null', '1;3;9'),
+                  ('1', 'a', 'Dense', '0', '3'),
+                  ('2', 'c', 'Dense', 'null', '3'),
+                  ('3', 'add', 'Add', '1;2;0', '9')]
+        self.src = make_project(layers, ('9', '0', '3'))
+        *_, warnings = PyParser(self.src).commit()
+        unsatisfied = sorted(str(w) for w in warnings
+                             if isinstance(w, PyUnsatisfiedInputWarning))
+        self.assertEqual(unsatisfied,
+                         ['Add:add was never released, still waiting for: c',
+                          'Model:model was never released, still waiting for: add'])
+
+
+class FromSerializedTest(unittest.TestCase):
+
+    def test_same_as_file(self):
+        def layer(id_, var, cls, ipt, opt):
+            return {'tag': 'layer', 'id': id_, 'var': var, 'class_': cls,
+                    'args': {}, 'x': '0', 'y': '0', 'tp': 'Layers',
+                    'sort': 'Core', 'mode': 'IO', 'input': ipt, 'output': opt}
+        serialized = {
+            '0': layer('0', 'input', 'Input', [], ['1', '2']),
+            '1': layer('1', 'dense', 'Dense', ['0'], ['2']),
+            '2': {'tag': 'model', 'id': '2', 'var': 'model', 'class_': 'Model',
+                  'args': {'inputs': (['0'], 'id'), 'outputs': (['1'], 'id')},
+                  'x': '0', 'y': '0', 'tp': 'Common', 'sort': 'Common'}
+        }
+        file = tempfile.NamedTemporaryFile(suffix='.kmbm', delete=False)
+        file.close()
+        try:
+            Saver(serialized, file.name).save_file()
+            from_file = PyParser(file.name).commit()
+        finally:
+            os.remove(file.name)
+        from_memory = PyParser.from_serialized(serialized).commit()
+        self.assertEqual(from_memory[0], from_file[0], 'lines not same')
+        self.assertEqual(from_memory[0][-1],
+                         'model = models.Model(inputs=input, outputs=dense)')
+
+
+class ExportCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        layers = [('0', 'input', 'Input', 'null', '1;9'),
+                  ('1', 'dense', 'Dense', '0', '9')]
+        self.src = make_project(layers, ('9', '0', '1'))
+        self.cache = os.path.splitext(self.src)[0] + ExportCache.SUFFIX
+
+    def tearDown(self):
+        os.remove(self.src)
+        os.remove(self.cache)
+
+    def test_reuse_and_update(self):
+        lines = PyParser(self.src).commit()[0]
+        cache = ExportCache.for_project(self.src)
+        self.assertEqual(PyParser(self.src, cache).commit()[0], lines)
+        # only the header at the first time.
+        self.assertEqual(len(cache.fragments), 0, 'fragments saved at first')
+        cache = ExportCache.for_project(self.src)
+        self.assertEqual(PyParser(self.src, cache).commit()[0], lines)
+        self.assertEqual(len(cache.fragments), 3, 'fragments not saved')
+        # reused fragments come out the same.
+        cache = ExportCache.for_project(self.src)
+        self.assertEqual(PyParser(self.src, cache).commit()[0], lines)
+        # the changed node is made again.
+        with open(self.src) as f:
+            content = f.read().replace('<var>dense</var>', '<var>fc</var>')
+        with open(self.src, 'w') as f:
+            f.write(content)
+        cache = ExportCache.for_project(self.src)
+        lines = PyParser(self.src, cache).commit()[0]
+        self.assertEqual(lines[1:], ['fc = layers.Dense()(input)',
+                                     'model = models.Model(inputs=input, outputs=fc)'])
+
+    def test_unchanged_skipped(self):
+        with tempfile.TemporaryDirectory() as dst:
+            self.assertEqual(export(self.src, dst, '.py'), [])
+            output = os.path.join(dst, 'model.py')
+            with open(output, 'a') as f:
+                f.write('# untouched')
+            # the same project to the same output, not parsed again.
+            self.assertEqual(export(self.src, dst, '.py'), [])
+            with open(output) as f:
+                self.assertTrue(f.read().endswith('# untouched'))
+            # but the options count.
+            export(self.src, dst, '.py', author='someone')
+            with open(output) as f:
+                self.assertFalse(f.read().endswith('# untouched'))
+            # and so does the output.
+            os.remove(output)
+            export(self.src, dst, '.py', author='someone')
+            self.assertTrue(os.path.exists(output))
+
+
+class BinaryTest(unittest.TestCase):
+
+    def setUp(self):
+        layers = [('0', 'input', 'Input', 'null', '1;9'),
+                  ('1', 'dense', 'Dense', '0', '9')]
+        self.src = make_project(layers, ('9', '0', '1'))
+        self.dst = self.src.replace('.kmbm', BINARY_SUFFIX)
+
+    def tearDown(self):
+        os.remove(self.src)
+        os.remove(self.dst)
+
+    def test_convert(self):
+        convert(self.src, self.dst)
+        self.assertEqual(make_loader(self.dst).load_file(),
+                         make_loader(self.src).load_file(), 'loads not same')
+        self.assertEqual(PyParser(self.dst).commit()[0],
+                         PyParser(self.src).commit()[0], 'lines not same')
+        # and back to XML again.
+        convert(self.dst, self.src)
+        self.assertEqual(make_loader(self.src).load_file(),
+                         make_loader(self.dst).load_file(), 'loads not same')
+
+    def test_compressed(self):
+        loads = make_loader(self.src).load_file()
+        for compress in COMPRESS_SUPPORT:
+            for dst in (self.dst, self.src):
+                convert(self.src, dst, compress)
+                self.assertEqual(detect(dst), compress, 'not compressed')
+                self.assertEqual(make_loader(dst).load_file(), loads,
+                                 f'{compress} loads not same')
+
+    def test_save_records(self):
+        # every kind of node, saved without building the tree.
+        def node(tag, id_, **fields):
+            return dict(tag=tag, id=id_, x='1.5', y='-2', tp='Layers',
+                        sort='Core', **fields)
+        serialized = {
+            '0': node('layer', '0', var='input', class_='Input', mode='IO',
+                      args={'shape': ('(8,)', 'seq')}, input=[], output=['1']),
+            '1': node('layer', '1', var='dense', class_='Dense', mode='IO',
+                      args={'units': (None, 'num'), 'name': ('', 'str')},
+                      input=['0'], output=['9']),
+            '2': node('unit', '2', var='relu', class_='relu', type='activations', args={}),
+            '3': node('ph', '3', var='', args={'layer': ('@dense', 'id')}),
+            '4': {'tag': 'note', 'id': '4', 'x': '0', 'y': '0', 'content': 'a note\nhere'},
+            '9': node('model', '9', var='model', class_='Model',
+                      args={'inputs': (['0'], 'id'), 'outputs': ([], 'id')}),
+        }
+        make_saver(serialized, self.src).save_file()
+        make_saver(serialized, self.dst).save_file()
+        loads = make_loader(self.src).load_file()
+        self.assertEqual(make_loader(self.dst).load_file(), loads, 'loads not same')
+        self.assertEqual(list(loads), list(serialized))
+        # the same as converting from XML.
+        with open(self.dst, 'rb') as f:
+            content = f.read()
+        convert(self.src, self.dst)
+        with open(self.dst, 'rb') as f:
+            self.assertEqual(f.read(), content, 'records not same')
+
+    def test_damaged(self):
+        convert(self.src, self.dst)
+        with open(self.dst, 'rb') as f:
+            content = f.read()
+        with open(self.dst, 'wb') as f:
+            f.write(content[:-8])
+        with self.assertRaises(LoadingError):
+            make_loader(self.dst).load_file()
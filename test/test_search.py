@@ -0,0 +1,120 @@
+import os
+import unittest
+from collections import namedtuple
+
+# set to parent directory
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.catalog import NodeCatalog, NodeRecord
+from lib.search import SearchIndex
+
+Catalog = namedtuple('Catalog', ('nodes', ))
+
+
+LABELS = {
+    'Conv2D': '2D convolution layer.',
+    'Conv2DTranspose': 'Transposed convolution layer.',
+    'SeparableConv2D': 'Depthwise separable 2D convolution.',
+    'Dense': 'Just your regular densely-connected NN layer.',
+    'Dropout': 'Applies Dropout to the input.',
+    'Add': 'Layer that adds a list of inputs.',
+    'C++(x)': 'A label with special characters [a-z]*.',
+}
+
+
+class FixedIndex(SearchIndex):
+    """ Search only the nodes given, without pins. """
+
+    def __init__(self, labels: dict):
+        nodes = {label: NodeRecord(i, label, info, None, None, 'Core', 'Layers', (), ())
+                 for i, (label, info) in enumerate(labels.items())}
+        super().__init__(Catalog(nodes))
+
+    def refresh_pins(self):
+        pass
+
+
+def labels_of(results):
+    return [entry.label for entry, _, _ in results]
+
+
+class SearchRankTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = FixedIndex(LABELS)
+
+    def test_rank_order(self):
+        # exact > prefix > substring > info.
+        res = labels_of(self.index.search('conv2d'))
+        self.assertEqual(res[0], 'Conv2D')
+        self.assertEqual(res[1], 'Conv2DTranspose')
+        self.assertEqual(res[2], 'SeparableConv2D')
+
+    def test_info_and_fuzzy(self):
+        res = labels_of(self.index.search('regular'))
+        self.assertEqual(res, ['Dense'])
+        # the letters in order, after all the others.
+        res = labels_of(self.index.search('cv2d'))
+        self.assertEqual(res[:2], ['Conv2D', 'Conv2DTranspose'])
+
+    def test_matched_part(self):
+        entry, from_idx, step = self.index.search('able')[0]
+        self.assertEqual(entry.label, 'SeparableConv2D')
+        self.assertEqual(entry.label[from_idx:from_idx + step].lower(), 'able')
+
+    def test_case_insensitive(self):
+        self.assertEqual(self.index.search('DENSE'), self.index.search('dense'))
+        self.assertEqual(labels_of(self.index.search('DeNsE'))[0], 'Dense')
+
+    def test_short_query(self):
+        # shorter than a gram, checked one by one.
+        self.assertEqual(labels_of(self.index.search('ad'))[0], 'Add')
+        res = labels_of(self.index.search('d'))
+        self.assertEqual(res[:2], ['Dense', 'Dropout'])
+        self.assertIn('Add', res)
+        self.assertEqual(self.index.search(''), [])
+
+    def test_special_characters(self):
+        self.assertEqual(labels_of(self.index.search('c++(')), ['C++(x)'])
+        self.assertEqual(labels_of(self.index.search('[a-z]*')), ['C++(x)'])
+        for word in ("'; DROP TABLE nodes; --", '%', '_', '.*', '\\'):
+            self.assertIsInstance(self.index.search(word), list)
+        self.assertEqual(self.index.search('%'), [])
+
+
+class SearchNarrowTest(unittest.TestCase):
+    """ Narrowing from the last results is the same as a fresh search. """
+
+    def setUp(self):
+        self.labels = {n.name: n.info for n in NodeCatalog.get().nodes.values()}
+        self.labels.update(LABELS)
+        self.index = FixedIndex(self.labels)
+
+    def assert_typing(self, words):
+        for word in words:
+            cold = FixedIndex(self.labels).search(word)
+            self.assertEqual(self.index.search(word), cold, word)
+
+    def test_typing(self):
+        word = 'conv2dtranspose'
+        self.assert_typing(word[:i] for i in range(1, len(word) + 1))
+
+    def test_backspace(self):
+        self.assert_typing(['c', 'co', 'con', 'conv', 'con', 'co', 'c',
+                            'd', 'de', 'den', 'de', 'dr', 'dro'])
+
+    def test_change_middle(self):
+        # not an extension of the last one any more.
+        self.assert_typing(['conv', 'cinv', 'conv', 'conv1d', 'conv2d',
+                            'sep', 'sap', 'sep', 'bn', 'batch'])
+
+    def test_cache_size(self):
+        index = FixedIndex(self.labels)
+        index.CACHE_SIZE = 8
+        words = ['a' + chr(c) for c in range(ord('a'), ord('z') + 1)]
+        for word in words:
+            index.search(word)
+            self.assertLessEqual(len(index._cache), index.CACHE_SIZE)
+        # the recent ones are kept.
+        self.assertEqual(list(index._cache), words[-index.CACHE_SIZE:])
+        self.assertEqual(index.search(words[-1]), FixedIndex(self.labels).search(words[-1]))